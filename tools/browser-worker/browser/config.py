@@ -1,66 +1,129 @@
 # comments: English only
 """Browser configuration and constants"""
 import os
+from dataclasses import dataclass
 from pathlib import Path
-
-# Timeouts (seconds) - centralized via environment variables
-PAGE_TIMEOUT = int(os.environ.get("PY_PAGE_TIMEOUT_SEC", "45"))
-ANSWER_TIMEOUT = int(os.environ.get("PY_ANSWER_TIMEOUT_SEC", "20"))
-AI_READY_TIMEOUT_SEC = int(os.environ.get("PY_AI_READY_TIMEOUT_SEC", "25"))
-AI_READY_TIMEOUT_PER_SEARCH_SEC = int(os.environ.get("PY_AI_READY_TIMEOUT_PER_SEARCH_SEC", "8"))
-SEARCH_PAGE_OPEN_TIMEOUT_SEC = int(os.environ.get("PY_SEARCH_PAGE_OPEN_TIMEOUT_SEC", "12"))
-NEW_SEARCH_BUTTON_WAIT_SEC = int(os.environ.get("PY_NEW_SEARCH_BUTTON_WAIT_SEC", "3"))
-QUIT_TIMEOUT_SEC = int(os.environ.get("PY_QUIT_TIMEOUT_SEC", "5"))
-
-# Chrome profiles
-_profiles_env = os.environ.get("PY_WORKER_PROFILES")
-if _profiles_env:
-    PROFILES = [Path(p.strip()) for p in _profiles_env.split(",") if p.strip()]
-else:
-    PROFILES = [Path.home() / ".ai_mode_chrome_c", Path.home() / ".ai_mode_chrome_d"]
-
-# Chrome binary paths
-CHROME_BINARY = os.environ.get("CHROME_BINARY")
-CHROMEDRIVER = os.environ.get("CHROMEDRIVER")
+from typing import Optional
 
 # User agents for rotation
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0 Safari/537.36",
-]
+)
 
 # Window sizes for rotation
-WINDOW_SIZES = [(1366, 768), (1440, 900), (1536, 864), (1600, 900), (1920, 1080)]
+WINDOW_SIZES = ((1366, 768), (1440, 900), (1536, 864), (1600, 900), (1920, 1080))
 
 # Google AI Mode URL
 GOOGLE_HOME = "https://www.google.com/?udm=50&hl=en&gl=US"
 
-# Feature flags
-USE_UC = os.environ.get("USE_UC", "0") == "1"
-SESSION_PER_SEARCH = os.environ.get("SESSION_PER_SEARCH", "1") == "1"
-
-# Proxy configuration
-# Format: USER:PASS@HOST:PORT,USER:PASS@HOST:PORT
-# Example: cust-us-s1:pass@us.proxy.net:12345,cust-de-s2:pass@de.proxy.net:12345
-_proxy_list_env = os.environ.get("PROXY_LIST", "")
-PROXY_LIST = []
-if _proxy_list_env:
-    for entry in _proxy_list_env.split(","):
-        entry = entry.strip()
-        if not entry:
-            continue
+
+def _with_scheme(url: str) -> str:
+    """Default proxy URLs without a scheme to http://"""
+    return url if "://" in url else f"http://{url}"
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Worker configuration resolved once from the environment."""
+    # Timeouts (seconds)
+    page_timeout: int
+    answer_timeout: int
+    ai_ready_timeout_sec: int
+    ai_ready_timeout_per_search_sec: int
+    search_page_open_timeout_sec: int
+    new_search_button_wait_sec: int
+    quit_timeout_sec: int
+    # Chrome profiles and binaries
+    profiles: tuple[Path, ...]
+    chrome_binary: Optional[str]
+    chromedriver: Optional[str]
+    # Feature flags
+    use_uc: bool
+    session_per_search: bool
+    prewarm_standby: bool
+    # Proxy configuration
+    proxy_list: tuple[str, ...]
+    proxy_url: Optional[str]
+    proxy_binding_mode: str
+    proxy_rotation_requests: int
+    proxy_block_timeout_sec: int
+
+    @classmethod
+    def from_env(cls, env=os.environ) -> "Config":
+        """Parse and coerce all settings in a single pass.
+
+        Args:
+            env: Mapping to read settings from (defaults to os.environ)
+
+        Returns:
+            Frozen Config instance
+        """
+        # Chrome profiles
+        profiles_env = env.get("PY_WORKER_PROFILES")
+        if profiles_env:
+            profiles = tuple(Path(p.strip()) for p in profiles_env.split(",") if p.strip())
+        else:
+            profiles = (Path.home() / ".ai_mode_chrome_c", Path.home() / ".ai_mode_chrome_d")
+
+        # Proxy list format: USER:PASS@HOST:PORT,USER:PASS@HOST:PORT
+        # Example: cust-us-s1:pass@us.proxy.net:12345,cust-de-s2:pass@de.proxy.net:12345
         # If no scheme specified, default to http://
-        if "://" not in entry:
-            entry = f"http://{entry}"
-        PROXY_LIST.append(entry)
-
-# Single proxy fallback (if PROXY_LIST is empty)
-PROXY_URL = os.environ.get("PROXY_URL")
-if PROXY_URL and "://" not in PROXY_URL:
-    PROXY_URL = f"http://{PROXY_URL}"
-
-# Proxy rotation policies
-PROXY_BINDING_MODE = os.environ.get("PROXY_BINDING_MODE", "independent")  # 'independent' or 'by_profile'
-PROXY_ROTATION_REQUESTS = int(os.environ.get("PROXY_ROTATION_REQUESTS", "0"))  # Rotate proxy every N requests (0 = disabled)
-PROXY_BLOCK_TIMEOUT_SEC = int(os.environ.get("PROXY_BLOCK_TIMEOUT_SEC", "300"))  # Time to keep proxy blocked (5 minutes default)
+        proxy_list = tuple(
+            _with_scheme(entry.strip())
+            for entry in env.get("PROXY_LIST", "").split(",")
+            if entry.strip()
+        )
+
+        # Single proxy fallback (if PROXY_LIST is empty)
+        proxy_url = env.get("PROXY_URL")
+        if proxy_url:
+            proxy_url = _with_scheme(proxy_url)
+
+        return cls(
+            page_timeout=int(env.get("PY_PAGE_TIMEOUT_SEC", "45")),
+            answer_timeout=int(env.get("PY_ANSWER_TIMEOUT_SEC", "20")),
+            ai_ready_timeout_sec=int(env.get("PY_AI_READY_TIMEOUT_SEC", "25")),
+            ai_ready_timeout_per_search_sec=int(env.get("PY_AI_READY_TIMEOUT_PER_SEARCH_SEC", "8")),
+            search_page_open_timeout_sec=int(env.get("PY_SEARCH_PAGE_OPEN_TIMEOUT_SEC", "12")),
+            new_search_button_wait_sec=int(env.get("PY_NEW_SEARCH_BUTTON_WAIT_SEC", "3")),
+            quit_timeout_sec=int(env.get("PY_QUIT_TIMEOUT_SEC", "5")),
+            profiles=profiles,
+            chrome_binary=env.get("CHROME_BINARY"),
+            chromedriver=env.get("CHROMEDRIVER"),
+            use_uc=env.get("USE_UC", "0") == "1",
+            session_per_search=env.get("SESSION_PER_SEARCH", "1") == "1",
+            prewarm_standby=env.get("PREWARM_STANDBY", "0") == "1",
+            proxy_list=proxy_list,
+            proxy_url=proxy_url,
+            proxy_binding_mode=env.get("PROXY_BINDING_MODE", "independent"),  # 'independent' or 'by_profile'
+            proxy_rotation_requests=int(env.get("PROXY_ROTATION_REQUESTS", "0")),  # Rotate proxy every N requests (0 = disabled)
+            proxy_block_timeout_sec=int(env.get("PROXY_BLOCK_TIMEOUT_SEC", "300")),  # Time to keep proxy blocked (5 minutes default)
+        )
+
+
+CFG = Config.from_env()
+
+# Module-level names kept for existing `from browser.config import X` imports
+PAGE_TIMEOUT = CFG.page_timeout
+ANSWER_TIMEOUT = CFG.answer_timeout
+AI_READY_TIMEOUT_SEC = CFG.ai_ready_timeout_sec
+AI_READY_TIMEOUT_PER_SEARCH_SEC = CFG.ai_ready_timeout_per_search_sec
+SEARCH_PAGE_OPEN_TIMEOUT_SEC = CFG.search_page_open_timeout_sec
+NEW_SEARCH_BUTTON_WAIT_SEC = CFG.new_search_button_wait_sec
+QUIT_TIMEOUT_SEC = CFG.quit_timeout_sec
+
+PROFILES = CFG.profiles
+CHROME_BINARY = CFG.chrome_binary
+CHROMEDRIVER = CFG.chromedriver
+
+USE_UC = CFG.use_uc
+SESSION_PER_SEARCH = CFG.session_per_search
+PREWARM_STANDBY = CFG.prewarm_standby
+
+PROXY_LIST = CFG.proxy_list
+PROXY_URL = CFG.proxy_url
+PROXY_BINDING_MODE = CFG.proxy_binding_mode
+PROXY_ROTATION_REQUESTS = CFG.proxy_rotation_requests
+PROXY_BLOCK_TIMEOUT_SEC = CFG.proxy_block_timeout_sec
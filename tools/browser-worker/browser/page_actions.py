@@ -1,6 +1,9 @@
 # comments: English only
 """Page interaction helpers"""
+import re
+import json
 import time
+from contextlib import contextmanager
 from typing import Optional
 
 from selenium import webdriver
@@ -11,6 +14,98 @@ from selenium.webdriver.support import expected_conditions as EC
 from .config import GOOGLE_HOME, AI_READY_TIMEOUT_SEC, SEARCH_PAGE_OPEN_TIMEOUT_SEC, NEW_SEARCH_BUTTON_WAIT_SEC
 from .selectors import AI_TEXTAREA_SEL, AI_TEXTAREA_ALT, NEW_SEARCH_BUTTON_SELECTORS
 
+# Selector tuples built once at import (reused by every page action and poll iteration)
+_CAPTCHA_SELS = (
+    "iframe[src*='recaptcha']",
+    "iframe[src*='hcaptcha']",
+    "div.g-recaptcha",
+    "div.h-captcha",
+    "#captcha-form",
+)
+_CONSENT_SELS = (
+    "button[aria-label='Accept all']",
+    "button[aria-label='I agree']",
+    "#introAgreeButton",
+    "form[action*='consent'] button[type='submit']",
+)
+_BLOCK_PHRASES = (
+    "unusual traffic",
+    "automated queries",
+    "sorry, you have been blocked",
+    "access denied",
+    "captcha",
+)
+
+# Phrases are plain text, so the alternation is valid for both Python and JS regex engines
+_PROFILE_BLOCK_PATTERN = "|".join(_BLOCK_PHRASES)
+_PROXY_BLOCK_RE = re.compile(
+    "unusual traffic from your computer network"
+    "|automated queries"
+    "|your ip has been blocked"
+    "|access denied due to suspicious activity",
+    re.IGNORECASE,
+)
+
+# Single round-trip block probe: returns 'captcha:<sel>', 'phrase:<text>' or ''
+_BLOCK_JS = (
+    f"const sels = {json.dumps(list(_CAPTCHA_SELS))};"
+    "for (const s of sels) { if (document.querySelector(s)) return 'captcha:' + s; }"
+    "const t = (document.body && document.body.innerText) || '';"
+    f"const m = t.match(new RegExp({json.dumps(_PROFILE_BLOCK_PATTERN)}, 'i'));"
+    "return m ? 'phrase:' + m[0].toLowerCase() : '';"
+)
+
+# Single round-trip consent click: known selectors first, then buttons by text
+_CONSENT_JS = (
+    f"const sels = {json.dumps(list(_CONSENT_SELS))};"
+    "for (const s of sels) { const el = document.querySelector(s); if (el) { el.click(); return true; } }"
+    "for (const el of document.querySelectorAll(\"button, div[role='button']\")) {"
+    "  const txt = (el.innerText || '').trim().toLowerCase();"
+    "  if (txt && (txt.includes('accept all') || txt.includes('agree'))) { el.click(); return true; }"
+    "}"
+    "return false;"
+)
+
+_NEW_SEARCH_LOCATORS = tuple(
+    (By.XPATH, sel) if sel.startswith("//") else (By.CSS_SELECTOR, sel)
+    for sel in NEW_SEARCH_BUTTON_SELECTORS
+)
+# Resolves once any 'Start new search' selector is visible and enabled, or on timeout.
+# Args: selectors, timeout in ms. Result: {status: 'ok', el} or {status: 'timeout', disabled}
+_WAIT_NEW_SEARCH_JS = """
+const sels = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+let sawDisabled = false, obs = null, timer = null;
+const find = (s) => s.startsWith('//')
+  ? document.evaluate(s, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+  : document.querySelector(s);
+const check = () => {
+  for (const s of sels) {
+    const el = find(s);
+    if (!el || !el.getClientRects().length) continue;
+    if (el.disabled || el.getAttribute('aria-disabled') === 'true') { sawDisabled = true; continue; }
+    if (obs) obs.disconnect();
+    clearTimeout(timer);
+    done({status: 'ok', el: el});
+    return true;
+  }
+  return false;
+};
+if (!check()) {
+  obs = new MutationObserver(check);
+  obs.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+  timer = setTimeout(() => { obs.disconnect(); done({status: 'timeout', disabled: sawDisabled}); }, timeoutMs);
+}
+"""
+
+_ELEMENT_STATE_JS = (
+    "const e = arguments[0];"
+    "return {displayed: e.getClientRects().length > 0,"
+    " disabled: !!e.disabled || e.getAttribute('aria-disabled') === 'true'};"
+)
+
+_TEXTAREA_LOCATOR = (By.CSS_SELECTOR, AI_TEXTAREA_SEL)
+_TEXTAREA_ALT_LOCATOR = (By.CSS_SELECTOR, AI_TEXTAREA_ALT)
+
 
 def is_profile_blocked(driver: webdriver.Chrome) -> bool:
     """Detect if profile/cookies are blocked by Google (captcha, unusual traffic).
@@ -36,38 +131,15 @@ def is_profile_blocked(driver: webdriver.Chrome) -> bool:
             print("[BLOCK_DETECT] Google 'unusual traffic' page detected")
             return True
         
-        # Check for reCAPTCHA/HCaptcha elements
-        captcha_selectors = [
-            "iframe[src*='recaptcha']",
-            "iframe[src*='hcaptcha']",
-            "div.g-recaptcha",
-            "div.h-captcha",
-            "#captcha-form",
-        ]
-        for sel in captcha_selectors:
-            if driver.find_elements(By.CSS_SELECTOR, sel):
-                print(f"[BLOCK_DETECT] Captcha detected: {sel}")
-                return True
-        
-        # Check body text for block indicators
-        try:
-            body = driver.find_element(By.TAG_NAME, "body")
-            body_text = (body.text or "").lower()
-            
-            block_phrases = [
-                "unusual traffic",
-                "automated queries",
-                "sorry, you have been blocked",
-                "access denied",
-                "captcha",
-            ]
-            
-            for phrase in block_phrases:
-                if phrase in body_text:
-                    print(f"[PROFILE_BLOCK] Block phrase detected: '{phrase}'")
-                    return True
-        except Exception:
-            pass
+        # Check captcha elements and body text for block indicators in one round-trip
+        verdict = driver.execute_script(_BLOCK_JS)
+        if verdict:
+            kind, _, detail = verdict.partition(":")
+            if kind == "captcha":
+                print(f"[BLOCK_DETECT] Captcha detected: {detail}")
+            else:
+                print(f"[PROFILE_BLOCK] Block phrase detected: '{detail}'")
+            return True
         
         return False
     except Exception as e:
@@ -93,21 +165,12 @@ def is_proxy_blocked(response_text: str) -> bool:
     if not response_text:
         return False
     
-    text_lower = response_text.lower().strip()
-    
     # Only check for EXPLICIT IP-level block indicators
     # Generic errors like "something went wrong" should NOT trigger proxy rotation
-    proxy_block_indicators = [
-        "unusual traffic from your computer network",
-        "automated queries",
-        "your ip has been blocked",
-        "access denied due to suspicious activity",
-    ]
-    
-    for indicator in proxy_block_indicators:
-        if indicator in text_lower:
-            print(f"[PROXY_BLOCK] IP block detected: '{indicator}'")
-            return True
+    match = _PROXY_BLOCK_RE.search(response_text)
+    if match:
+        print(f"[PROXY_BLOCK] IP block detected: '{match.group(0).lower()}'")
+        return True
     
     return False
 
@@ -123,34 +186,9 @@ def accept_google_consent(driver: webdriver.Chrome) -> None:
     
     for _ in range(4):
         try:
-            for sel in [
-                "button[aria-label='Accept all']",
-                "button[aria-label='I agree']",
-                "#introAgreeButton",
-                "form[action*='consent'] button[type='submit']",
-            ]:
-                els = driver.find_elements(By.CSS_SELECTOR, sel)
-                if els:
-                    try:
-                        driver.execute_script("arguments[0].click();", els[0])
-                        time.sleep(0.2)
-                        return
-                    except Exception:
-                        pass
-            
-            # Try to find buttons with "accept" or "agree" text
-            candidates = driver.find_elements(By.CSS_SELECTOR, "button, div[role='button']")
-            for el in candidates:
-                try:
-                    txt = (el.text or "").strip().lower()
-                    if not txt:
-                        continue
-                    if "accept all" in txt or txt == "i agree" or "agree" in txt:
-                        driver.execute_script("arguments[0].click();", el)
-                        time.sleep(0.2)
-                        return
-                except Exception:
-                    pass
+            if driver.execute_script(_CONSENT_JS):
+                time.sleep(0.2)
+                return
         except Exception:
             pass
         time.sleep(0.3)
@@ -191,18 +229,15 @@ def ensure_aimode_ready(session_manager, timeout: int = AI_READY_TIMEOUT_SEC) ->
         accept_google_consent(driver)
         
         # Check if textarea is available (ACTUAL state check)
-        ta_sel = (By.CSS_SELECTOR, AI_TEXTAREA_SEL)
-        alt_sel = (By.CSS_SELECTOR, AI_TEXTAREA_ALT)
-        
         print(f"[PAGE_ACTIONS] Checking textarea availability...")
         try:
             # Use reasonable wait (15s max) to let page load
-            WebDriverWait(driver, 15).until(EC.element_to_be_clickable(ta_sel))
+            WebDriverWait(driver, 15).until(EC.element_to_be_clickable(_TEXTAREA_LOCATOR))
             print(f"[PAGE_ACTIONS] ✓ Textarea ready (primary selector)")
             return True
         except Exception:
             try:
-                WebDriverWait(driver, 5).until(EC.element_to_be_clickable(alt_sel))
+                WebDriverWait(driver, 5).until(EC.element_to_be_clickable(_TEXTAREA_ALT_LOCATOR))
                 print(f"[PAGE_ACTIONS] ✓ Textarea ready (alt selector)")
                 return True
             except Exception:
@@ -236,15 +271,12 @@ def open_fresh_search_page(session_manager, timeout: int = SEARCH_PAGE_OPEN_TIME
         driver.get(GOOGLE_HOME)
         accept_google_consent(driver)
         
-        ta_sel = (By.CSS_SELECTOR, AI_TEXTAREA_SEL)
-        alt_sel = (By.CSS_SELECTOR, AI_TEXTAREA_ALT)
-        
         try:
-            WebDriverWait(driver, min(8, timeout)).until(EC.element_to_be_clickable(ta_sel))
+            WebDriverWait(driver, min(8, timeout)).until(EC.element_to_be_clickable(_TEXTAREA_LOCATOR))
             return True
         except Exception:
             try:
-                WebDriverWait(driver, max(3, timeout - 8)).until(EC.element_to_be_clickable(alt_sel))
+                WebDriverWait(driver, max(3, timeout - 8)).until(EC.element_to_be_clickable(_TEXTAREA_ALT_LOCATOR))
                 return True
             except Exception:
                 return False
@@ -252,9 +284,58 @@ def open_fresh_search_page(session_manager, timeout: int = SEARCH_PAGE_OPEN_TIME
         return False
 
 
+@contextmanager
+def script_timeout(driver: webdriver.Chrome, seconds: float):
+    """Temporarily set the driver-wide async script timeout, restoring the previous value.
+    
+    Later synchronous execute_script calls would otherwise inherit the short
+    timeout instead of Selenium's default.
+    """
+    try:
+        previous = driver.timeouts.script
+        driver.set_script_timeout(seconds)
+    except Exception:
+        previous = None
+    try:
+        yield
+    finally:
+        if previous is not None:
+            try:
+                driver.set_script_timeout(previous)
+            except Exception:
+                pass
+
+
+def _click_element(driver: webdriver.Chrome, el) -> bool:
+    """Click element natively, falling back to a JS click.
+    
+    Returns:
+        True if either click succeeded
+    """
+    try:
+        # First try regular click
+        el.click()
+        time.sleep(0.3)
+        print("[PAGE_ACTIONS] Start new search button clicked successfully")
+        return True
+    except Exception:
+        # Fallback to JS click
+        try:
+            driver.execute_script("arguments[0].click();", el)
+            time.sleep(0.3)
+            print("[PAGE_ACTIONS] Start new search button clicked via JS")
+            return True
+        except Exception as e:
+            print(f"[PAGE_ACTIONS] Failed to click button: {e}")
+            return False
+
+
 def try_click_new_search_button(session_manager, max_wait: int = NEW_SEARCH_BUTTON_WAIT_SEC) -> tuple[bool, bool]:
     """Try to click the 'Start new search' button if it exists.
     
+    Waits in the page via a MutationObserver (one round-trip); falls back to
+    polling with exponential backoff if the async script fails.
+    
     Args:
         session_manager: Session manager (single source of truth for driver)
         max_wait: Maximum time to wait for button in seconds
@@ -273,55 +354,50 @@ def try_click_new_search_button(session_manager, max_wait: int = NEW_SEARCH_BUTT
         return False, False
     
     end = time.time() + max_wait
-    attempts = 0
     was_disabled = False
     
+    try:
+        with script_timeout(driver, max_wait + 2):
+            res = driver.execute_async_script(_WAIT_NEW_SEARCH_JS, list(NEW_SEARCH_BUTTON_SELECTORS), max_wait * 1000)
+    except Exception as e:
+        print(f"[PAGE_ACTIONS] Button observer failed ({e}), falling back to polling")
+        res = None
+    
+    if isinstance(res, dict):
+        if res.get("status") == "ok":
+            if _click_element(driver, res.get("el")):
+                return True, False
+            # Click failed - poll for whatever time is left
+        else:
+            was_disabled = bool(res.get("disabled"))
+            end = 0.0
+    
+    attempts = 0
+    delay = 0.1
     while time.time() < end:
-        for sel in NEW_SEARCH_BUTTON_SELECTORS:
+        for by, sel in _NEW_SEARCH_LOCATORS:
             try:
-                el = None
-                if sel.startswith("//"):
-                    el = driver.find_element(By.XPATH, sel)
-                else:
-                    el = driver.find_element(By.CSS_SELECTOR, sel)
+                el = driver.find_element(by, sel)
                 
                 if el:
-                    # Check if element is displayed and enabled
-                    if not el.is_displayed():
+                    # Displayed + disabled/aria-disabled state in one round-trip
+                    state = driver.execute_script(_ELEMENT_STATE_JS, el) or {}
+                    if not state.get("displayed"):
                         continue
                     
-                    # Try to check if button is disabled via aria-disabled or disabled attribute
-                    try:
-                        if el.get_attribute("disabled") or el.get_attribute("aria-disabled") == "true":
-                            print(f"[PAGE_ACTIONS] Button found but disabled, waiting... (attempt {attempts + 1})")
-                            was_disabled = True
-                            time.sleep(0.5)
-                            attempts += 1
-                            continue
-                    except Exception:
-                        pass
+                    if state.get("disabled"):
+                        print(f"[PAGE_ACTIONS] Button found but disabled, waiting... (attempt {attempts + 1})")
+                        was_disabled = True
+                        continue
                     
-                    # Try to click
-                    try:
-                        # First try regular click
-                        el.click()
-                        time.sleep(0.3)
-                        print("[PAGE_ACTIONS] Start new search button clicked successfully")
+                    if _click_element(driver, el):
                         return True, False
-                    except Exception:
-                        # Fallback to JS click
-                        try:
-                            driver.execute_script("arguments[0].click();", el)
-                            time.sleep(0.3)
-                            print("[PAGE_ACTIONS] Start new search button clicked via JS")
-                            return True, False
-                        except Exception as e:
-                            print(f"[PAGE_ACTIONS] Failed to click button: {e}")
-                            pass
             except Exception:
                 pass
         
-        time.sleep(0.3)
+        # Exponential backoff between polls, never sleeping past the deadline
+        time.sleep(max(0.0, min(delay, end - time.time())))
+        delay = min(delay * 2, 1.0)
         attempts += 1
     
     if was_disabled:
@@ -0,0 +1,94 @@
+# comments: English only
+"""Adaptive poll placement for the AI response wait loop.
+
+Keeps a rolling window of observed "time from send to first response text"
+per prompt kind and places a fixed budget of polls at the quantiles of that
+empirical distribution, so polls concentrate where the answer usually shows up.
+"""
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# Observations kept per prompt kind
+WINDOW_SIZE = 200
+# Minimum observations before the learned schedule replaces backoff polling
+MIN_OBSERVATIONS = 20
+# Polls placed per schedule
+POLL_BUDGET = 15
+# Never schedule two polls closer than this
+MIN_GAP_SEC = 0.1
+
+
+def prompt_kind(prompt: str) -> str:
+    """Classify a prompt by the JSON key it asks for ('patterns' or 'domain')."""
+    return "patterns" if "patterns" in (prompt or "").lower() else "domain"
+
+
+class PollSchedule:
+    """Learned poll offsets (seconds after send) per prompt kind."""
+
+    def __init__(self, window: int = WINDOW_SIZE, budget: int = POLL_BUDGET):
+        self._window = window
+        self._budget = budget
+        self._observations: Dict[str, deque] = {}
+        self._offsets: Dict[str, Optional[Tuple[float, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, seconds: float):
+        """Log the realized time to first response for a prompt kind."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            obs = self._observations.get(kind)
+            if obs is None:
+                obs = self._observations[kind] = deque(maxlen=self._window)
+            obs.append(seconds)
+            # Recompute lazily on next offsets() call
+            self._offsets.pop(kind, None)
+
+    def offsets(self, kind: str) -> Optional[Tuple[float, ...]]:
+        """Return ascending poll offsets for a prompt kind.
+
+        Returns:
+            Tuple of offsets in seconds, or None while there is too little history
+        """
+        with self._lock:
+            if kind in self._offsets:
+                return self._offsets[kind]
+            obs = self._observations.get(kind)
+            offsets = self._compute(sorted(obs)) if obs and len(obs) >= MIN_OBSERVATIONS else None
+            self._offsets[kind] = offsets
+            return offsets
+
+    def _compute(self, samples: list) -> Tuple[float, ...]:
+        """Place polls at equal-probability quantiles of the empirical CDF."""
+        n = len(samples)
+        offsets = []
+        for i in range(1, self._budget + 1):
+            point = samples[min(n - 1, (i * n) // self._budget)]
+            if not offsets or point - offsets[-1] >= MIN_GAP_SEC:
+                offsets.append(point)
+        return tuple(offsets)
+
+
+def next_delay(offsets: Optional[Tuple[float, ...]], elapsed: float, fallback: float, max_delay: float) -> float:
+    """Seconds to sleep until the next scheduled poll.
+
+    Args:
+        offsets: Schedule from PollSchedule.offsets() (None = no schedule)
+        elapsed: Seconds since the prompt was sent
+        fallback: Delay to use without a schedule or once it is exhausted
+        max_delay: Upper bound on a single sleep
+
+    Returns:
+        Delay in seconds
+    """
+    if offsets:
+        for offset in offsets:
+            if offset > elapsed:
+                return min(offset - elapsed, max_delay)
+    return fallback
+
+
+# Shared by all searches in this worker process
+POLL_SCHEDULE = PollSchedule()
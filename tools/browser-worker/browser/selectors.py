@@ -2,7 +2,8 @@
 """DOM selectors and content extraction"""
 import re
 import json
-from typing import Dict
+from typing import Dict, Optional
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
 
@@ -270,6 +271,19 @@ def extract_clean_json(text: str) -> str:
 AI_TEXTAREA_SEL = "textarea.ITIRGe"
 AI_TEXTAREA_ALT = "textarea[aria-label='Ask anything']"
 
+# First visible, enabled prompt textarea in one round trip (primary selector preferred)
+FIND_TEXTAREA_JS = f"""
+for (const sel of [{AI_TEXTAREA_SEL!r}, {AI_TEXTAREA_ALT!r}]) {{
+  for (const el of document.querySelectorAll(sel)) {{
+    if (el.offsetParent !== null && !el.disabled) return el;
+  }}
+}}
+return null;
+"""
+
+# Enabled Send button (either variant) as one selector list - one lookup per poll
+SEND_BTN_SEL = "button[aria-label='Send']:not([disabled]), button[data-xid='input-plate-send-button']:not([disabled])"
+
 # AI response selectors
 AI_RESPONSE_SEL_PRIMARY = "[data-subtree='aimfl']"
 AI_RESPONSE_FALLBACKS = [
@@ -292,28 +306,123 @@ NEW_SEARCH_BUTTON_SELECTORS = [
     "//button[@aria-label='Start new search']",
 ]
 
+# One round trip per poll: locate the response container the same way
+# extract_ai_response does and return "<outerHTML length>:<32-bit hash>"
+# ('' if nothing is found), so unchanged polls skip the full extraction
+AI_RESPONSE_PROBE_JS = f"""
+const all = document.querySelectorAll({AI_RESPONSE_SEL_PRIMARY!r});
+let el = all.length ? (all[all.length - 1].parentElement || all[all.length - 1]) : null;
+if (!el) {{
+  for (const sel of {AI_RESPONSE_FALLBACKS!r}) {{
+    el = document.querySelector(sel);
+    if (el) break;
+  }}
+}}
+if (!el) {{
+  const bubbles = document.querySelectorAll("div[data-message-author-role='assistant']");
+  el = bubbles.length ? bubbles[bubbles.length - 1] : null;
+}}
+if (!el) return '';
+const s = el.outerHTML || '';
+let h = 0;
+for (let i = 0; i < s.length; i++) h = (h * 31 + s.charCodeAt(i)) | 0;
+return s.length + ':' + h;
+"""
+
+# Block in-page until the response container (or body, before it exists) mutates:
+# the browser pushes the change instead of Python polling on a timer. Resolves
+# true on mutation (no earlier than minMs after start) or false on timeout.
+AI_MUTATION_WAIT_JS = f"""
+const timeoutMs = arguments[0], minMs = arguments[1], done = arguments[arguments.length - 1];
+const all = document.querySelectorAll({AI_RESPONSE_SEL_PRIMARY!r});
+const root = all.length ? (all[all.length - 1].parentElement || all[all.length - 1]) : document.body;
+const start = Date.now();
+let finished = false;
+const finish = (changed) => {{
+  if (finished) return;
+  finished = true;
+  obs.disconnect();
+  clearTimeout(timer);
+  done(changed);
+}};
+const obs = new MutationObserver(() => {{
+  obs.disconnect();
+  setTimeout(() => finish(true), Math.max(0, minMs - (Date.now() - start)));
+}});
+obs.observe(root || document.documentElement, {{childList: true, subtree: true, characterData: true}});
+const timer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+
+def find_prompt_textarea(driver: WebDriver):
+    """Return the visible, enabled prompt textarea, or None.
+    
+    Args:
+        driver: WebDriver instance
+        
+    Returns:
+        WebElement or None (also None if the lookup failed)
+    """
+    try:
+        return driver.execute_script(FIND_TEXTAREA_JS)
+    except Exception:
+        return None
+
+
+def wait_for_ai_mutation(driver: WebDriver, timeout: float, min_wait: float = 0.0) -> Optional[bool]:
+    """Wait in the page for the AI response container to change.
+    
+    Args:
+        driver: WebDriver instance (script timeout must exceed timeout)
+        timeout: Max seconds to wait
+        min_wait: Don't return earlier than this even if a mutation arrives
+        
+    Returns:
+        True on mutation, False on timeout, None if the wait could not run
+    """
+    try:
+        return bool(driver.execute_async_script(AI_MUTATION_WAIT_JS, int(timeout * 1000), int(min_wait * 1000)))
+    except Exception:
+        return None
+
+
+def probe_ai_response(driver: WebDriver) -> Optional[str]:
+    """Return a cheap change signature of the AI response container.
+    
+    Args:
+        driver: WebDriver instance
+        
+    Returns:
+        Signature string, or None if the probe failed
+    """
+    try:
+        return driver.execute_script(AI_RESPONSE_PROBE_JS)
+    except Exception:
+        return None
+
 
-def extract_ai_response(session_manager) -> Dict[str, str]:
+def extract_ai_response(session_manager, driver: Optional[WebDriver] = None) -> Dict[str, str]:
     """Extract AI response from Google search page.
     
     Mirrors the logic from tools/chromium-worker/search/selectors.js
     
     Args:
         session_manager: Session manager (single source of truth for driver)
+        driver: Driver already resolved by the caller (skips get_driver() in poll loops)
         
     Returns:
-        Dict with 'text' and 'html' keys
+        Dict with 'text' and 'html' keys, both already stripped
     """
-    try:
-        driver, _ = session_manager.get_driver()
-    except Exception:
-        return {"text": "", "html": ""}
+    if driver is None:
+        try:
+            driver, _ = session_manager.get_driver()
+        except Exception:
+            return {"text": "", "html": ""}
     
     if not driver:
         return {"text": "", "html": ""}
     
     # Try direct Selenium access first (more reliable than execute_script)
-    from selenium.webdriver.common.by import By
     try:
         # Primary selector: aimfl (MUST check this first, it's the most reliable)
         # IMPORTANT: Take the LAST element (most recent response)
@@ -353,7 +462,7 @@ def extract_ai_response(session_manager) -> Dict[str, str]:
             if elements:
                 text = elements[0].text.strip()
                 if len(text) > 10:
-                    html = elements[0].get_attribute("innerHTML") or ""
+                    html = (elements[0].get_attribute("innerHTML") or "").strip()
                     print(f"[SELECTORS] Found {sel} via Selenium, size={len(text)}")
                     return {"text": text, "html": html}
         except Exception:
@@ -369,7 +478,7 @@ def extract_ai_response(session_manager) -> Dict[str, str]:
             const text = (aimflElement.textContent || '').trim();
             console.log('[SELECTORS] Found aimfl, size=' + text.length);
             // Return even if empty, let caller decide
-            return {{ text, html: aimflElement.outerHTML || aimflElement.innerHTML || '', source: 'aimfl' }};
+            return {{ text, html: (aimflElement.outerHTML || aimflElement.innerHTML || '').trim(), source: 'aimfl' }};
           }}
           
           // Try other AI-specific selectors
@@ -378,7 +487,7 @@ def extract_ai_response(session_manager) -> Dict[str, str]:
             const element = document.querySelector(selector);
             if (element && element.textContent && element.textContent.trim().length > 10) {{
               console.log('[SELECTORS] Found ' + selector + ', size=' + element.textContent.trim().length);
-              return {{ text: element.textContent.trim(), html: element.innerHTML || '', source: selector }};
+              return {{ text: element.textContent.trim(), html: (element.innerHTML || '').trim(), source: selector }};
             }}
           }}
           
@@ -399,7 +508,6 @@ def extract_ai_response(session_manager) -> Dict[str, str]:
     
     # Fallback: try to find assistant message bubbles
     try:
-        from selenium.webdriver.common.by import By
         bubbles = driver.find_elements(By.CSS_SELECTOR, "div[data-message-author-role='assistant']")
         if bubbles:
             txt = bubbles[-1].text.strip()
@@ -3,11 +3,50 @@
 Health check script for browser worker.
 MUST respond quickly (< 2 seconds) regardless of worker state.
 """
+import os
 import sys
+import time
+import socket
 import http.client
 import json
+from concurrent.futures import ThreadPoolExecutor
+
 import psutil
 
+# process_iter reports these for defunct processes
+_DEAD_STATUSES = frozenset({psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD})
+
+_HEALTH_SIMPLE_REQUEST = b'GET /health-simple HTTP/1.0\r\nHost: localhost\r\n\r\n'
+
+def _probe_health_simple(port=4102, timeout=1.5):
+    """Raw-socket probe of /health-simple without HTTP client or JSON parsing.
+    
+    Returns:
+        True/False for a definite answer, None if the probe itself failed
+    """
+    try:
+        with socket.create_connection(('127.0.0.1', port), timeout=timeout) as sock:
+            sock.sendall(_HEALTH_SIMPLE_REQUEST)
+            chunks = []
+            while True:
+                chunk = sock.recv(1024)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    
+    data = b''.join(chunks)
+    head, _, body = data.partition(b'\r\n\r\n')
+    if b' 200 ' not in head[:16]:
+        print(f"[HEALTHCHECK] Health server returned {head[:32]!r}")
+        return False
+    # Health server body is json.dumps({"ok": ..., ...}) - match the literal
+    if b'"ok": true' not in body:
+        print(f"[HEALTHCHECK] Health server not ok: {body[:200]!r}")
+        return False
+    return True
+
 def check_server_responding():
     """Check if lightweight health server responds.
     
@@ -15,6 +54,11 @@ def check_server_responding():
     even when main FastAPI server is busy with search operations.
     This prevents false positives during long searches.
     """
+    # Fast path: raw socket probe, full HTTP client only if the probe fails
+    probe = _probe_health_simple()
+    if probe is not None:
+        return probe
+    
     try:
         # Try lightweight health server first (always responsive)
         conn = http.client.HTTPConnection('localhost', 4102, timeout=2)
@@ -52,55 +96,122 @@ def check_server_responding():
         except Exception:
             return False
 
-def check_chrome_alive():
-    """Quick check if Chrome processes exist (not zombie, not chromedriver)."""
-    try:
-        chrome_count = 0
-        zombie_count = 0
-        
-        for proc in psutil.process_iter(['name', 'status']):
+def _scan_proc_for_chrome():
+    """Scan /proc directly for browser processes (Linux only).
+    
+    Reads only comm and stat per process instead of psutil's full stat fan-out.
+    
+    Returns:
+        Tuple of (live_found: bool, chrome_count, zombie_count); counts are
+        partial when a live process is found (scan stops early)
+    """
+    chrome_count = 0
+    zombie_count = 0
+    with os.scandir('/proc') as it:
+        for entry in it:
+            pid = entry.name
+            if not pid.isdigit():
+                continue
             try:
-                name = proc.info['name'].lower()
-                status = proc.info.get('status', '')
-                # Check for actual chromium browser process (not chromedriver)
-                is_browser = ('chromium' in name or 'chrome' in name) and 'driver' not in name
-                if is_browser:
-                    chrome_count += 1
-                    if status in ['zombie', 'dead'] or status == psutil.STATUS_ZOMBIE:
-                        zombie_count += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                with open(f'/proc/{pid}/comm', 'rb') as f:
+                    comm = f.read().strip().lower()
+                if (b'chromium' not in comm and b'chrome' not in comm) or b'driver' in comm:
+                    continue
+                with open(f'/proc/{pid}/stat', 'rb') as f:
+                    stat = f.read()
+            except OSError:
                 continue
+            chrome_count += 1
+            # State is the first field after the "(comm)" entry
+            state = stat.rpartition(b')')[2][1:2]
+            if state in (b'Z', b'X'):
+                zombie_count += 1
+            else:
+                return True, chrome_count, zombie_count
+    return False, chrome_count, zombie_count
+
+def _scan_psutil_for_chrome():
+    """Portable psutil-based variant of _scan_proc_for_chrome."""
+    chrome_count = 0
+    zombie_count = 0
+    for proc in psutil.process_iter(['name', 'status']):
+        info = proc.info
+        name = info['name']
+        if not name:
+            continue
+        name = name.lower()
+        # Check for actual chromium browser process (not chromedriver)
+        if ('chromium' in name or 'chrome' in name) and 'driver' not in name:
+            chrome_count += 1
+            if info['status'] in _DEAD_STATUSES:
+                zombie_count += 1
+            else:
+                return True, chrome_count, zombie_count
+    return False, chrome_count, zombie_count
+
+def check_chrome_alive():
+    """Quick check if Chrome processes exist (not zombie, not chromedriver).
+    
+    Returns as soon as the first live browser process is found.
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            alive, chrome_count, zombie_count = _scan_proc_for_chrome()
+        else:
+            alive, chrome_count, zombie_count = _scan_psutil_for_chrome()
         
-        live_count = chrome_count - zombie_count
+        if alive:
+            return True
         
         # Need at least 1 LIVE Chrome process
-        if live_count < 1:
-            if zombie_count > 0:
-                print(f"[HEALTHCHECK] Only zombie Chrome processes ({zombie_count} zombie, {chrome_count} total)")
-            else:
-                print(f"[HEALTHCHECK] No Chrome browser processes found")
-            return False
-        
-        return True
+        if zombie_count > 0:
+            print(f"[HEALTHCHECK] Only zombie Chrome processes ({zombie_count} zombie, {chrome_count} total)")
+        else:
+            print(f"[HEALTHCHECK] No Chrome browser processes found")
+        return False
         
     except Exception as e:
         print(f"[HEALTHCHECK] Chrome check failed: {e}")
         return False
 
+# Overall budget for both checks (Docker healthcheck must answer in < 2 seconds)
+CHECK_BUDGET_SEC = 1.8
+
+def _result_within(future, deadline):
+    """Return the future's result, or False if it misses the deadline or raises."""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except Exception:
+        return False
+
+def _exit(code):
+    """Exit immediately without joining check threads that are still blocked on I/O."""
+    sys.stdout.flush()
+    os._exit(code)
+
 def main():
-    """Run minimal health checks - optimized for speed (< 2 seconds)."""
+    """Run minimal health checks - optimized for speed (< 2 seconds).
+    
+    Both checks run concurrently, so latency is max() of the two, not the sum.
+    """
+    deadline = time.monotonic() + CHECK_BUDGET_SEC
+    executor = ThreadPoolExecutor(max_workers=2)
+    chrome_future = executor.submit(check_chrome_alive)
+    server_future = executor.submit(check_server_responding)
+    executor.shutdown(wait=False)
+    
     # Check 1: Chrome processes must be alive
-    if not check_chrome_alive():
+    if not _result_within(chrome_future, deadline):
         print("[HEALTHCHECK] FAIL: Chrome not healthy")
-        sys.exit(1)
+        _exit(1)
     
     # Check 2: Server must respond quickly
-    if not check_server_responding():
+    if not _result_within(server_future, deadline):
         print("[HEALTHCHECK] FAIL: Server not responding")
-        sys.exit(1)
+        _exit(1)
     
     print("[HEALTHCHECK] PASS")
-    sys.exit(0)
+    _exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,95 +5,332 @@ Runs in a separate thread and ALWAYS responds immediately,
 independent of main FastAPI server state.
 """
 import os
+import re
+import time
+import socket
+import selectors
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
 import json
 import psutil
 
+# Seconds between background process scans; requests are served from the last scan
+HEALTH_SCAN_INTERVAL = float(os.environ.get("HEALTH_SCAN_INTERVAL", "1.0"))
 
-class HealthCheckHandler(BaseHTTPRequestHandler):
-    """Simple HTTP handler for health checks."""
+# Optional CPU index to pin the health server and scanner threads to (Linux only)
+HEALTH_CPU = os.environ.get("HEALTH_CPU")
+
+# One request per connection: answer as HTTP/1.0 and close, no keep-alive
+_STATUS_LINES = {
+    200: b"HTTP/1.0 200 OK\r\n",
+    404: b"HTTP/1.0 404 Not Found\r\n",
+    500: b"HTTP/1.0 500 Internal Server Error\r\n",
+}
+
+
+def _build_response(status: int, body: bytes) -> bytes:
+    """Compose a full HTTP response in one buffer (no Date/Server headers)."""
+    return (
+        _STATUS_LINES[status]
+        + b"Content-Type: application/json\r\n"
+        + b"Content-Length: %d\r\n" % len(body)
+        + b"Connection: close\r\n\r\n"
+        + body
+    )
+
+
+_NOT_FOUND_RESPONSE = _build_response(404, b'{"ok": false, "error": "not found"}')
+
+# Actual chromium browser process (not chromedriver): one case-insensitive match
+# replaces lower() plus three substring tests
+_BROWSER_PATTERN = r'(?!.*driver).*chrom(?:e|ium)'
+_BROWSER_RE = re.compile(_BROWSER_PATTERN, re.IGNORECASE)
+_BROWSER_RE_B = re.compile(_BROWSER_PATTERN.encode(), re.IGNORECASE)
+
+
+def _count_chrome_proc() -> tuple[int, int]:
+    """Count browser processes by reading /proc/<pid>/comm and /proc/<pid>/stat.
+    
+    Returns:
+        Tuple of (chrome_count, zombie_count)
+    """
+    chrome_count = 0
+    zombie_count = 0
+    is_browser = _BROWSER_RE_B.match
+    with os.scandir('/proc') as it:
+        for entry in it:
+            pid = entry.name
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f'/proc/{pid}/comm', 'rb') as f:
+                    comm = f.read()
+                if not is_browser(comm):
+                    continue
+                with open(f'/proc/{pid}/stat', 'rb') as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            chrome_count += 1
+            # Field 3 (state) follows "pid (comm)"; comm may contain spaces
+            if stat.rpartition(b')')[2].split(None, 1)[0] in (b'Z', b'X'):
+                zombie_count += 1
+    return chrome_count, zombie_count
+
+
+# process_iter reports these for defunct processes
+_DEAD_STATUSES = frozenset({psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD})
+
+# psutil >= 6 caches Process objects across process_iter() calls; drop the cache
+# periodically so names of recycled PIDs (e.g. after a Chrome restart) stay fresh
+PROCESS_CACHE_CLEAR_INTERVAL = 60.0
+_process_cache_clear = getattr(psutil.process_iter, 'cache_clear', lambda: None)
+_last_cache_clear = 0.0
+
+
+def _maybe_clear_process_cache():
+    """Clear psutil's process_iter cache at most every PROCESS_CACHE_CLEAR_INTERVAL."""
+    global _last_cache_clear
+    now = time.monotonic()
+    if now - _last_cache_clear >= PROCESS_CACHE_CLEAR_INTERVAL:
+        _last_cache_clear = now
+        _process_cache_clear()
+
+
+def _count_chrome_psutil() -> tuple[int, int]:
+    """Portable fallback for _count_chrome_proc when /proc is unavailable."""
+    _maybe_clear_process_cache()
+    chrome_count = 0
+    zombie_count = 0
+    dead = _DEAD_STATUSES
+    is_browser = _BROWSER_RE.match
+    # ad_value=None: inaccessible fields come back as None instead of raising
+    for info in (p.info for p in psutil.process_iter(['name', 'status'], ad_value=None)):
+        name = info['name']
+        if not name or not is_browser(name):
+            continue
+        chrome_count += 1
+        if info['status'] in dead:
+            zombie_count += 1
+    return chrome_count, zombie_count
+
+
+_HAS_PROC = os.path.isdir('/proc/self')
+
+
+def count_browser_processes() -> tuple[int, int]:
+    """Count browser and zombie browser processes.
     
-    def log_message(self, format, *args):
-        """Suppress default logging."""
-        pass
+    Returns:
+        Tuple of (chrome_count, zombie_count)
+    """
+    if _HAS_PROC:
+        return _count_chrome_proc()
+    return _count_chrome_psutil()
+
+
+# Fixed-schema body formatted directly to bytes (same layout as json.dumps output,
+# healthcheck.py matches the literal '"ok": true'); pid never changes after start
+_PID_BYTES = str(os.getpid()).encode()
+_HEALTH_BODY = (
+    b'{"ok": %s, "chrome_processes": %d, "zombie_processes": %d, '
+    b'"live_processes": %d, "pid": ' + _PID_BYTES + b'}'
+)
+
+
+def _format_health(counts: tuple[int, int]) -> tuple[int, bytes]:
+    """Build the /health-simple body for a scan result.
     
-    def do_GET(self):
-        """Handle GET requests to /health-simple endpoint."""
-        if self.path != '/health-simple':
-            self.send_error(404)
-            return
+    Args:
+        counts: (chrome_count, zombie_count) from the last scan
         
+    Returns:
+        Tuple of (status_code, encoded JSON body)
+    """
+    chrome_count, zombie_count = counts
+    # Return status - only OK if we have at least one LIVE (non-zombie) browser process
+    ok = b"true" if chrome_count > zombie_count else b"false"
+    return 200, _HEALTH_BODY % (ok, chrome_count, zombie_count, chrome_count - zombie_count)
+
+
+# Latest full HTTP response, replaced by the scanner thread after every scan
+_snapshot_lock = threading.Lock()
+_snapshot = _build_response(500, b'{"ok": false, "error": "not scanned yet"}')
+# Scan result _snapshot was built from; None after an error or before the first scan
+_snapshot_counts = None
+
+
+def _refresh_snapshot():
+    """Scan processes once and publish the new response.
+    
+    The response is only rebuilt when the counts change, so the steady state
+    does no formatting at all.
+    """
+    global _snapshot, _snapshot_counts
+    try:
+        # Quick check: Chrome processes exist AND are not zombies
+        counts = count_browser_processes()
+    except Exception as e:
+        counts = None
+        response = _build_response(500, json.dumps({"ok": False, "error": str(e)}).encode())
+    else:
+        if counts == _snapshot_counts:
+            return
+        response = _build_response(*_format_health(counts))
+    with _snapshot_lock:
+        _snapshot = response
+        _snapshot_counts = counts
+
+
+def _get_health() -> bytes:
+    """Return the response built by the last background scan."""
+    with _snapshot_lock:
+        return _snapshot
+
+
+def _pin_thread_to_cpu():
+    """Pin the calling thread to HEALTH_CPU if set and supported."""
+    if not HEALTH_CPU or not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        # pid 0 on Linux means the calling thread, not the whole process
+        os.sched_setaffinity(0, {int(HEALTH_CPU)})
+    except (ValueError, OSError) as e:
+        print(f"[HEALTH SERVER] Could not pin to CPU {HEALTH_CPU}: {e}")
+
+
+def _scanner_loop(stop: threading.Event):
+    """Rescan every HEALTH_SCAN_INTERVAL seconds until stop is set."""
+    _pin_thread_to_cpu()
+    while not stop.wait(HEALTH_SCAN_INTERVAL):
+        _refresh_snapshot()
+
+
+_REQUEST_END = b"\r\n\r\n"
+_HEALTH_PREFIX = b"GET /health-simple"
+# Drop clients that send more than this without finishing the request head
+_MAX_REQUEST_BYTES = 8192
+# Pending connection queue; probe bursts wait here instead of being refused
+_LISTEN_BACKLOG = 128
+
+
+def _route(request: bytes) -> bytes:
+    """Pick the pre-built response for a raw request head (request line only)."""
+    if not request.startswith(_HEALTH_PREFIX):
+        return _NOT_FOUND_RESPONSE
+    target = request[4:request.find(b" ", 4)]
+    if target.partition(b"?")[0] != b"/health-simple":
+        return _NOT_FOUND_RESPONSE
+    return _get_health()
+
+
+class HealthServer:
+    """Single-thread selectors loop serving /health-simple.
+    
+    Reads each connection until the end of the request head, writes the cached
+    response and closes. No per-request handler objects or header parsing.
+    """
+    
+    def __init__(self, port: int):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('0.0.0.0', port))
+        self._sock.listen(_LISTEN_BACKLOG)
+        self._sock.setblocking(False)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self._sock, selectors.EVENT_READ)
+        self._stop = threading.Event()
+        self._stopped = threading.Event()
+    
+    def _accept(self):
+        # Drain the whole backlog per wakeup so bursts are taken in one pass
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # e.g. EMFILE: leave the rest queued until the next wakeup
+                return
+            conn.setblocking(False)
+            # Response goes out in a single send; don't let Nagle hold it back
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sel.register(conn, selectors.EVENT_READ, bytearray())
+    
+    def _close(self, conn: socket.socket):
+        self._sel.unregister(conn)
+        conn.close()
+    
+    def _read(self, conn: socket.socket, buf: bytearray):
         try:
-            # Quick check: Chrome processes exist AND are not zombies
-            chrome_alive = False
-            chrome_count = 0
-            zombie_count = 0
-            
-            for proc in psutil.process_iter(['name', 'status']):
-                try:
-                    name = proc.info['name'].lower()
-                    status = proc.info.get('status', '')
-                    # Check for actual chromium browser process (not chromedriver)
-                    # chromedriver has 'chromedriver' in name, browser has 'chromium' or 'chrome'
-                    is_browser = ('chromium' in name or 'chrome' in name) and 'driver' not in name
-                    if is_browser:
-                        chrome_count += 1
-                        # Check if process is zombie/defunct
-                        if status in ['zombie', 'dead'] or status == psutil.STATUS_ZOMBIE:
-                            zombie_count += 1
-                        else:
-                            chrome_alive = True  # At least one live browser process
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Return status - only OK if we have at least one LIVE (non-zombie) browser process
-            response = {
-                "ok": chrome_alive,
-                "chrome_processes": chrome_count,
-                "zombie_processes": zombie_count,
-                "live_processes": chrome_count - zombie_count,
-                "pid": os.getpid()
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
-            
-        except Exception as e:
-            error_response = {
-                "ok": False,
-                "error": str(e)
-            }
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(error_response).encode())
+            chunk = conn.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        if not chunk:
+            self._close(conn)
+            return
+        buf += chunk
+        if _REQUEST_END not in buf:
+            if len(buf) > _MAX_REQUEST_BYTES:
+                self._close(conn)
+            return
+        try:
+            # Responses are a few hundred bytes and fit the socket send buffer
+            conn.setblocking(True)
+            conn.sendall(_route(bytes(buf)))
+        except OSError:
+            pass
+        self._close(conn)
+    
+    def serve_forever(self, poll_interval: float = 0.5):
+        """Run the event loop until shutdown() is called."""
+        try:
+            while not self._stop.is_set():
+                for key, _ in self._sel.select(poll_interval):
+                    if key.fileobj is self._sock:
+                        self._accept()
+                    else:
+                        self._read(key.fileobj, key.data)
+        finally:
+            for key in list(self._sel.get_map().values()):
+                key.fileobj.close()
+            self._sel.close()
+            self._stopped.set()
+    
+    def shutdown(self):
+        """Stop the loop and wait for it to release the socket."""
+        self._stop.set()
+        self._stopped.wait()
 
 
 def start_health_server(port=4102):
-    """Start health check server in a separate thread."""
-    server = HTTPServer(('0.0.0.0', port), HealthCheckHandler)
+    """Start health check server and process scanner in separate threads."""
+    server = HealthServer(port)
+    # First scan runs inline so the server never answers with an empty snapshot
+    _refresh_snapshot()
+    threading.Thread(target=_scanner_loop, args=(server._stop,), daemon=True).start()
     
     def run_server():
-        print(f"[HEALTH SERVER] Starting on port {port}")
-        print(f"[HEALTH SERVER] Endpoint: http://0.0.0.0:{port}/health-simple")
+        _pin_thread_to_cpu()
         server.serve_forever()
     
     thread = threading.Thread(target=run_server, daemon=True)
     thread.start()
-    print(f"[HEALTH SERVER] Started in background thread")
+    # Single startup line from the caller's thread; the serving thread never logs
+    print(f"[HEALTH SERVER] Started in background thread on :{port} (http://0.0.0.0:{port}/health-simple)")
     return server
 
 
 if __name__ == "__main__":
     # For testing standalone
+    import signal
     server = start_health_server()
-    try:
-        import time
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n[HEALTH SERVER] Shutting down...")
-        server.shutdown()
+    stop = threading.Event()
+    # Block until signaled instead of waking up every second
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    stop.wait()
+    print("\n[HEALTH SERVER] Shutting down...")
+    server.shutdown()
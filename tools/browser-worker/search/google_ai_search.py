@@ -1,29 +1,256 @@
 # comments: English only
 """Google AI Mode search implementation"""
+import os
 import re
+import sys
 import time
 import json
+import logging
+import logging.handlers
+import traceback
 from typing import Dict, Tuple
 
+import httpx
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, InvalidSessionIdException, WebDriverException
 
 from browser.config import ANSWER_TIMEOUT
 from browser.selectors import (
     AI_TEXTAREA_SEL,
-    AI_TEXTAREA_ALT,
+    SEND_BTN_SEL,
     extract_ai_response,
+    find_prompt_textarea,
+    probe_ai_response,
+    wait_for_ai_mutation,
     extract_clean_json,
     is_valid_json,
 )
 from browser.page_actions import (
     try_click_new_search_button,
     open_fresh_search_page,
+    script_timeout,
 )
+from browser.poll_schedule import POLL_SCHEDULE, prompt_kind, next_delay
+
+_WS_RE = re.compile(r"\s+")
+# "N sites" - intermediate loading state shown while generating
+_N_SITES_RE = re.compile(r"^\d+\s+sites?$")
+# Object responses must carry one of these keys; checked before json.loads
+_REQUIRED_KEY_RE = re.compile(r'"(?:domain|patterns)"\s*:')
+
+# Response wait loops poll fast while the answer is changing and back off while idle
+_POLL_MIN_SEC = 0.1
+_POLL_MAX_SEC = 0.8
+_POLL_GROWTH = 1.5
+# WebDriverWait poll cadence (Selenium's default is 0.5s): textarea and Send button
+# readiness gate the search, so check them more often
+_TEXTAREA_WAIT_POLL_SEC = 0.15
+_SEND_WAIT_POLL_SEC = 0.25
+
+# Script timeout for the in-page mutation wait (longest wait is the 2.5s nudge gap)
+_MUTATION_WAIT_SCRIPT_TIMEOUT_SEC = 10
+
+# Extra page diagnostics in the search path (costs additional round trips)
+_DEBUG = os.environ.get("BPA_DEBUG") == "1"
+
+# Per-poll progress messages from the wait loops: silent by default, buffered
+# to stdout with BPA_DEBUG=1 so the polling path never blocks on a print flush
+log = logging.getLogger("bpa.search")
+log.propagate = False
+if _DEBUG:
+    _log_target = logging.StreamHandler(sys.stdout)
+    _log_target.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(logging.handlers.MemoryHandler(200, flushLevel=logging.WARNING, target=_log_target))
+    log.setLevel(logging.DEBUG)
+else:
+    log.addHandler(logging.NullHandler())
+
+# "Something went wrong and an AI response wasn't generated" - either part is enough
+_PROXY_BLOCK_SUBSTRINGS = ("something went wrong", "ai response wasn't generated")
+
+# search_google_ai: first attempt plus up to 2 retries after session rotation
+_MAX_ATTEMPTS = 3
+# Returned by _search_attempt when the session was rotated and the search should be retried
+_RETRY = object()
+
+
+def _clean_prompt(prompt: str) -> str:
+    """Strip and collapse whitespace runs/newlines to single spaces.
+    
+    Most prompts have nothing to collapse: isprintable() is False for every
+    whitespace char except " ", so the regex only runs when it can change something.
+    """
+    text = (prompt or "").strip()
+    if "  " not in text and text.isprintable():
+        return text
+    return _WS_RE.sub(" ", text)
+
+
+def _next_poll_interval(poll: float, changed: bool) -> float:
+    """Reset to the minimum interval on change, otherwise grow towards the cap."""
+    if changed:
+        return _POLL_MIN_SEC
+    return min(poll * _POLL_GROWTH, _POLL_MAX_SEC)
+
+
+def _sleep_until_change(driver, delay: float):
+    """Sleep up to delay, waking early (after _POLL_MIN_SEC) on a DOM mutation."""
+    if wait_for_ai_mutation(driver, delay, _POLL_MIN_SEC) is None:
+        time.sleep(delay)
+
+
+def _brackets_balanced(text: str) -> bool:
+    """Cheap structural check before json.loads: brackets outside string
+    literals must balance and close exactly at the end of the text."""
+    depth = 0
+    in_string = False
+    escaped = False
+    last = len(text) - 1
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{' or ch == '[':
+            depth += 1
+        elif ch == '}' or ch == ']':
+            depth -= 1
+            if depth < 0:
+                return False
+            if depth == 0 and i != last:
+                # Top-level value closed before the end - trailing garbage
+                return False
+    return depth == 0 and not in_string
+
+
+def _is_valid_response(text: str) -> bool:
+    """Check if text looks like a valid complete response (not intermediate state)."""
+    if not text:
+        return False
+    
+    # Reject obvious intermediate states that Google shows while generating
+    text_lower = text.lower().strip()
+    
+    # Pattern 1: "N sites" (e.g., "10 sites", "2 sites") - intermediate loading state
+    if _N_SITES_RE.match(text_lower):
+        return False  # Silent rejection - too noisy in logs
+    
+    # Pattern 2: Just the word "json" or "{content: }" - incomplete response
+    if text_lower in ('json', '{content: }') or (text_lower.startswith('json') and len(text_lower) < 10):
+        return False
+    
+    # Pattern 3: Google AI refusal messages
+    if 'no response available' in text_lower or 'try asking something else' in text_lower:
+        return False
+    
+    # Pattern 4: Very short responses (< 10 chars) - likely incomplete
+    if len(text) < 10:
+        return False
+    
+    # Text is already cleaned by selectors - no need to clean markdown here
+    # If text looks like JSON, try to parse it
+    if text.startswith('{') or text.startswith('['):
+        # Must have closing brace/bracket
+        if text.startswith('{') and not text.endswith('}'):
+            return False
+        if text.startswith('[') and not text.endswith(']'):
+            return False
+        # Still streaming (e.g. nested object closed but outer one not yet)
+        if not _brackets_balanced(text):
+            return False
+        if text.startswith('{') and not _REQUIRED_KEY_RE.search(text):
+            log.debug("[SEARCH] JSON object missing required keys (domain/patterns)")
+            return False
+        
+        # Try to parse as JSON - this is the real validation
+        try:
+            parsed = json.loads(text)
+            
+            # For domain search, must contain "domain" key; for patterns, must contain "patterns" key
+            if isinstance(parsed, dict):
+                if 'domain' not in parsed and 'patterns' not in parsed:
+                    log.debug("[SEARCH] Valid JSON but missing required keys (domain/patterns)")
+                    return False
+            
+            return True
+        except json.JSONDecodeError as e:
+            log.debug("[SEARCH] Invalid JSON: %s", e)
+            return False
+    
+    # Non-JSON text - always invalid (we need JSON only)
+    return False
+
+
+def _detect_google_error(text: str):
+    """Return the Google error type shown in the response text, if any."""
+    if not text:
+        return None
+    text_lower = text.lower()
+    # Check ONLY for proxy block error (either part is enough)
+    if any(s in text_lower for s in _PROXY_BLOCK_SUBSTRINGS):
+        return "proxy_blocked"
+    return None
+
+
+def _set_textarea_value(driver, el, text: str):
+    """Set the textarea value and fire input/change events.
+    
+    Targets the element reference itself: focus is not reliable here (the JS
+    click does not focus, and follow-up mode can have a second textarea).
+    """
+    driver.execute_script(
+        "arguments[0].value = arguments[1];\n"
+        "arguments[0].dispatchEvent(new Event('input', {bubbles:true}));\n"
+        "arguments[0].dispatchEvent(new Event('change', {bubbles:true}));",
+        el,
+        text,
+    )
+
+
+def _get_str(res: Dict[str, str], key: str) -> str:
+    """Read a field of an extract_ai_response() result (already stripped)."""
+    return res.get(key) or ""
+
+
+class _LastResult:
+    """One-entry memo for a single-argument function, keyed on exact argument.
+    
+    Wait loops see the same text many times while it is stable; only new
+    text is re-cleaned.
+    """
+    __slots__ = ("func", "arg", "value")
+    
+    def __init__(self, func):
+        self.func = func
+        self.arg = None
+        self.value = None
+    
+    def __call__(self, arg):
+        if arg != self.arg:
+            self.value = self.func(arg)
+            self.arg = arg
+        return self.value
+
+
+def _extract_if_changed(session_manager, driver, last_sig, last_res):
+    """Run the full extraction only when the response container changed.
+    
+    Returns:
+        Tuple of (signature, response dict); last_res is reused when the
+        in-page probe returns the same signature as last time
+    """
+    sig = probe_ai_response(driver)
+    if sig is not None and sig == last_sig and last_res is not None:
+        return sig, last_res
+    return sig, extract_ai_response(session_manager, driver)
 
 
 def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
@@ -43,26 +270,8 @@ def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
     
     print(f"[FOLLOWUP] Sending follow-up prompt: {prompt}")
     
-    # Find ALL textareas and pick the visible one (second dialog)
-    el = None
-    try:
-        # Find all textareas matching our selector
-        textareas = driver.find_elements(By.CSS_SELECTOR, AI_TEXTAREA_SEL)
-        
-        # Find the one that is displayed and enabled
-        for ta in textareas:
-            if ta.is_displayed() and ta.is_enabled():
-                el = ta
-                break
-        
-        if not el:
-            textareas = driver.find_elements(By.CSS_SELECTOR, AI_TEXTAREA_ALT)
-            for ta in textareas:
-                if ta.is_displayed() and ta.is_enabled():
-                    el = ta
-                    break
-    except Exception as e:
-        print(f"[FOLLOWUP] Error finding textareas: {e}")
+    # Pick the visible, enabled textarea (second dialog) - filtered in-page
+    el = find_prompt_textarea(driver)
     
     if not el:
         raise TimeoutException("Textarea not found for follow-up prompt")
@@ -74,7 +283,7 @@ def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
         driver.execute_script("arguments[0].click();", el)
     
     # Clean prompt
-    clean = re.sub(r"\s+", " ", (prompt or "").strip())
+    clean = _clean_prompt(prompt)
     
     # Input via JS and submit (same as main search)
     try:
@@ -93,19 +302,12 @@ def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
             except Exception:
                 pass
         
-        driver.execute_script(
-            "arguments[0].value = arguments[1];\n"
-            "arguments[0].dispatchEvent(new Event('input', {bubbles:true}));\n"
-            "arguments[0].dispatchEvent(new Event('change', {bubbles:true}));",
-            el,
-            clean,
-        )
+        _set_textarea_value(driver, el, clean)
         
         # Wait for Send button to become enabled (same as main search)
         try:
-            WebDriverWait(driver, 8).until(
-                lambda d: d.find_elements(By.CSS_SELECTOR, "button[aria-label='Send']:not([disabled])") or
-                         d.find_elements(By.CSS_SELECTOR, "button[data-xid='input-plate-send-button']:not([disabled])")
+            WebDriverWait(driver, 8, poll_frequency=_SEND_WAIT_POLL_SEC).until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, SEND_BTN_SEL)
             )
         except Exception:
             raise TimeoutException("Send button disabled for follow-up")
@@ -113,8 +315,7 @@ def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
         time.sleep(0.2)
         # Click Send button (same as main search)
         try:
-            btns = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Send']:not([disabled])") or \
-                   driver.find_elements(By.CSS_SELECTOR, "button[data-xid='input-plate-send-button']:not([disabled])")
+            btns = driver.find_elements(By.CSS_SELECTOR, SEND_BTN_SEL)
             if btns:
                 btns[0].click()
             else:
@@ -125,12 +326,14 @@ def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
         raise RuntimeError(f"Failed to submit follow-up: {e}")
     
     # Wait for response (similar to main search logic but simpler)
-    t_end = time.time() + ANSWER_TIMEOUT
-    
-    # Capture initial HTML before followup to detect when DOM actually changes
-    initial_res = extract_ai_response(session_manager)
-    initial_text = (initial_res.get("text") or "").strip()
-    initial_html = (initial_res.get("html") or "").strip()
+    t_end = time.monotonic() + ANSWER_TIMEOUT
+    
+    # Capture initial HTML before followup to detect when DOM actually changes;
+    # the probe signature lets the first polls skip extraction until it changes
+    initial_sig = probe_ai_response(driver)
+    initial_res = extract_ai_response(session_manager, driver)
+    initial_text = _get_str(initial_res, "text")
+    initial_html = _get_str(initial_res, "html")
     print(f"[FOLLOWUP] Initial text before followup: {repr(initial_text[:100])}")
     print(f"[FOLLOWUP] Initial HTML size: {len(initial_html)}")
     
@@ -143,59 +346,69 @@ def send_followup_prompt(prompt: str, session_manager) -> Dict[str, str]:
     last_html = ""
     stable_start = None  # When did the HTML become stable
     stable_threshold = 2.0  # Wait 2 seconds after HTML stabilizes
-    
-    while time.time() < t_end:
-        try:
-            res = extract_ai_response(session_manager)
-            text = (res.get("text") or "").strip()
-            html = (res.get("html") or "").strip()
-            
-            # Check if HTML changed from initial (more reliable than text comparison)
-            if html and html != initial_html:
-                html_changed = True
-                if html != last_html:
-                    print(f"[FOLLOWUP] HTML changed, new size={len(html)}, text size={len(text)}")
-                    last_html = html
-                    stable_start = None  # Reset stability timer
-            
-            # Check if text changed from initial (AI responded)
-            if text and text != initial_text:
-                text_changed = True
-            
-            if text and html_changed:
-                # Try to extract JSON immediately
-                cleaned = extract_clean_json(text)
-                if cleaned:
-                    # Valid JSON found - return immediately
-                    print(f"[FOLLOWUP] Valid JSON found, size={len(cleaned)} - returning immediately")
-                    return {"text": cleaned, "html": html}
+    poll = _POLL_MIN_SEC
+    probe_sig = initial_sig
+    res = initial_res
+    with script_timeout(driver, _MUTATION_WAIT_SCRIPT_TIMEOUT_SEC):
+        clean_json = _LastResult(extract_clean_json)
+        
+        while True:
+            now = time.monotonic()
+            if now >= t_end:
+                break
+            changed = False
+            try:
+                probe_sig, res = _extract_if_changed(session_manager, driver, probe_sig, res)
+                text = _get_str(res, "text")
+                html = _get_str(res, "html")
                 
-                # No valid JSON yet - check if HTML is stable
-                if html == last_html:
-                    if stable_start is None:
-                        stable_start = time.time()
-                        print(f"[FOLLOWUP] HTML stable, starting stability timer")
-                    else:
-                        stable_duration = time.time() - stable_start
-                        if stable_duration >= stable_threshold:
-                            # HTML has been stable for threshold - return what we have
-                            print(f"[FOLLOWUP] HTML stable for {stable_duration:.1f}s, no JSON found - returning text")
-                            return {"text": text, "html": html}
+                # Check if HTML changed from initial (more reliable than text comparison)
+                if html and html != initial_html:
+                    html_changed = True
+                    if html != last_html:
+                        log.debug("[FOLLOWUP] HTML changed, new size=%d, text size=%d", len(html), len(text))
+                        last_html = html
+                        changed = True
+                        stable_start = None  # Reset stability timer
                 
-                # Log progress
-                if text != last_text:
-                    last_text = text
-                    print(f"[FOLLOWUP] Text changed, size={len(text)}, no valid JSON yet - continuing to wait")
-        except Exception as e:
-            print(f"[FOLLOWUP] Extraction failed: {e}")
-            import traceback
-            traceback.print_exc()
+                # Check if text changed from initial (AI responded)
+                if text and text != initial_text:
+                    text_changed = True
+                
+                if text and html_changed:
+                    # Try to extract JSON immediately
+                    cleaned = clean_json(text)
+                    if cleaned:
+                        # Valid JSON found - return immediately
+                        print(f"[FOLLOWUP] Valid JSON found, size={len(cleaned)} - returning immediately")
+                        return {"text": cleaned, "html": html}
+                    
+                    # No valid JSON yet - check if HTML is stable
+                    if html == last_html:
+                        if stable_start is None:
+                            stable_start = now
+                            print(f"[FOLLOWUP] HTML stable, starting stability timer")
+                        else:
+                            stable_duration = now - stable_start
+                            if stable_duration >= stable_threshold:
+                                # HTML has been stable for threshold - return what we have
+                                print(f"[FOLLOWUP] HTML stable for {stable_duration:.1f}s, no JSON found - returning text")
+                                return {"text": text, "html": html}
+                    
+                    # Log progress
+                    if text != last_text:
+                        last_text = text
+                        log.debug("[FOLLOWUP] Text changed, size=%d, no valid JSON yet - continuing to wait", len(text))
+            except Exception as e:
+                print(f"[FOLLOWUP] Extraction failed: {e}")
+                traceback.print_exc()
+            
+            poll = _next_poll_interval(poll, changed)
+            _sleep_until_change(driver, poll)
         
-        time.sleep(0.1)
-    
     # Timeout - return what we have
-    final_res = extract_ai_response(session_manager)
-    final_text = (final_res.get("text") or "").strip()
+    final_res = extract_ai_response(session_manager, driver)
+    final_text = _get_str(final_res, "text")
     print(f"[FOLLOWUP] Timeout - returning final text, size={len(final_text)}")
     return {"text": final_text, "html": final_res.get("html", "")}
 
@@ -208,8 +421,8 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
     Args:
         prompt: Search query
         session_manager: Session manager (required - single source of truth for driver)
-        _retry_count: Internal retry counter to prevent infinite recursion
-        _force_fresh_page: Force opening fresh page (used after session rotation)
+        _retry_count: Attempts already used (kept for backward compatibility)
+        _force_fresh_page: Force opening fresh page on the first attempt
         
     Returns:
         Dict with 'text' and 'html' keys
@@ -221,21 +434,36 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
     if not session_manager:
         raise RuntimeError("Session manager is required")
     
-    # Prevent infinite recursion - max 2 retries
-    if _retry_count > 2:
-        print(f"\n{'='*80}")
-        print(f"[SEARCH] CRITICAL: Max retries exceeded ({_retry_count} attempts)")
-        print(f"[SEARCH] This may cause request failure but should NOT restart container")
-        print(f"{'='*80}\n")
-        raise RuntimeError(f"Max retries exceeded ({_retry_count} attempts)")
+    # Max 2 retries; every retry follows a session rotation and opens a fresh page
+    for retry_count in range(_retry_count, _MAX_ATTEMPTS):
+        result = _search_attempt(prompt, session_manager, retry_count, _force_fresh_page)
+        if result is not _RETRY:
+            return result
+        _force_fresh_page = True
+    
+    attempts = max(_retry_count, _MAX_ATTEMPTS)
+    print(f"\n{'='*80}")
+    print(f"[SEARCH] CRITICAL: Max retries exceeded ({attempts} attempts)")
+    print(f"[SEARCH] This may cause request failure but should NOT restart container")
+    print(f"{'='*80}\n")
+    raise RuntimeError(f"Max retries exceeded ({attempts} attempts)")
+
+
+def _search_attempt(prompt: str, session_manager, retry_count: int, force_fresh_page: bool):
+    """Run one search attempt.
     
+    Returns:
+        Result dict, or _RETRY after the session was rotated for another attempt
+    """
     # Get driver from session_manager - single source of truth
     # Always get fresh reference to ensure we have the current driver
     driver, wait = session_manager.get_driver()
+    # Shared by the Send button and response container waits
+    wait_send = WebDriverWait(driver, 8, poll_frequency=_SEND_WAIT_POLL_SEC)
     
     # After session rotation, always open fresh page to ensure clean state
     # This prevents race condition where old error messages are still visible
-    if _force_fresh_page:
+    if force_fresh_page:
         print("[SEARCH] Opening fresh page after session rotation")
         if not open_fresh_search_page(session_manager, timeout=12):
             raise TimeoutException("AI Mode not reachable after session rotation")
@@ -252,10 +480,10 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
         if was_disabled:
             print("[SEARCH] Start new search button remained disabled - forcing session rotation")
             if session_manager:
-                print(f"[SEARCH] Retry attempt {_retry_count + 1}/3")
+                print(f"[SEARCH] Retry attempt {retry_count + 1}/3")
                 session_manager.rotate_identity("button disabled")
                 # Retry entire search with new driver and force fresh page
-                return search_google_ai(prompt, session_manager, _retry_count + 1, _force_fresh_page=True)
+                return _RETRY
             else:
                 raise TimeoutException("AI Mode button disabled, no session manager")
         else:
@@ -265,32 +493,26 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
                 # If fresh page also fails, rotate session and try again
                 print("[SEARCH] Fresh page failed, rotating session...")
                 if session_manager:
-                    print(f"[SEARCH] Retry attempt {_retry_count + 1}/3")
+                    print(f"[SEARCH] Retry attempt {retry_count + 1}/3")
                     session_manager.rotate_identity("button not found, fresh page failed")
                     # Retry entire search with new driver and force fresh page
-                    return search_google_ai(prompt, session_manager, _retry_count + 1, _force_fresh_page=True)
+                    return _RETRY
                 else:
                     raise TimeoutException("AI Mode not reachable (fresh page)")
     
     # Find textarea - if not available after button click, open fresh page
-    el = None
+    # Both selectors are checked in-page on every poll
     try:
-        el = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((By.CSS_SELECTOR, AI_TEXTAREA_SEL)))
+        el = WebDriverWait(driver, 5, poll_frequency=_TEXTAREA_WAIT_POLL_SEC).until(find_prompt_textarea)
     except Exception:
-        try:
-            el = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.CSS_SELECTOR, AI_TEXTAREA_ALT)))
-        except Exception:
-            # Textarea not available - try fresh page
-            if not open_fresh_search_page(session_manager, timeout=12):
-                raise TimeoutException("AI Mode textarea not reachable")
-            # Try again after fresh page
-            try:
-                el = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, AI_TEXTAREA_SEL)))
-            except Exception:
-                el = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, AI_TEXTAREA_ALT)))
+        # Textarea not available - try fresh page
+        if not open_fresh_search_page(session_manager, timeout=12):
+            raise TimeoutException("AI Mode textarea not reachable")
+        # Try again after fresh page
+        el = wait.until(find_prompt_textarea)
     
     # Clean prompt - replace newlines with spaces
-    clean = re.sub(r"\s+", " ", (prompt or "").strip())
+    clean = _clean_prompt(prompt)
     
     # Input via JS and submit
     try:
@@ -307,21 +529,14 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
                 pass
         
         # Set value via JS - this is more reliable than send_keys
-        driver.execute_script(
-            "arguments[0].value = arguments[1];\n"
-            "arguments[0].dispatchEvent(new Event('input', {bubbles:true}));\n"
-            "arguments[0].dispatchEvent(new Event('change', {bubbles:true}));",
-            el,
-            clean,
-        )
+        _set_textarea_value(driver, el, clean)
         
         # Wait for Send button to become enabled (disabled=false)
         # Button selector: button[aria-label='Send'] or button with data-xid='input-plate-send-button'
         send_button_enabled = False
         try:
-            WebDriverWait(driver, 8).until(
-                lambda d: d.find_elements(By.CSS_SELECTOR, "button[aria-label='Send']:not([disabled])") or
-                         d.find_elements(By.CSS_SELECTOR, "button[data-xid='input-plate-send-button']:not([disabled])")
+            wait_send.until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, SEND_BTN_SEL)
             )
             print("[SEARCH] Send button is enabled")
             send_button_enabled = True
@@ -332,18 +547,17 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
         if not send_button_enabled:
             print("[SEARCH] Send button disabled - forcing session rotation")
             if session_manager:
-                print(f"[SEARCH] Retry attempt {_retry_count + 1}/3")
+                print(f"[SEARCH] Retry attempt {retry_count + 1}/3")
                 session_manager.rotate_identity("send button disabled")
                 # Retry search with new driver and force fresh page
-                return search_google_ai(prompt, session_manager, _retry_count + 1, _force_fresh_page=True)
+                return _RETRY
             else:
                 raise TimeoutException("Send button disabled, no session manager")
         
         time.sleep(0.2)
         # Prefer clicking the Send button to avoid any interaction with newline handling
         try:
-            btns = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Send']:not([disabled])") or \
-                   driver.find_elements(By.CSS_SELECTOR, "button[data-xid='input-plate-send-button']:not([disabled])")
+            btns = driver.find_elements(By.CSS_SELECTOR, SEND_BTN_SEL)
             if btns:
                 btns[0].click()
                 print("[SEARCH] Clicked Send button")
@@ -370,34 +584,41 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
     except Exception as e:
         raise RuntimeError(f"Failed to submit search: {e}")
     
+    # Until the first text shows up, poll at points learned from previous searches
+    t_sent = time.monotonic()
+    kind = prompt_kind(clean)
+    poll_offsets = POLL_SCHEDULE.offsets(kind)
+    first_text_at = None
+    
     # Wait for primary AI selectors (aimfl is most reliable)
     try:
-        WebDriverWait(driver, 8).until(
+        wait_send.until(
             lambda d: d.find_elements(By.CSS_SELECTOR, "[data-subtree='aimfl']")
         )
         print("[SEARCH] aimfl selector found")
     except Exception:
-        print("[SEARCH] Primary selectors not found, checking what's on page...")
-        # Debug: log what elements are present
-        try:
-            debug_info = driver.execute_script("""
-                return {
-                    aimfl: !!document.querySelector('[data-subtree="aimfl"]'),
-                    Y3BBE: !!document.querySelector('.Y3BBE'),
-                    aiOverview: !!document.querySelector('[data-attrid="AIOverview"]'),
-                    search: !!document.querySelector('#search'),
-                    main: !!document.querySelector('#main'),
-                    bodyLength: document.body?.textContent?.length || 0,
-                    firstDivText: document.querySelector('div')?.textContent?.substring(0, 100) || ''
-                };
-            """)
-            print(f"[SEARCH] Page elements: {debug_info}")
-        except Exception as e:
-            print(f"[SEARCH] Debug failed: {e}")
+        print("[SEARCH] Primary selectors not found")
+        # Debug: log what elements are present (extra round trip, opt-in)
+        if _DEBUG:
+            try:
+                debug_info = driver.execute_script("""
+                    return {
+                        aimfl: !!document.querySelector('[data-subtree="aimfl"]'),
+                        Y3BBE: !!document.querySelector('.Y3BBE'),
+                        aiOverview: !!document.querySelector('[data-attrid="AIOverview"]'),
+                        search: !!document.querySelector('#search'),
+                        main: !!document.querySelector('#main'),
+                        bodyLength: document.body?.textContent?.length || 0,
+                        firstDivText: document.querySelector('div')?.textContent?.substring(0, 100) || ''
+                    };
+                """)
+                print(f"[SEARCH] Page elements: {debug_info}")
+            except Exception as e:
+                print(f"[SEARCH] Debug failed: {e}")
     
     # Wait for AI response using selectors only (no body growth heuristic)
-    t_end = time.time() + ANSWER_TIMEOUT
-    nudge_at = time.time() + 2.5
+    t_end = time.monotonic() + ANSWER_TIMEOUT
+    nudge_at = time.monotonic() + 2.5
     last_text = ""
     last_text_time = None
     text_stable_threshold = 2.0  # Text must be stable for 2 seconds before returning (increased to reduce false positives)
@@ -407,194 +628,151 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
     google_error_first_seen = None
     google_error_threshold = 3.0  # If same Google error persists 3 seconds → rotate
     
-    def is_valid_response(text: str) -> bool:
-        """Check if text looks like a valid complete response (not intermediate state)."""
-        if not text:
-            return False
-        
-        # Reject obvious intermediate states that Google shows while generating
-        text_lower = text.lower().strip()
-        
-        # Pattern 1: "N sites" (e.g., "10 sites", "2 sites") - intermediate loading state
-        if re.match(r'^\d+\s+sites?$', text_lower):
-            return False  # Silent rejection - too noisy in logs
-        
-        # Pattern 2: Just the word "json" or "{content: }" - incomplete response
-        if text_lower in ('json', '{content: }') or (text_lower.startswith('json') and len(text_lower) < 10):
-            return False
-        
-        # Pattern 3: Google AI refusal messages
-        if 'no response available' in text_lower or 'try asking something else' in text_lower:
-            return False
-        
-        # Pattern 4: Very short responses (< 10 chars) - likely incomplete
-        if len(text) < 10:
-            return False
+    poll = _POLL_MIN_SEC
+    probe_sig = None
+    res = None
+    with script_timeout(driver, _MUTATION_WAIT_SCRIPT_TIMEOUT_SEC):
+        clean_json = _LastResult(extract_clean_json)
+        detect_error = _LastResult(_detect_google_error)
         
-        # Text is already cleaned by selectors - no need to clean markdown here
-        # If text looks like JSON, try to parse it
-        if text.startswith('{') or text.startswith('['):
-            # Must have closing brace/bracket
-            if text.startswith('{') and not text.endswith('}'):
-                return False
-            if text.startswith('[') and not text.endswith(']'):
-                return False
+        while True:
+            now = time.monotonic()
+            if now >= t_end:
+                break
+            changed = False
             
-            # Try to parse as JSON - this is the real validation
+            # Selector-based extraction (skipped while the container is unchanged)
             try:
-                import json
-                parsed = json.loads(text)
+                probe_sig, res = _extract_if_changed(session_manager, driver, probe_sig, res)
+                text = _get_str(res, "text")
                 
-                # For domain search, must contain "domain" key; for patterns, must contain "patterns" key
-                if isinstance(parsed, dict):
-                    if 'domain' not in parsed and 'patterns' not in parsed:
-                        print(f"[SEARCH] Valid JSON but missing required keys (domain/patterns)")
-                        return False
+                # Detect Google error messages - DO NOT rotate inside while loop!
+                # Just remember the error type and continue checking
+                detected_error = detect_error(text)
                 
-                return True
-            except json.JSONDecodeError as e:
-                print(f"[SEARCH] Invalid JSON: {e}")
-                return False
-        
-        # Non-JSON text - always invalid (we need JSON only)
-        return False
-    
-    while time.time() < t_end:
-        
-        # Selector-based extraction
-        try:
-            res = extract_ai_response(session_manager)
-            text = (res.get("text") or "").strip()
-            text_lower = text.lower()  # Define text_lower early for all checks
-            
-            # Detect Google error messages - DO NOT rotate inside while loop!
-            # Just remember the error type and continue checking
-            detected_error = None
-            norm = " ".join(text.split()).strip().lower()
-            
-            # Check ONLY for proxy block error (either part is enough)
-            if "something went wrong" in text_lower or "ai response wasn't generated" in text_lower:
-                detected_error = "proxy_blocked"
-            
-            # Track Google errors - only rotate if error persists
-            if detected_error:
-                if google_error_type == detected_error:
-                    # Same error - check duration
-                    error_duration = time.time() - google_error_first_seen
-                    if error_duration < google_error_threshold:
-                        print(f"[SEARCH] Google error '{detected_error}' seen, waiting ({error_duration:.1f}s/{google_error_threshold}s)")
-                        # Continue loop - maybe error will clear
+                # Track Google errors - only rotate if error persists
+                if detected_error:
+                    if google_error_type == detected_error:
+                        # Same error - check duration
+                        error_duration = now - google_error_first_seen
+                        if error_duration < google_error_threshold:
+                            log.debug("[SEARCH] Google error '%s' seen, waiting (%.1fs/%ss)", detected_error, error_duration, google_error_threshold)
+                            # Continue loop - maybe error will clear
+                        else:
+                            # Error persisted too long - break loop and rotate outside
+                            print(f"[SEARCH] Google error '{detected_error}' persisted {error_duration:.1f}s - will rotate")
+                            break  # Exit while loop - handle rotation after
                     else:
-                        # Error persisted too long - break loop and rotate outside
-                        print(f"[SEARCH] Google error '{detected_error}' persisted {error_duration:.1f}s - will rotate")
-                        break  # Exit while loop - handle rotation after
+                        # New/different error
+                        print(f"[SEARCH] Google error detected: {detected_error}")
+                        google_error_type = detected_error
+                        google_error_first_seen = now
                 else:
-                    # New/different error
-                    print(f"[SEARCH] Google error detected: {detected_error}")
-                    google_error_type = detected_error
-                    google_error_first_seen = time.time()
-            else:
-                # No error - reset tracking
-                google_error_type = None
-                google_error_first_seen = None
-                
-                # Check if we have valid text
-                if text:
-                    # Try to extract valid JSON immediately
-                    cleaned = extract_clean_json(text)
-                    if cleaned and is_valid_response(text):
-                        # Valid JSON found - return immediately
-                        print(f"[SEARCH] Valid JSON found, size={len(cleaned)} - returning immediately")
-                        return {"text": cleaned, "html": res.get('html', ''), "raw_text": text}
+                    # No error - reset tracking
+                    google_error_type = None
+                    google_error_first_seen = None
                     
-                    # No valid JSON yet - check if text is changing
-                    if text != last_text:
-                        # Text is still growing
-                        if last_text:
-                            print(f"[SEARCH] Text changed from {len(last_text)} to {len(text)} chars")
-                        last_text = text
-                        last_text_time = time.time()
-                        print(f"[SEARCH] Text growing, size={len(text)}, no valid JSON yet")
-                    elif last_text_time is not None:
-                        # Text is the same - check if it's been stable long enough
-                        stable_duration = time.time() - last_text_time
-                        if stable_duration >= text_stable_threshold:
-                            # Text stable but no valid JSON - try fallback
-                            print(f"[SEARCH] Text stable for {stable_duration:.1f}s but no valid JSON (size={len(text)})")
-                            print(f"[SEARCH] Invalid text preview: {repr(text[:200])}")
-                            print(f"[SEARCH] Trying fallback prompt 'json' in same dialog (attempt 1)")
-                            try:
-                                fallback_res = send_followup_prompt("return json", session_manager)
-                                fallback_text = fallback_res.get('text', '').strip()
-                                print(f"[SEARCH] Fallback attempt 1 response received, size={len(fallback_text)}")
-                                
-                                # Check if we got valid JSON (not just any text)
-                                if fallback_text:
-                                    cleaned = extract_clean_json(fallback_text)
-                                    if cleaned:
-                                        print(f"[SEARCH] Fallback attempt 1 returned valid JSON")
-                                        return {"text": cleaned, "html": fallback_res.get('html', ''), "raw_text": fallback_text}
-                                
-                                # First attempt returned empty or invalid - try one more time
-                                print(f"[SEARCH] First fallback returned no valid JSON, trying again (attempt 2)")
-                                time.sleep(1.0)  # Brief pause before retry
-                                fallback_res = send_followup_prompt("json only", session_manager)
-                                fallback_text = fallback_res.get('text', '').strip()
-                                print(f"[SEARCH] Fallback attempt 2 response received, size={len(fallback_text)}")
-                                
-                                # Check second attempt for valid JSON
-                                if fallback_text:
-                                    cleaned = extract_clean_json(fallback_text)
-                                    if cleaned:
-                                        print(f"[SEARCH] Fallback attempt 2 returned valid JSON")
-                                        return {"text": cleaned, "html": fallback_res.get('html', ''), "raw_text": fallback_text}
-                                
-                                # Both attempts failed - return what we have
-                                print(f"[SEARCH] Both fallback attempts failed to return valid JSON")
-                                return fallback_res
-                            except Exception as e:
-                                print(f"[SEARCH] Fallback failed: {e}, returning empty result")
-                                return {"text": "", "html": ""}
-                    else:
-                        # First time seeing this text - start stability timer
-                        last_text = text
-                        last_text_time = time.time()
-                        print(f"[SEARCH] First text found, size={len(text)}")
+                    # Check if we have valid text
+                    if text:
+                        if first_text_at is None:
+                            first_text_at = now
+                            POLL_SCHEDULE.record(kind, first_text_at - t_sent)
+                        
+                        # Try to extract valid JSON immediately
+                        cleaned = clean_json(text)
+                        if cleaned and _is_valid_response(text):
+                            # Valid JSON found - return immediately
+                            print(f"[SEARCH] Valid JSON found, size={len(cleaned)} - returning immediately")
+                            return {"text": cleaned, "html": res.get('html', ''), "raw_text": text}
+                        
+                        # No valid JSON yet - check if text is changing
+                        if text != last_text:
+                            # Text is still growing
+                            if last_text:
+                                log.debug("[SEARCH] Text changed from %d to %d chars", len(last_text), len(text))
+                            last_text = text
+                            last_text_time = now
+                            changed = True
+                            log.debug("[SEARCH] Text growing, size=%d, no valid JSON yet", len(text))
+                        elif last_text_time is not None:
+                            # Text is the same - check if it's been stable long enough
+                            stable_duration = now - last_text_time
+                            if stable_duration >= text_stable_threshold:
+                                # Text stable but no valid JSON - try fallback
+                                print(f"[SEARCH] Text stable for {stable_duration:.1f}s but no valid JSON (size={len(text)})")
+                                print(f"[SEARCH] Invalid text preview: {repr(text[:200])}")
+                                print(f"[SEARCH] Trying fallback prompt 'json' in same dialog (attempt 1)")
+                                try:
+                                    fallback_res = send_followup_prompt("return json", session_manager)
+                                    fallback_text = fallback_res.get('text', '').strip()
+                                    print(f"[SEARCH] Fallback attempt 1 response received, size={len(fallback_text)}")
+                                    
+                                    # Check if we got valid JSON (not just any text)
+                                    if fallback_text:
+                                        cleaned = extract_clean_json(fallback_text)
+                                        if cleaned:
+                                            print(f"[SEARCH] Fallback attempt 1 returned valid JSON")
+                                            return {"text": cleaned, "html": fallback_res.get('html', ''), "raw_text": fallback_text}
+                                    
+                                    # First attempt returned empty or invalid - try one more time
+                                    print(f"[SEARCH] First fallback returned no valid JSON, trying again (attempt 2)")
+                                    time.sleep(1.0)  # Brief pause before retry
+                                    fallback_res = send_followup_prompt("json only", session_manager)
+                                    fallback_text = fallback_res.get('text', '').strip()
+                                    print(f"[SEARCH] Fallback attempt 2 response received, size={len(fallback_text)}")
+                                    
+                                    # Check second attempt for valid JSON
+                                    if fallback_text:
+                                        cleaned = extract_clean_json(fallback_text)
+                                        if cleaned:
+                                            print(f"[SEARCH] Fallback attempt 2 returned valid JSON")
+                                            return {"text": cleaned, "html": fallback_res.get('html', ''), "raw_text": fallback_text}
+                                    
+                                    # Both attempts failed - return what we have
+                                    print(f"[SEARCH] Both fallback attempts failed to return valid JSON")
+                                    return fallback_res
+                                except Exception as e:
+                                    print(f"[SEARCH] Fallback failed: {e}, returning empty result")
+                                    return {"text": "", "html": ""}
+                        else:
+                            # First time seeing this text - start stability timer
+                            last_text = text
+                            last_text_time = now
+                            changed = True
+                            print(f"[SEARCH] First text found, size={len(text)}")
+                
+            except Exception as e:
+                print(f"[SEARCH] Selector extraction failed: {e}")
             
-        except Exception as e:
-            print(f"[SEARCH] Selector extraction failed: {e}")
-        
-        # Periodic nudge
-        if time.time() >= nudge_at:
-            try:
-                el2 = driver.find_element(By.CSS_SELECTOR, AI_TEXTAREA_SEL)
-            except Exception:
-                try:
-                    el2 = driver.find_element(By.CSS_SELECTOR, AI_TEXTAREA_ALT)
-                except Exception:
-                    el2 = None
-            if el2 is not None:
-                try:
-                    el2.send_keys(Keys.ENTER)
-                except Exception:
-                    pass
-            nudge_at = time.time() + 2.5
+            # Periodic nudge
+            if now >= nudge_at:
+                el2 = find_prompt_textarea(driver)
+                if el2 is not None:
+                    try:
+                        el2.send_keys(Keys.ENTER)
+                    except Exception:
+                        pass
+                nudge_at = now + 2.5
+            
+            poll = _next_poll_interval(poll, changed)
+            if first_text_at is None:
+                # Learned schedule, but never sleep past the next nudge
+                now = time.monotonic()
+                _sleep_until_change(driver, next_delay(poll_offsets, now - t_sent, poll, max(nudge_at - now, _POLL_MIN_SEC)))
+            else:
+                _sleep_until_change(driver, poll)
         
-        time.sleep(0.1)
-    
     # Exited while loop - either timeout or Google error persisted
     print(f"[SEARCH] Exited wait loop. google_error={google_error_type}, last_text={bool(last_text)}")
     
     # PRIORITY 1: Check if we exited due to persistent Google error → rotate and retry
-    if google_error_type and session_manager and _retry_count < 2:
-        print(f"[SEARCH] Google error '{google_error_type}' persisted - rotating and retrying (attempt {_retry_count + 1}/3)")
+    if google_error_type and session_manager and retry_count < 2:
+        print(f"[SEARCH] Google error '{google_error_type}' persisted - rotating and retrying (attempt {retry_count + 1}/3)")
         
         # Notify coordinator about proxy block ONLY for proxy-level errors
         # ONLY: "something went wrong and an ai response wasn't generated"
         if google_error_type == "proxy_blocked":
             try:
-                import httpx
-                import os
                 coordinator_url = os.environ.get("COORDINATOR_URL", "http://proxy-coordinator:4200")
                 # Get current proxy index to report
                 current_proxy_idx = session_manager.driver_proxy_idx if hasattr(session_manager, 'driver_proxy_idx') else 0
@@ -610,12 +788,12 @@ def search_google_ai(prompt: str, session_manager, _retry_count: int = 0, _force
             print(f"[SEARCH] Error '{google_error_type}' is content-level, not proxy block - no coordinator notification")
         
         session_manager.rotate_identity(f"google error: {google_error_type}")
-        # Recursive retry with fresh page
-        return search_google_ai(prompt, session_manager, _retry_count + 1, _force_fresh_page=True)
+        # Retry with fresh page
+        return _RETRY
     
     # PRIORITY 2: If max retries reached with Google error → return empty JSON
     if google_error_type:
-        print(f"[SEARCH] Google error '{google_error_type}' after {_retry_count} retries - returning empty JSON")
+        print(f"[SEARCH] Google error '{google_error_type}' after {retry_count} retries - returning empty JSON")
         return {"text": "{}", "html": ""}
     
     # PRIORITY 3: Regular timeout - return last text if any
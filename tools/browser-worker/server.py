@@ -5,13 +5,20 @@
 Structured similarly to tools/chromium-worker/search for maintainability.
 """
 import os
+import re
+import sys
 import time
+import signal
+import logging
 import asyncio
 import threading
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+import httpx
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
@@ -20,18 +27,51 @@ from session.manager import clean_old_session_dirs
 from search import search_google_ai
 from browser.config import PROFILES
 from browser.selectors import extract_clean_json
-from healthcheck_server import start_health_server
+from healthcheck_server import start_health_server, count_browser_processes
 
 # ---------- CONFIG ----------
 PORT = int(os.environ.get("WORKER_PORT", "4101"))
+COORDINATOR_URL = os.environ.get("COORDINATOR_URL", "http://proxy-coordinator:4200")
+CHROME_BINARY = os.environ.get("CHROME_BINARY", "/usr/bin/chromium")
+# Reported by /health; an unset CHROME_BINARY reports "chrome"
+BROWSER_NAME = "chromium" if os.environ.get("CHROME_BINARY", "").endswith("chromium") else "chrome"
+# Newlines to spaces for single-line log previews
+_NL_TRANS = str.maketrans({"\n": " ", "\r": " "})
+# Google AI refusal marker; searched case-insensitively without lowercasing a copy
+_BLOCK_RE = re.compile(r"this request is not supported", re.IGNORECASE)
+# Signal number -> name, built once so the shutdown handler only does a dict lookup
+_SIG_NAMES = {int(s): s.name for s in signal.Signals}
+# Seconds between background refreshes of the /health browser probe
+HEALTH_CACHE_INTERVAL_SEC = 2.0
+
+# Per-request /search logging: LOG_LEVEL=WARNING keeps only failures, and
+# skipped messages are never formatted
+log = logging.getLogger("bpa.worker")
+log.propagate = False
+# This module loads twice (as __main__, then as "server" via uvicorn.run("server:app")),
+# and the logger is shared: attach the stdout handler only once
+if not log.handlers:
+    _log_target = logging.StreamHandler(sys.stdout)
+    _log_target.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_log_target)
+log.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 
 # ---------- STATE ----------
 session_manager = SessionManager()
 busy_lock = asyncio.Lock()
-deferred_rotation_lock = threading.Lock()  # Protect deferred rotation flag
+# Selenium work gets its own thread (the driver is single-threaded anyway) so it
+# never occupies the default pool that serves the other endpoints
+SELENIUM_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selenium")
+HTTPX_CLIENT = None  # Shared keep-alive client for coordinator calls, created at startup
 STARTUP_READY = False
 REQUEST_COUNT_TOTAL = 0
-DEFERRED_ROTATION_REASON = None  # Set when rotation is deferred due to busy worker
+# Reason of a rotation deferred due to busy worker; single slot, append/popleft are atomic
+DEFERRED_ROTATION = deque(maxlen=1)
+BROWSER_VERSION = None  # Detected once at startup
+# Last browser probe, refreshed in the background so /health never scans processes
+_HEALTH_CACHE = {"chrome_alive": False, "ts": 0.0}
+_HEALTH_TASK = None  # Reference keeps the refresh task from being garbage collected
+_BG_TASKS = set()  # Pending fire-and-forget tasks (asyncio only keeps weak references)
 
 # ---------- API ----------
 app = FastAPI()
@@ -40,25 +80,90 @@ app = FastAPI()
 class SearchRequest(BaseModel):
     prompt: str
 
+
+# Fixed-shape /search rejections, serialized once (same compact JSON as JSONResponse)
+_WARMING_UP_RESPONSE = Response(
+    b'{"ok":false,"error":"warming_up","message":"Worker is warming up, retry in a few seconds"}',
+    status_code=503, media_type="application/json",
+)
+_BUSY_RESPONSE = Response(
+    b'{"ok":false,"busy":true,"message":"busy"}',
+    status_code=423, media_type="application/json",
+)
+_BLOCKED_TMPL = (
+    b'{"ok":false,"error":"blocked_by_google","message":"This request is not supported",'
+    b'"retry_other_worker":true,"durationMs":%d}'
+)
+
 # ---------- NOISE PROMPTS ----------
+_NOISE_CHARS = ("\u200b", "\u200c", "\u200d", "\ufeff")  # ZWSP, ZWNJ, ZWJ, BOM
+
+
 def _maybe_apply_noise(prompt: str, req_index: int):
     """Optionally add noise to the prompt on every 10th request.
     Uses zero-width characters to avoid semantic impact.
     Returns (new_prompt, applied: bool).
     """
+    if req_index % 10:
+        return prompt, False
     try:
-        if req_index % 10 != 0:
-            return prompt, False
-        noise_chars = ["\u200b", "\u200c", "\u200d", "\ufeff"]  # ZWSP, ZWNJ, ZWJ, BOM
-        suffix = "".join(random.choice(noise_chars) for _ in range(5))
+        suffix = "".join(random.choices(_NOISE_CHARS, k=5))
         noisy = f"{prompt}{suffix}"
-        print(f"[NOISE] Applied noise to request #{req_index}")
+        log.info("[NOISE] Applied noise to request #%d", req_index)
         return noisy, True
     except Exception as e:
-        print(f"[NOISE] Failed to apply noise: {e}")
+        log.warning("[NOISE] Failed to apply noise: %s", e)
         return prompt, False
 
 
+async def _notify_coordinator() -> None:
+    """Report a completed request to the coordinator (for auto-rotation)."""
+    try:
+        await HTTPX_CLIENT.post(f"{COORDINATOR_URL}/increment-request", json={})
+    except Exception as e:
+        log.warning("[API] Failed to notify coordinator: %s", e)
+
+
+def _spawn(coro) -> None:
+    """Run a coroutine in the background without awaiting its result."""
+    task = asyncio.create_task(coro)
+    _BG_TASKS.add(task)
+    task.add_done_callback(_BG_TASKS.discard)
+
+
+# ---------- HEALTH PROBE ----------
+def _detect_browser_version():
+    """Return the browser version from `<binary> --version`, or None."""
+    try:
+        import subprocess
+        result = subprocess.run([CHROME_BINARY, "--version"], capture_output=True, text=True, timeout=2)
+        if result.returncode == 0:
+            # Output like: "Chromium 131.0.6778.85"
+            parts = result.stdout.strip().split()
+            if len(parts) >= 2:
+                return parts[-1]  # Get last part (version number)
+    except Exception:
+        pass
+    return None
+
+
+def _probe_chrome_alive() -> None:
+    """Scan for a live (non-zombie) browser process and update the health cache."""
+    chrome_count, zombie_count = count_browser_processes()
+    _HEALTH_CACHE["chrome_alive"] = chrome_count > zombie_count
+    _HEALTH_CACHE["ts"] = time.time()
+
+
+async def _refresh_health_cache() -> None:
+    """Refresh the /health cache every HEALTH_CACHE_INTERVAL_SEC, off the event loop."""
+    while True:
+        try:
+            await asyncio.to_thread(_probe_chrome_alive)
+        except Exception as e:
+            log.warning("[HEALTH] Browser probe failed: %s", e)
+        await asyncio.sleep(HEALTH_CACHE_INTERVAL_SEC)
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint - ALWAYS responds immediately.
@@ -74,26 +179,8 @@ async def health():
     # Check 1: If busy, worker is healthy (actively processing)
     is_busy = busy_lock.locked()
     
-    # Check 2: Chrome processes exist AND are not zombies (via psutil, non-blocking)
-    chrome_alive = False
-    try:
-        import psutil
-        for proc in psutil.process_iter(['name', 'status']):
-            try:
-                name = proc.info['name'].lower()
-                status = proc.info.get('status', '')
-                # Check for actual chromium browser process (not chromedriver)
-                is_browser = ('chromium' in name or 'chrome' in name) and 'driver' not in name
-                if is_browser:
-                    # Skip zombie/defunct processes
-                    if status in ['zombie', 'dead'] or status == psutil.STATUS_ZOMBIE:
-                        continue
-                    chrome_alive = True
-                    break
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-    except Exception:
-        pass
+    # Check 2: Chrome processes exist AND are not zombies (cached background probe)
+    chrome_alive = _HEALTH_CACHE["chrome_alive"]
     
     # Worker is OK if:
     # - Warming up (Chrome may not be alive yet), OR
@@ -105,30 +192,14 @@ async def health():
     # ready should be false if chrome is dead (even if warmup completed before)
     actually_ready = STARTUP_READY and chrome_alive
     
-    # Get browser info
-    browser_name = "chromium" if os.environ.get("CHROME_BINARY", "").endswith("chromium") else "chrome"
-    browser_version = None
-    try:
-        import subprocess
-        chrome_bin = os.environ.get("CHROME_BINARY", "/usr/bin/chromium")
-        result = subprocess.run([chrome_bin, "--version"], capture_output=True, text=True, timeout=1)
-        if result.returncode == 0:
-            # Output like: "Chromium 131.0.6778.85"
-            version_str = result.stdout.strip()
-            parts = version_str.split()
-            if len(parts) >= 2:
-                browser_version = parts[-1]  # Get last part (version number)
-    except Exception:
-        pass
-    
     return {
         "ok": ok,
         "busy": is_busy,
         "chrome_alive": chrome_alive,
         "ready": actually_ready,
         "warmup": warmup_in_progress,
-        "browser": browser_name,
-        "version": browser_version,
+        "browser": BROWSER_NAME,
+        "version": BROWSER_VERSION,
     }
 
 
@@ -136,75 +207,98 @@ async def health():
 async def browser_restart():
     """Restart browser session."""
     try:
-        print("[API] Browser restart requested")
+        log.info("[API] Browser restart requested")
         session_manager.rotate_identity("manual restart")
-        print("[API] Browser restarted successfully")
+        log.info("[API] Browser restarted successfully")
         return {"ok": True, "message": "browser restarted"}
     except Exception as e:
-        print(f"[API] Browser restart failed: {e}")
+        log.warning("[API] Browser restart failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/session/refresh")
 async def session_refresh():
     """Refresh browser session (rotate identity)."""
     try:
-        print("[API] Session refresh requested")
+        log.info("[API] Session refresh requested")
         session_manager.rotate_identity("session refresh")
-        print("[API] Session refreshed successfully")
+        log.info("[API] Session refreshed successfully")
         return {"ok": True, "message": "session refreshed"}
     except Exception as e:
-        print(f"[API] Session refresh failed: {e}")
+        log.warning("[API] Session refresh failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _log_block(level: int, *lines: str) -> None:
+    """Emit a framed multi-line log entry as a single record (one stdout write)."""
+    rule = '=' * 80
+    log.log(level, "\n%s\n%s\n%s\n", rule, "\n".join(lines), rule)
+
+
+def _unexpected_error_response(e: Exception, prompt: str, started_ns: int) -> JSONResponse:
+    """Log an unexpected /search failure and build its 500 response."""
+    duration_ms = (time.monotonic_ns() - started_ns) // 1_000_000
+    import traceback
+    _log_block(
+        logging.ERROR,
+        "[API] /search RESPONSE - UNEXPECTED ERROR",
+        f"[API] Duration: {duration_ms}ms",
+        f"[API] Error type: {type(e).__name__}",
+        f"[API] Error: {str(e)}",
+        f"[API] Prompt: {prompt[:100]}",
+        f"[API] Request count: {REQUEST_COUNT_TOTAL}",
+        "[API] Full traceback:",
+        traceback.format_exc().rstrip(),
+    )
+    return JSONResponse(status_code=500, content={"ok": False, "error": str(e), "durationMs": duration_ms})
+
+
 @app.post("/search")
 async def search(req: SearchRequest, request: Request):
-    """Perform Google AI search."""
+    """Perform Google AI search.
+    
+    busy_lock covers only the driver work; result validation, logging and
+    bookkeeping run after it is released.
+    """
     prompt = (req.prompt or "").strip()
     if not prompt:
         raise HTTPException(status_code=400, detail="Invalid prompt")
     
     # CRITICAL: Block search until warmup complete
     if not STARTUP_READY:
-        return JSONResponse(status_code=503, content={
-            "ok": False, 
-            "error": "warming_up", 
-            "message": "Worker is warming up, retry in a few seconds"
-        })
+        return _WARMING_UP_RESPONSE
     
+    # Test-and-take is atomic on the event loop: nothing between this check and
+    # `async with busy_lock` below awaits, and acquire() on a free lock returns
+    # without yielding, so no other request can slip in and queue on the lock
     if busy_lock.locked():
-        return JSONResponse(status_code=423, content={"ok": False, "busy": True, "message": "busy"})
+        return _BUSY_RESPONSE
     
-    started = time.time()
-    try:
-        _san = prompt[:60].replace("\n", " ").replace("\r", " ")
-    except Exception:
-        _san = prompt[:60]
+    started_ns = time.monotonic_ns()
     
-    print(f"\n{'='*80}")
-    print(f"[API] /search REQUEST")
-    print(f"[API] Prompt: {prompt}")
-    print(f"[API] Client: {request.client.host if request.client else 'unknown'}")
-    print(f"{'='*80}\n")
+    if log.isEnabledFor(logging.INFO):
+        _log_block(
+            logging.INFO,
+            "[API] /search REQUEST",
+            f"[API] Prompt: {prompt.translate(_NL_TRANS)}",
+            f"[API] Client: {request.client.host if request.client else 'unknown'}",
+        )
     
     # Use async with to guarantee lock release even with early returns
     async with busy_lock:
         # Check if there's a deferred rotation from coordinator
         # Do this INSIDE busy_lock to prevent race conditions
-        global DEFERRED_ROTATION_REASON
-        deferred_reason = None
-        with deferred_rotation_lock:
-            if DEFERRED_ROTATION_REASON:
-                deferred_reason = DEFERRED_ROTATION_REASON
-                DEFERRED_ROTATION_REASON = None  # Clear flag
+        try:
+            deferred_reason = DEFERRED_ROTATION.popleft()  # Take and clear flag
+        except IndexError:
+            deferred_reason = None
         
         if deferred_reason:
-            print(f"[API] Executing DEFERRED rotation: {deferred_reason}")
+            log.info("[API] Executing DEFERRED rotation: %s", deferred_reason)
             try:
                 session_manager.rotate_proxy_only(deferred_reason)
-                print(f"[API] Deferred rotation completed successfully")
+                log.info("[API] Deferred rotation completed successfully")
             except Exception as e:
-                print(f"[API] Deferred rotation failed: {e}")
+                log.warning("[API] Deferred rotation failed: %s", e)
         
         try:
             # Run blocking Selenium operations in thread pool to not block event loop
@@ -215,132 +309,47 @@ async def search(req: SearchRequest, request: Request):
                 req_index = REQUEST_COUNT_TOTAL
                 modified_prompt, noise_applied = _maybe_apply_noise(prompt, req_index)
                 if noise_applied:
-                    print(f"[API] Noise applied on request #{req_index}")
+                    log.info("[API] Noise applied on request #%d", req_index)
+                # Also rotates once the session reached max_searches_per_session
+                # (under busy_lock, before the driver is used again)
                 session_manager.maybe_rotate_for_search()
-                return search_google_ai(modified_prompt, session_manager)
-            
-            loop = asyncio.get_event_loop()
-            raw_result = await loop.run_in_executor(None, _blocking_search)
-            
-            # Notify coordinator about request completion (for auto-rotation)
-            # Do this BEFORE validation - count all requests regardless of result
-            try:
-                import httpx
-                coordinator_url = os.environ.get("COORDINATOR_URL", "http://proxy-coordinator:4200")
-                async with httpx.AsyncClient(timeout=2.0) as client:
-                    await client.post(f"{coordinator_url}/increment-request", json={})
-            except Exception as e:
-                print(f"[API] Failed to notify coordinator: {e}")
-            
-            # Validate and clean result - ALWAYS return valid JSON or empty string
-            # Get raw text from result (preserve original AI output)
-            raw_text_from_ai = raw_result.get("raw_text") or raw_result.get("text") or ""
-            cleaned_json = raw_result.get("text") or ""
-            
-            # Check for Google AI blocking error
-            if raw_text_from_ai and "this request is not supported" in raw_text_from_ai.lower():
-                duration_ms = int((time.time() - started) * 1000)
-                print(f"\n{'='*80}")
-                print(f"[API] /search RESPONSE - BLOCKED BY GOOGLE AI")
-                print(f"[API] Duration: {duration_ms}ms")
-                print(f"[API] Error: 'This request is not supported'")
-                print(f"[API] Raw response: {raw_text_from_ai[:200]}")
-                print(f"[API] This worker is blocked, should retry with another worker")
-                print(f"{'='*80}\n")
-                return JSONResponse(
-                    status_code=503, 
-                    content={
-                        "ok": False, 
-                        "error": "blocked_by_google", 
-                        "message": "This request is not supported",
-                        "retry_other_worker": True,
-                        "durationMs": duration_ms
-                    }
-                )
-            
-            # If text is not already cleaned, try to extract JSON
-            if cleaned_json and not cleaned_json.strip().startswith('{'):
-                cleaned_json = extract_clean_json(cleaned_json) if cleaned_json else ""
-            
-            # If no valid JSON found, return error with empty result
-            # Worker already did 2 retry attempts to get JSON from AI
-            if not cleaned_json:
-                duration_ms = int((time.time() - started) * 1000)
-                print(f"\n{'='*80}")
-                print(f"[API] /search RESPONSE - EMPTY RESULT")
-                print(f"[API] Duration: {duration_ms}ms")
-                print(f"[API] No valid JSON after 2 fallback attempts")
-                if raw_text_from_ai:
-                    print(f"[API] Raw text preview: {repr(raw_text_from_ai[:200])}")
-                print(f"{'='*80}\n")
-                return JSONResponse(
-                    status_code=422,
-                    content={
-                        "ok": False,
-                        "error": "empty_result",
-                        "message": "No valid JSON extracted after retries",
-                        "raw_text": raw_text_from_ai[:500] if raw_text_from_ai else None,
-                        "html": raw_result.get("html") or "",
-                        "durationMs": duration_ms
-                    }
-                )
-            
-            # Valid JSON found
-            result = {
-                "json": cleaned_json,
-                "html": raw_result.get("html") or "",
-                "raw_text": raw_text_from_ai  # Include raw for debugging
-            }
-            
-            # Increment search counter and check if rotation needed
-            session_manager.search_count += 1
-            if session_manager.search_count >= session_manager.max_searches_per_session:
-                print(f"[API] Proactive rotation after {session_manager.search_count} searches to prevent memory leaks")
-                session_manager.rotate_identity("proactive rotation - max searches reached")
-                session_manager.search_count = 0
-            
-            duration_ms = int((time.time() - started) * 1000)
-            json_result = result.get('json') or ''
-            raw_text = result.get('raw_text') or ''
+                try:
+                    result = search_google_ai(modified_prompt, session_manager)
+                except Exception:
+                    # Do not trust a cached driver check after a failed search
+                    session_manager.invalidate_driver_check()
+                    raise
+                # Count the search while still under busy_lock, so the next request's
+                # maybe_rotate_for_search() sees it and a rotation reset cannot be overtaken
+                session_manager.record_search()
+                return result
             
-            print(f"\n{'='*80}")
-            print(f"[API] /search RESPONSE - SUCCESS")
-            print(f"[API] Duration: {duration_ms}ms")
-            print(f"[API] Valid JSON: {bool(json_result)}")
-            print(f"[API] JSON size: {len(json_result)} chars")
-            if raw_text and raw_text != json_result:
-                print(f"[API] Raw text size: {len(raw_text)} chars")
-                print(f"[API] Raw text preview: {repr(raw_text[:200])}")
-            if json_result:
-                print(f"[API] JSON preview: {json_result[:200]}")
-            else:
-                print(f"[API] Empty response (will trigger fallback in API)")
-            print(f"{'='*80}\n")
-            
-            return {"ok": True, "result": result, "durationMs": duration_ms}
+            raw_result = await asyncio.get_running_loop().run_in_executor(SELENIUM_EXECUTOR, _blocking_search)
         
         except TimeoutException as e:
-            duration_ms = int((time.time() - started) * 1000)
-            print(f"\n{'='*80}")
-            print(f"[API] /search RESPONSE - TIMEOUT")
-            print(f"[API] Duration: {duration_ms}ms")
-            print(f"[API] Error: {str(e)}")
-            print(f"{'='*80}\n")
+            duration_ms = (time.monotonic_ns() - started_ns) // 1_000_000
+            _log_block(
+                logging.WARNING,
+                "[API] /search RESPONSE - TIMEOUT",
+                f"[API] Duration: {duration_ms}ms",
+                f"[API] Error: {str(e)}",
+            )
             return JSONResponse(status_code=504, content={"ok": False, "error": "timeout", "durationMs": duration_ms})
         
         except WebDriverException as e:
-            duration_ms = int((time.time() - started) * 1000)
-            print(f"\n{'='*80}")
-            print(f"[API] /search RESPONSE - WEBDRIVER ERROR")
-            print(f"[API] Duration: {duration_ms}ms")
-            print(f"[API] Error: {str(e)[:200]}")
-            print(f"[API] Prompt: {prompt[:100]}")
-            print(f"[API] Request count: {REQUEST_COUNT_TOTAL}")
+            duration_ms = (time.monotonic_ns() - started_ns) // 1_000_000
             import traceback
-            print(f"[API] Traceback:")
-            traceback.print_exc()
-            print(f"{'='*80}\n")
-            # Rotate identity on WebDriver errors
+            _log_block(
+                logging.ERROR,
+                "[API] /search RESPONSE - WEBDRIVER ERROR",
+                f"[API] Duration: {duration_ms}ms",
+                f"[API] Error: {str(e)[:200]}",
+                f"[API] Prompt: {prompt[:100]}",
+                f"[API] Request count: {REQUEST_COUNT_TOTAL}",
+                "[API] Traceback:",
+                traceback.format_exc().rstrip(),
+            )
+            # Rotate identity on WebDriver errors (still under busy_lock: touches the driver)
             try:
                 session_manager.rotate_identity("WebDriverException")
             except Exception:
@@ -348,19 +357,93 @@ async def search(req: SearchRequest, request: Request):
             return JSONResponse(status_code=500, content={"ok": False, "error": str(e), "durationMs": duration_ms})
         
         except Exception as e:
-            duration_ms = int((time.time() - started) * 1000)
-            print(f"\n{'='*80}")
-            print(f"[API] /search RESPONSE - UNEXPECTED ERROR")
-            print(f"[API] Duration: {duration_ms}ms")
-            print(f"[API] Error type: {type(e).__name__}")
-            print(f"[API] Error: {str(e)}")
-            print(f"[API] Prompt: {prompt[:100]}")
-            print(f"[API] Request count: {REQUEST_COUNT_TOTAL}")
-            import traceback
-            print(f"[API] Full traceback:")
-            traceback.print_exc()
-            print(f"{'='*80}\n")
-            return JSONResponse(status_code=500, content={"ok": False, "error": str(e), "durationMs": duration_ms})
+            return _unexpected_error_response(e, prompt, started_ns)
+    
+    # busy_lock released: nothing below touches the driver
+    try:
+        # Notify coordinator about request completion (for auto-rotation)
+        # Do this BEFORE validation - count all requests regardless of result
+        # Not awaited: the response does not depend on it
+        _spawn(_notify_coordinator())
+        
+        # Validate and clean result - ALWAYS return valid JSON or empty string
+        # Get raw text from result (preserve original AI output)
+        raw_text_from_ai = raw_result.get("raw_text") or raw_result.get("text") or ""
+        cleaned_json = raw_result.get("text") or ""
+        
+        # Check for Google AI blocking error
+        if raw_text_from_ai and _BLOCK_RE.search(raw_text_from_ai):
+            duration_ms = (time.monotonic_ns() - started_ns) // 1_000_000
+            _log_block(
+                logging.WARNING,
+                "[API] /search RESPONSE - BLOCKED BY GOOGLE AI",
+                f"[API] Duration: {duration_ms}ms",
+                "[API] Error: 'This request is not supported'",
+                f"[API] Raw response: {raw_text_from_ai[:200]}",
+                "[API] This worker is blocked, should retry with another worker",
+            )
+            return Response(_BLOCKED_TMPL % duration_ms, status_code=503, media_type="application/json")
+        
+        # If text is not already cleaned, try to extract JSON
+        # (regex-heavy on large answers: run it in a thread, not on the event loop)
+        if cleaned_json and not cleaned_json.strip().startswith('{'):
+            cleaned_json = await asyncio.to_thread(extract_clean_json, cleaned_json)
+        
+        # If no valid JSON found, return error with empty result
+        # Worker already did 2 retry attempts to get JSON from AI
+        if not cleaned_json:
+            duration_ms = (time.monotonic_ns() - started_ns) // 1_000_000
+            lines = [
+                "[API] /search RESPONSE - EMPTY RESULT",
+                f"[API] Duration: {duration_ms}ms",
+                "[API] No valid JSON after 2 fallback attempts",
+            ]
+            if raw_text_from_ai:
+                lines.append(f"[API] Raw text preview: {repr(raw_text_from_ai[:200])}")
+            _log_block(logging.WARNING, *lines)
+            return JSONResponse(
+                status_code=422,
+                content={
+                    "ok": False,
+                    "error": "empty_result",
+                    "message": "No valid JSON extracted after retries",
+                    "raw_text": raw_text_from_ai[:500] if raw_text_from_ai else None,
+                    "html": raw_result.get("html") or "",
+                    "durationMs": duration_ms
+                }
+            )
+        
+        # Valid JSON found
+        result = {
+            "json": cleaned_json,
+            "html": raw_result.get("html") or "",
+            "raw_text": raw_text_from_ai  # Include raw for debugging
+        }
+        
+        duration_ms = (time.monotonic_ns() - started_ns) // 1_000_000
+        json_result = result.get('json') or ''
+        raw_text = result.get('raw_text') or ''
+        
+        if log.isEnabledFor(logging.INFO):
+            lines = [
+                "[API] /search RESPONSE - SUCCESS",
+                f"[API] Duration: {duration_ms}ms",
+                f"[API] Valid JSON: {bool(json_result)}",
+                f"[API] JSON size: {len(json_result)} chars",
+            ]
+            if raw_text and raw_text != json_result:
+                lines.append(f"[API] Raw text size: {len(raw_text)} chars")
+                lines.append(f"[API] Raw text preview: {repr(raw_text[:200])}")
+            if json_result:
+                lines.append(f"[API] JSON preview: {json_result[:200]}")
+            else:
+                lines.append("[API] Empty response (will trigger fallback in API)")
+            _log_block(logging.INFO, *lines)
+        
+        return {"ok": True, "result": result, "durationMs": duration_ms}
+    
+    except Exception as e:
+        return _unexpected_error_response(e, prompt, started_ns)
 
 
 @app.post("/rotate-proxy")
@@ -376,18 +459,16 @@ async def rotate_proxy(request: Request):
     except Exception:
         reason = "coordinator request"
     
-    print(f"\n{'='*80}")
-    print(f"[API] /rotate-proxy REQUEST from coordinator")
-    print(f"[API] Reason: {reason}")
-    
     # Check if worker is busy - skip rotation to avoid killing active request
     if busy_lock.locked():
-        global DEFERRED_ROTATION_REASON
-        with deferred_rotation_lock:
-            DEFERRED_ROTATION_REASON = reason
-        print(f"[API] Worker is BUSY - deferring rotation until next request")
-        print(f"[API] Rotation will happen automatically when current request completes")
-        print(f"{'='*80}\n")
+        DEFERRED_ROTATION.append(reason)
+        _log_block(
+            logging.INFO,
+            "[API] /rotate-proxy REQUEST from coordinator",
+            f"[API] Reason: {reason}",
+            "[API] Worker is BUSY - deferring rotation until next request",
+            "[API] Rotation will happen automatically when current request completes",
+        )
         return {
             "ok": True,
             "rotated": False,
@@ -395,15 +476,19 @@ async def rotate_proxy(request: Request):
             "reason": "worker busy - will rotate on next request"
         }
     
-    print(f"{'='*80}\n")
+    _log_block(
+        logging.INFO,
+        "[API] /rotate-proxy REQUEST from coordinator",
+        f"[API] Reason: {reason}",
+    )
     
     try:
         # Rotate proxy only (keep same profile)
         session_manager.rotate_proxy_only(reason)
-        print(f"[API] Proxy rotation successful")
+        log.info("[API] Proxy rotation successful")
         return {"ok": True, "rotated": True, "reason": reason}
     except Exception as e:
-        print(f"[API] Proxy rotation failed: {e}")
+        log.warning("[API] Proxy rotation failed: %s", e)
         return JSONResponse(
             status_code=500,
             content={"ok": False, "error": str(e), "reason": reason}
@@ -417,73 +502,91 @@ def _warmup_sync() -> None:
     Checks ACTUAL state, not timeouts!
     """
     global STARTUP_READY
-    print("[WARMUP] Starting - /search blocked until textarea is ready")
+    log.info("[WARMUP] Starting - /search blocked until textarea is ready")
     
     for attempt in range(3):
         try:
-            print(f"[WARMUP] Attempt {attempt + 1}/3: initializing browser")
+            log.info("[WARMUP] Attempt %d/3: initializing browser", attempt + 1)
             session_manager.rotate_identity("startup warmup")
             
             from browser.page_actions import ensure_aimode_ready
             # Check actual state: is textarea clickable?
             if ensure_aimode_ready(session_manager):
                 STARTUP_READY = True
-                print("[WARMUP] ✓ READY - textarea clickable, /search accepting requests")
+                log.info("[WARMUP] ✓ READY - textarea clickable, /search accepting requests")
                 return
             else:
-                print(f"[WARMUP] ✗ Attempt {attempt + 1}: textarea not ready")
+                log.warning("[WARMUP] ✗ Attempt %d: textarea not ready", attempt + 1)
                 
         except Exception as e:
-            print(f"[WARMUP] ✗ Attempt {attempt + 1} error: {e}")
+            log.warning("[WARMUP] ✗ Attempt %d error: %s", attempt + 1, e)
     
     STARTUP_READY = False
-    print("[WARMUP] ✗ FAILED - textarea not ready after 3 attempts, rejecting /search")
+    log.error("[WARMUP] ✗ FAILED - textarea not ready after 3 attempts, rejecting /search")
+
+
+def _clean_profile_sessions(profile) -> None:
+    """Remove old session dirs of one profile; failures are logged, never raised."""
+    try:
+        clean_old_session_dirs(str(profile), keep_recent=2)
+    except Exception as e:
+        log.warning("[STARTUP] Failed to clean sessions in %s: %s", profile, e)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     """Start background warmup and watchdog threads."""
-    import signal
-    import sys
-    
     # Register signal handlers to log shutdown reasons
     def signal_handler(signum, frame):
-        sig_name = signal.Signals(signum).name
-        print(f"\n{'='*80}")
-        print(f"[SHUTDOWN] Received signal: {sig_name} ({signum})")
-        print(f"[SHUTDOWN] Frame: {frame}")
-        print(f"[SHUTDOWN] Initiating graceful shutdown...")
-        print(f"{'='*80}\n")
+        sig_name = _SIG_NAMES.get(signum, str(signum))
+        _log_block(
+            logging.WARNING,
+            f"[SHUTDOWN] Received signal: {sig_name} ({signum})",
+            f"[SHUTDOWN] Frame: {frame}",
+            "[SHUTDOWN] Initiating graceful shutdown...",
+        )
         # Let uvicorn handle the actual shutdown
         sys.exit(0)
     
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
     
-    print(f"[STARTUP] Signal handlers registered (SIGTERM, SIGINT)")
-    print(f"[STARTUP] Process PID: {os.getpid()}")
+    log.info("[STARTUP] Signal handlers registered (SIGTERM, SIGINT)")
+    log.info("[STARTUP] Process PID: %d", os.getpid())
     
     # Clean old session directories on startup to prevent disk bloat
-    print("[STARTUP] Cleaning old session directories...")
-    for profile in PROFILES:
-        try:
-            clean_old_session_dirs(str(profile), keep_recent=2)
-        except Exception as e:
-            print(f"[STARTUP] Failed to clean sessions in {profile}: {e}")
+    # Profiles are independent directory trees: clean them in parallel
+    log.info("[STARTUP] Cleaning old session directories...")
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(PROFILES)))) as pool:
+        list(pool.map(_clean_profile_sessions, PROFILES))
     
     threading.Thread(target=_warmup_sync, name="warmup", daemon=True).start()
+    
+    # Browser binary does not change for the process lifetime: detect the version once
+    global BROWSER_VERSION, HTTPX_CLIENT, _HEALTH_TASK
+    BROWSER_VERSION = _detect_browser_version()
+    log.info("[STARTUP] Browser version: %s", BROWSER_VERSION)
+    
+    HTTPX_CLIENT = httpx.AsyncClient(timeout=2.0, limits=httpx.Limits(max_keepalive_connections=4))
+    
+    # Startup handlers run on the event loop thread, so the task can be scheduled here
+    _HEALTH_TASK = asyncio.create_task(_refresh_health_cache())
     # Watchdog disabled - causes race conditions and kills active searches
-    print("[STARTUP] Watchdog disabled - browser health checked on-demand during /search")
+    log.info("[STARTUP] Watchdog disabled - browser health checked on-demand during /search")
 
 
 @app.on_event("shutdown")
-def on_shutdown() -> None:
-    """Log shutdown event."""
-    print(f"\n{'='*80}")
-    print(f"[SHUTDOWN] FastAPI shutdown event triggered")
-    print(f"[SHUTDOWN] Process PID: {os.getpid()}")
-    print(f"[SHUTDOWN] Total requests processed: {REQUEST_COUNT_TOTAL}")
-    print(f"{'='*80}\n")
+async def on_shutdown() -> None:
+    """Log shutdown event, stop the Selenium executor and close the HTTP client."""
+    _log_block(
+        logging.WARNING,
+        "[SHUTDOWN] FastAPI shutdown event triggered",
+        f"[SHUTDOWN] Process PID: {os.getpid()}",
+        f"[SHUTDOWN] Total requests processed: {REQUEST_COUNT_TOTAL}",
+    )
+    SELENIUM_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    if HTTPX_CLIENT is not None:
+        await HTTPX_CLIENT.aclose()
 
 
 if __name__ == "__main__":
@@ -492,20 +595,18 @@ if __name__ == "__main__":
     # Start separate health check server FIRST (always responsive)
     health_server = start_health_server(port=4102)
     
-    print(f"[MAIN] Starting uvicorn server on port {PORT}")
-    print(f"[MAIN] Process PID: {os.getpid()}")
-    print(f"[MAIN] Blocking operations will run in thread pool to keep event loop responsive")
+    log.info("[MAIN] Starting uvicorn server on port %s", PORT)
+    log.info("[MAIN] Process PID: %d", os.getpid())
+    log.info("[MAIN] Blocking operations will run in thread pool to keep event loop responsive")
     try:
         # Single worker with async event loop
         # Blocking Selenium operations run in thread pool via run_in_executor
         uvicorn.run("server:app", host="0.0.0.0", port=PORT, reload=False)
     except KeyboardInterrupt:
-        print(f"\n[MAIN] KeyboardInterrupt received, exiting...")
+        log.warning("\n[MAIN] KeyboardInterrupt received, exiting...")
     except Exception as e:
-        print(f"\n[MAIN] Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n[MAIN] Unexpected error: %s", e)
     finally:
-        print(f"[MAIN] Shutting down health server...")
+        log.info("[MAIN] Shutting down health server...")
         health_server.shutdown()
-        print(f"[MAIN] Uvicorn server stopped")
+        log.info("[MAIN] Uvicorn server stopped")
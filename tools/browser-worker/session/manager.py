@@ -1,12 +1,27 @@
 # comments: English only
 """Browser session management"""
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
 import threading
 import time
 import shutil
 import os
+import signal
+import socket
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 
+import httpx
+import psutil
 from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
 
@@ -14,6 +29,7 @@ from browser.config import (
     PROFILES,
     PAGE_TIMEOUT,
     SESSION_PER_SEARCH,
+    PREWARM_STANDBY,
     AI_READY_TIMEOUT_SEC,
     AI_READY_TIMEOUT_PER_SEARCH_SEC,
     QUIT_TIMEOUT_SEC,
@@ -22,28 +38,140 @@ from browser.config import (
     PROXY_BINDING_MODE,
     PROXY_BLOCK_TIMEOUT_SEC,
 )
-from browser.driver import create_driver
+
+from browser.driver import create_driver, shared_service_pid
 from browser.page_actions import ensure_aimode_ready
 
+# Session/rotation messages: handlers only enqueue, a listener thread writes stdout,
+# so rotation paths holding the identity lock never block on the Docker log pipe
+log = logging.getLogger("bpa.session")
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+_log_target = logging.StreamHandler(sys.stdout)
+_log_target.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_target)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on exit
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+log.setLevel(logging.INFO)
+
+# Reentrant: rotate_identity retries the next profile recursively while holding the lock.
+# fastrlock is an optional, cheaper drop-in for threading.RLock.
+try:
+    from fastrlock.rlock import FastRLock as _RLock
+except ImportError:
+    _RLock = threading.RLock
+
+# Launch retry backoff: full jitter, so workers rotated by the same coordinator
+# broadcast do not relaunch Chrome in lock-step. Own RNG seeded from the OS so
+# containers started from the same image never share a sequence.
+LAUNCH_BACKOFF_BASE_SEC = 0.5
+LAUNCH_BACKOFF_MAX_SEC = 8.0
+_backoff_rng = random.Random(os.urandom(8))
+
+
+def _launch_backoff(attempt: int) -> None:
+    """Sleep before the next Chrome launch attempt (0-based attempt that just failed)."""
+    time.sleep(_backoff_rng.uniform(0, min(LAUNCH_BACKOFF_MAX_SEC, LAUNCH_BACKOFF_BASE_SEC * (2 ** attempt))))
+
+
+# Both lists are fixed at import (frozen Config)
+_N_PROFILES = len(PROFILES)
+_N_PROXIES = len(PROXY_LIST)
+
 # Redis client for shared proxy index
 try:
     import redis
     REDIS_URL = os.environ.get("REDIS_URL", "redis://redis:6379")
-    redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+    # Keepalive + periodic PING keep pooled sockets warm across idle stretches between rotations
+    redis_client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+        REDIS_URL, decode_responses=True, max_connections=16,
+        socket_keepalive=True,
+        socket_keepalive_options={socket.TCP_KEEPIDLE: 30} if hasattr(socket, "TCP_KEEPIDLE") else None,
+        health_check_interval=30,
+    ))
     REDIS_AVAILABLE = True
-    print(f"[REDIS] Connected to {REDIS_URL}")
+    log.info("[REDIS] Connected to %s", REDIS_URL)
 except Exception as e:
     redis_client = None
     REDIS_AVAILABLE = False
-    print(f"[REDIS] Not available: {e}")
+    log.warning("[REDIS] Not available: %s", e)
+
+# Check-and-increment of the shared proxy index plus the blocked-proxy probe, in one
+# atomic round trip. KEYS: shared index key, blocked key prefix. ARGV: index our
+# driver used, proxy count. Returns {shared_idx, first unblocked proxy or -1, rotated}.
+_ROTATE_PROXY_LUA = """
+local cur = tonumber(redis.call('GET', KEYS[1]) or '0')
+local rotated = 0
+if cur == tonumber(ARGV[1]) then
+  cur = redis.call('INCR', KEYS[1])
+  rotated = 1
+end
+local n = tonumber(ARGV[2])
+for i = 0, n - 1 do
+  local probe = (cur + i) % n
+  if redis.call('EXISTS', KEYS[2] .. ':' .. probe) == 0 then
+    return {cur, probe, rotated}
+  end
+end
+return {cur, -1, rotated}
+"""
+rotate_proxy_script = redis_client.register_script(_ROTATE_PROXY_LUA) if REDIS_AVAILABLE else None
+
+# Block events consumed by the proxy coordinator (BRPOP) in place of POST /block-proxy
+PROXY_BLOCK_EVENTS_KEY = "browser_worker:proxy_block_events"
+# SETEX of the block key plus LPUSH of the event, in one round trip.
+# KEYS: block key, events list. ARGV: block TTL, JSON event.
+_BLOCK_PROXY_LUA = """
+redis.call('SETEX', KEYS[1], ARGV[1], '1')
+redis.call('LPUSH', KEYS[2], ARGV[2])
+return 1
+"""
+block_proxy_script = redis_client.register_script(_BLOCK_PROXY_LUA) if REDIS_AVAILABLE else None
 
 # Proxy health check timeout
 PROXY_CHECK_TIMEOUT = int(os.environ.get("PROXY_CHECK_TIMEOUT_SEC", "5"))
+# Candidates probed concurrently once the first proxy choice fails its check
+PROXY_CHECK_FANOUT = max(1, int(os.environ.get("PROXY_CHECK_FANOUT", "3")))
+# A proxy that passed its connectivity check this recently is not probed again
+PROXY_CHECK_CACHE_SEC = 60.0
+_PROXY_CHECK_POOL = ThreadPoolExecutor(max_workers=PROXY_CHECK_FANOUT, thread_name_prefix="proxy-check")
 
 # Coordinator URL for proxy block notifications
 COORDINATOR_URL = os.environ.get("COORDINATOR_URL", "http://proxy-coordinator:4200")
 
 
+# Long-lived httpx clients (keep-alive skips TCP/TLS setup on repeat calls), created lazily
+PROXY_CLIENT_CACHE_SIZE = 64
+_proxy_clients: "OrderedDict[str, object]" = OrderedDict()
+_coordinator_client = None
+_http_clients_lock = threading.Lock()
+
+
+def _get_proxy_client(proxy_url: str):
+    """Return the cached httpx.Client routed through proxy_url (LRU, PROXY_CLIENT_CACHE_SIZE entries)."""
+    with _http_clients_lock:
+        client = _proxy_clients.get(proxy_url)
+        if client is not None:
+            _proxy_clients.move_to_end(proxy_url)
+            return client
+        client = _proxy_clients[proxy_url] = httpx.Client(proxy=proxy_url)
+        if len(_proxy_clients) > PROXY_CLIENT_CACHE_SIZE:
+            _, evicted = _proxy_clients.popitem(last=False)
+            evicted.close()
+        return client
+
+
+def _get_coordinator_client():
+    """Return the shared httpx.Client for proxy coordinator calls."""
+    global _coordinator_client
+    if _coordinator_client is None:
+        with _http_clients_lock:
+            if _coordinator_client is None:
+                _coordinator_client = httpx.Client(base_url=COORDINATOR_URL, timeout=5)
+    return _coordinator_client
+
+
 def check_proxy_connectivity(proxy_url: str, timeout: int = PROXY_CHECK_TIMEOUT) -> bool:
     """Check if proxy is reachable by making a test connection.
     
@@ -55,19 +183,16 @@ def check_proxy_connectivity(proxy_url: str, timeout: int = PROXY_CHECK_TIMEOUT)
         True if proxy is reachable, False otherwise
     """
     try:
-        import httpx
-        
         # Normalize proxy URL
         if not proxy_url.startswith("http"):
             proxy_url = f"http://{proxy_url}"
         
         # Try to connect through proxy to a reliable endpoint
-        with httpx.Client(proxy=proxy_url, timeout=timeout) as client:
-            response = client.get("https://www.google.com/generate_204")
-            # Google returns 204 No Content for this endpoint
-            return response.status_code in [200, 204]
+        response = _get_proxy_client(proxy_url).get("https://www.google.com/generate_204", timeout=timeout)
+        # Google returns 204 No Content for this endpoint
+        return response.status_code in [200, 204]
     except Exception as e:
-        print(f"[PROXY_CHECK] Proxy {proxy_url.split('@')[-1] if '@' in proxy_url else proxy_url} failed: {e}")
+        log.warning("[PROXY_CHECK] Proxy %s failed: %s", proxy_url.split('@')[-1] if '@' in proxy_url else proxy_url, e)
         return False
 
 
@@ -82,18 +207,31 @@ def notify_proxy_blocked(proxy_idx: int, reason: str) -> None:
         return
     
     try:
-        import httpx
-        with httpx.Client(timeout=5) as client:
-            response = client.post(
-                f"{COORDINATOR_URL}/block-proxy",
-                json={"proxy_idx": proxy_idx, "reason": reason}
-            )
-            if response.status_code == 200:
-                print(f"[PROXY_BLOCK] Notified coordinator: proxy {proxy_idx} blocked ({reason})")
-            else:
-                print(f"[PROXY_BLOCK] Coordinator returned {response.status_code}")
+        response = _get_coordinator_client().post(
+            "/block-proxy",
+            json={"proxy_idx": proxy_idx, "reason": reason}
+        )
+        if response.status_code == 200:
+            log.info("[PROXY_BLOCK] Notified coordinator: proxy %s blocked (%s)", proxy_idx, reason)
+        else:
+            log.info("[PROXY_BLOCK] Coordinator returned %s", response.status_code)
     except Exception as e:
-        print(f"[PROXY_BLOCK] Failed to notify coordinator: {e}")
+        log.warning("[PROXY_BLOCK] Failed to notify coordinator: %s", e)
+
+
+# process_iter reports these for defunct processes
+_DEAD_STATUSES = frozenset({psutil.STATUS_ZOMBIE, psutil.STATUS_DEAD})
+
+
+@lru_cache(maxsize=512)
+def _is_browser_name(name: str) -> bool:
+    """Whether a process name is a chrome/chromium browser (not chromedriver).
+    
+    The set of distinct process names is small, so process table scans pay a
+    cache lookup per process instead of lower() plus substring searches.
+    """
+    name = name.lower()
+    return ('chromium' in name or 'chrome' in name) and 'driver' not in name
 
 
 def is_driver_valid(driver: webdriver.Chrome) -> bool:
@@ -114,95 +252,203 @@ def is_driver_valid(driver: webdriver.Chrome) -> bool:
         
         # Check 2: Browser process must be alive (not zombie)
         # This catches cases where chromedriver is alive but chromium crashed
-        import psutil
-        chrome_alive = False
-        for proc in psutil.process_iter(['name', 'status']):
+        browser_pid = getattr(driver, "bpa_browser_pid", None)
+        if browser_pid:
+            # Known browser PID (recorded by create_driver): one /proc read, no process table scan
             try:
-                name = proc.info['name'].lower()
-                status = proc.info.get('status', '')
-                # Check for actual chromium browser process (not chromedriver)
-                is_browser = ('chromium' in name or 'chrome' in name) and 'driver' not in name
-                if is_browser:
-                    # Skip zombie/defunct processes
-                    if status in ['zombie', 'dead'] or status == psutil.STATUS_ZOMBIE:
-                        continue
-                    chrome_alive = True
-                    break
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
+                status = psutil.Process(browser_pid).status()
+            except psutil.NoSuchProcess:
+                status = psutil.STATUS_DEAD
+            if status in _DEAD_STATUSES:
+                log.warning("[SESSION] Browser process is dead or zombie - driver invalid")
+                return False
+            return True
+        
+        chrome_alive = False
+        # ad_value=None: inaccessible fields come back as None instead of raising
+        for proc in psutil.process_iter(['name', 'status'], ad_value=None):
+            info = proc.info
+            name = info['name']
+            # Check for actual chromium browser process (not chromedriver)
+            if name and _is_browser_name(name):
+                # Skip zombie/defunct processes
+                if info['status'] in _DEAD_STATUSES:
+                    continue
+                chrome_alive = True
+                break
         
         if not chrome_alive:
-            print("[SESSION] Browser process is dead or zombie - driver invalid")
+            log.warning("[SESSION] Browser process is dead or zombie - driver invalid")
             return False
         
         return True
     except Exception as e:
-        print(f"[SESSION] Driver validation failed: {e}")
+        log.warning("[SESSION] Driver validation failed: %s", e)
         return False
 
 
-def kill_zombie_chrome_processes() -> int:
+_HAS_PROC = os.path.isdir("/proc/self")
+
+
+def _zombie_browsers_proc() -> list[tuple[int, int]]:
+    """Find zombie browser processes by reading /proc/<pid>/stat directly.
+    
+    Returns:
+        List of (pid, ppid) for defunct chrome/chromium processes
+    """
+    zombies = []
+    with os.scandir("/proc") as it:
+        for entry in it:
+            pid = entry.name
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as f:
+                    stat = f.read()
+            except OSError:
+                # Process exited between listing and open
+                continue
+            # "pid (comm) state ppid ..."; comm may contain spaces and parentheses
+            head, _, rest = stat.rpartition(b")")
+            fields = rest.split(None, 2)
+            if len(fields) < 2 or fields[0] not in (b"Z", b"X"):
+                continue
+            name = head.partition(b"(")[2].lower()
+            if b"chrom" in name and b"driver" not in name:
+                zombies.append((int(pid), int(fields[1])))
+    return zombies
+
+
+def _is_zombie(pid: int) -> bool:
+    """Whether a single process is defunct (exited but not reaped)."""
+    if _HAS_PROC:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                return f.read().rpartition(b")")[2].split(None, 1)[0] in (b"Z", b"X")
+        except (OSError, IndexError):
+            # Already reaped
+            return False
+    try:
+        return psutil.Process(pid).status() in _DEAD_STATUSES
+    except Exception:
+        return False
+
+
+def _zombie_browsers_psutil() -> list[tuple[int, int]]:
+    """Portable fallback for _zombie_browsers_proc when /proc is unavailable."""
+    zombies = []
+    for proc in psutil.process_iter(['pid', 'ppid', 'name', 'status'], ad_value=None):
+        info = proc.info
+        name = info['name']
+        if name and info['status'] in _DEAD_STATUSES and _is_browser_name(name):
+            zombies.append((info['pid'], info['ppid']))
+    return zombies
+
+
+def _zombie_browsers_under(root_pid: int) -> Optional[list[tuple[int, int]]]:
+    """Find zombie browser processes among the descendants of root_pid.
+    
+    Returns:
+        List of (pid, ppid), or None if root_pid is gone (orphans were reparented)
+    """
+    try:
+        children = psutil.Process(root_pid).children(recursive=True)
+    except psutil.Error:
+        return None
+    zombies = []
+    for child in children:
+        try:
+            if child.status() in _DEAD_STATUSES and _is_browser_name(child.name()):
+                zombies.append((child.pid, child.ppid()))
+        except psutil.Error:
+            continue
+    return zombies
+
+
+def kill_zombie_chrome_processes(root_pid: Optional[int] = None) -> int:
     """Kill zombie/defunct Chrome processes and their parent chromedrivers.
     
     Zombie processes occur when chromium crashes but chromedriver doesn't reap it.
-    We need to kill the parent chromedriver to clean up properly.
+    We need to kill the parent chromedriver to clean up properly. The shared
+    chromedriver is never killed: it serves every live session (including the
+    warm standby), so its zombies are left for it to reap.
+    
+    Args:
+        root_pid: chromedriver PID; when given, only its descendants are inspected
+            instead of the whole process table
     
     Returns:
         Number of processes killed
     """
-    import psutil
-    import os
-    import signal
-    
     killed = 0
-    zombie_pids = []
-    chromedriver_pids_to_kill = set()
     
     # First pass: find zombie chrome processes and their parents
-    for proc in psutil.process_iter(['pid', 'ppid', 'name', 'status']):
-        try:
-            name = proc.info['name'].lower()
-            status = proc.info.get('status', '')
-            is_browser = ('chromium' in name or 'chrome' in name) and 'driver' not in name
-            
-            if is_browser and (status in ['zombie', 'dead'] or status == psutil.STATUS_ZOMBIE):
-                zombie_pids.append(proc.info['pid'])
-                # Mark parent chromedriver for killing
-                ppid = proc.info.get('ppid')
-                if ppid and ppid > 1:
-                    chromedriver_pids_to_kill.add(ppid)
-                    
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
+    zombies = _zombie_browsers_under(root_pid) if root_pid else None
+    if zombies is None:
+        zombies = _zombie_browsers_proc() if _HAS_PROC else _zombie_browsers_psutil()
+    zombie_pids = [pid for pid, _ in zombies]
+    # Mark parent chromedrivers for killing
+    chromedriver_pids_to_kill = {ppid for _, ppid in zombies if ppid and ppid > 1}
+    shared_pid = shared_service_pid()
+    if shared_pid in chromedriver_pids_to_kill:
+        chromedriver_pids_to_kill.discard(shared_pid)
+        log.info("[ZOMBIE_CLEANUP] Sparing shared chromedriver PID %s (other sessions use it)", shared_pid)
     
     if not zombie_pids:
         return 0
     
-    print(f"[ZOMBIE_CLEANUP] Found {len(zombie_pids)} zombie Chrome processes: {zombie_pids}")
-    print(f"[ZOMBIE_CLEANUP] Parent chromedrivers to kill: {list(chromedriver_pids_to_kill)}")
+    log.info("[ZOMBIE_CLEANUP] Found %s zombie Chrome processes: %s", len(zombie_pids), zombie_pids)
+    log.info("[ZOMBIE_CLEANUP] Parent chromedrivers to kill: %s", list(chromedriver_pids_to_kill))
     
     # Kill parent chromedrivers first (this will also reap zombies)
     for pid in chromedriver_pids_to_kill:
         try:
             os.kill(pid, signal.SIGKILL)
             killed += 1
-            print(f"[ZOMBIE_CLEANUP] Killed chromedriver PID {pid}")
+            log.info("[ZOMBIE_CLEANUP] Killed chromedriver PID %s", pid)
         except (ProcessLookupError, PermissionError) as e:
-            print(f"[ZOMBIE_CLEANUP] Failed to kill PID {pid}: {e}")
+            log.warning("[ZOMBIE_CLEANUP] Failed to kill PID %s: %s", pid, e)
     
     # Wait a moment for zombies to be reaped by tini
-    import time
     time.sleep(0.5)
     
     return killed
 
 
+# Grace period for driver.quit() when the browser PID is known and can be signalled
+QUIT_GRACE_SEC = 1.0
+QUIT_TERM_WAIT_SEC = 0.5
+# Reused threads for time-boxed driver.quit() calls
+_QUIT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="quit")
+
+
+def _signal_browser_tree(pid: int, sig: int) -> None:
+    """Send a signal to the browser process and all of its descendants.
+    
+    Chrome shares the worker's process group, so killpg is not an option;
+    the tree is walked via psutil instead.
+    """
+    try:
+        procs = psutil.Process(pid).children(recursive=True)
+    except Exception:
+        procs = []
+    for target in [pid] + [p.pid for p in procs]:
+        try:
+            os.kill(target, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
 def safe_quit_driver(driver: webdriver.Chrome, timeout: int = QUIT_TIMEOUT_SEC) -> bool:
     """Quit driver with timeout protection.
     
+    When create_driver recorded the browser PID, quit() only gets
+    QUIT_GRACE_SEC before the browser is sent SIGTERM and then SIGKILL,
+    so a hung Chrome does not stall rotation for the full timeout.
+    
     Args:
         driver: Chrome driver instance to quit
-        timeout: Maximum time to wait for quit in seconds
+        timeout: Maximum time to wait for quit in seconds (no known browser PID)
         
     Returns:
         True if quit succeeded, False if timed out
@@ -210,27 +456,74 @@ def safe_quit_driver(driver: webdriver.Chrome, timeout: int = QUIT_TIMEOUT_SEC)
     if not driver:
         return True
     
+    browser_pid = getattr(driver, "bpa_browser_pid", None)
+    # chromedriver process: zombie browsers are its children
+    service_proc = getattr(getattr(driver, "service", None), "process", None)
+    driver_pid = getattr(service_proc, "pid", None)
+    
     def quit_with_timeout():
         try:
             driver.quit()
         except Exception as e:
-            print(f"[QUIT] driver.quit() failed: {e}")
+            log.warning("[QUIT] driver.quit() failed: %s", e)
+    
+    quit_future = _QUIT_EXECUTOR.submit(quit_with_timeout)
+    wait_futures([quit_future], timeout=min(timeout, QUIT_GRACE_SEC) if browser_pid else timeout)
     
-    quit_thread = threading.Thread(target=quit_with_timeout, daemon=True)
-    quit_thread.start()
-    quit_thread.join(timeout=timeout)
+    if not quit_future.done() and browser_pid:
+        log.warning("[QUIT] driver.quit() hung - sending SIGTERM to browser PID %s", browser_pid)
+        _signal_browser_tree(browser_pid, signal.SIGTERM)
+        wait_futures([quit_future], timeout=QUIT_TERM_WAIT_SEC)
+        if not quit_future.done():
+            log.info("[QUIT] Browser PID %s ignored SIGTERM - sending SIGKILL", browser_pid)
+            _signal_browser_tree(browser_pid, signal.SIGKILL)
+            wait_futures([quit_future], timeout=QUIT_TERM_WAIT_SEC)
     
-    if quit_thread.is_alive():
-        print(f"[QUIT] driver.quit() timed out after {timeout}s - killing zombie processes")
+    if not quit_future.done():
+        log.warning("[QUIT] driver.quit() timed out after %ss - killing zombie processes", timeout)
         # Kill any zombie chrome processes and their parents
-        kill_zombie_chrome_processes()
+        kill_zombie_chrome_processes(driver_pid)
         return False
     
-    # Even on successful quit, check for zombies (chromedriver may not reap properly)
-    kill_zombie_chrome_processes()
+    # Even on successful quit, check for zombies (chromedriver may not reap properly).
+    # With a known browser PID only that process is inspected; a full scan runs if it is left defunct.
+    if browser_pid is None or _is_zombie(browser_pid):
+        kill_zombie_chrome_processes(driver_pid)
     return True
 
 
+def _fast_rmtree(path) -> None:
+    """Remove a directory tree, preferring native `rm -rf` over shutil.rmtree.
+    
+    Chrome caches hold tens of thousands of small files; rm unlinks them in C
+    without per-entry interpreter overhead. Falls back to shutil.rmtree off
+    POSIX or when rm fails.
+    
+    Args:
+        path: Directory to remove (missing paths are ignored)
+    """
+    if os.name == "posix":
+        try:
+            if subprocess.run(["rm", "-rf", "--", str(path)], check=False, timeout=60).returncode == 0:
+                return
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log.warning("[CLEAN] rm -rf %s failed: %s, falling back to shutil.rmtree", path, e)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _free_bytes(path) -> int:
+    """Free space available on the filesystem holding path (one statvfs call)."""
+    try:
+        st = os.statvfs(path)
+        return st.f_bavail * st.f_frsize
+    except (OSError, AttributeError):
+        return 0
+
+
+# Cache directories directly under <profile>/Default
+CACHE_NAMES_DEFAULT = frozenset({"Cache", "Code Cache", "GPUCache", "DawnCache"})
+
+
 def clean_profile_cache(profile_path: str) -> None:
     """Clean Chrome cache directories to prevent disk bloat.
     
@@ -241,27 +534,35 @@ def clean_profile_cache(profile_path: str) -> None:
     if not profile.exists():
         return
     
-    cache_dirs = [
-        profile / "Default" / "Cache",
-        profile / "Default" / "Code Cache",
-        profile / "Default" / "GPUCache",
-        profile / "Default" / "Service Worker" / "CacheStorage",
-        profile / "ShaderCache",
-        profile / "Default" / "DawnCache",
-    ]
-    
-    total_freed = 0
-    for cache_dir in cache_dirs:
-        if cache_dir.exists():
-            try:
-                size_before = sum(f.stat().st_size for f in cache_dir.rglob('*') if f.is_file())
-                shutil.rmtree(cache_dir, ignore_errors=True)
-                total_freed += size_before
-            except Exception as e:
-                print(f"[CACHE_CLEAN] Failed to clean {cache_dir.name}: {e}")
+    # One directory listing instead of a stat per candidate; only existing dirs are queued
+    default = profile / "Default"
+    cache_dirs = []
+    try:
+        with os.scandir(default) as it:
+            cache_dirs = [Path(e.path) for e in it if e.name in CACHE_NAMES_DEFAULT]
+    except OSError:
+        pass
+    for extra in (default / "Service Worker" / "CacheStorage", profile / "ShaderCache"):
+        if os.path.isdir(extra):
+            cache_dirs.append(extra)
+    if not cache_dirs:
+        return
     
+    def _remove_cache_dir(cache_dir: Path) -> None:
+        try:
+            _fast_rmtree(cache_dir)
+        except Exception as e:
+            log.warning("[CACHE_CLEAN] Failed to clean %s: %s", cache_dir.name, e)
+    
+    # Freed size is the free-space delta: no per-file stat walk before deleting
+    free_before = _free_bytes(profile)
+    # Independent subtrees: overlap their unlink syscalls
+    with ThreadPoolExecutor(max_workers=len(cache_dirs)) as pool:
+        list(pool.map(_remove_cache_dir, cache_dirs))
+    
+    total_freed = _free_bytes(profile) - free_before
     if total_freed > 0:
-        print(f"[CACHE_CLEAN] Freed {total_freed / (1024*1024):.1f} MB from {profile.name}")
+        log.info("[CACHE_CLEAN] Freed %.1f MB from %s", total_freed / (1024*1024), profile.name)
 
 
 def clean_old_session_dirs(profile_path: str, keep_recent: int = 2) -> None:
@@ -291,22 +592,97 @@ def clean_old_session_dirs(profile_path: str, keep_recent: int = 2) -> None:
         # Remove old sessions, keep only recent ones
         dirs_to_remove = session_dirs[:-keep_recent] if keep_recent > 0 else session_dirs
         
-        total_freed = 0
-        for session_dir in dirs_to_remove:
+        def _remove_session_dir(session_dir: Path) -> None:
             try:
-                # Calculate size before removal
-                size = sum(f.stat().st_size for f in session_dir.rglob('*') if f.is_file())
-                shutil.rmtree(session_dir, ignore_errors=True)
-                total_freed += size
-                print(f"[SESSION_CLEAN] Removed old session: {session_dir.name}")
+                _fast_rmtree(session_dir)
+                log.info("[SESSION_CLEAN] Removed old session: %s", session_dir.name)
             except Exception as e:
-                print(f"[SESSION_CLEAN] Failed to remove {session_dir.name}: {e}")
+                log.warning("[SESSION_CLEAN] Failed to remove %s: %s", session_dir.name, e)
         
+        free_before = _free_bytes(profile)
+        with ThreadPoolExecutor(max_workers=min(6, len(dirs_to_remove))) as pool:
+            list(pool.map(_remove_session_dir, dirs_to_remove))
+        
+        total_freed = _free_bytes(profile) - free_before
         if total_freed > 0:
-            print(f"[SESSION_CLEAN] Freed {total_freed / (1024*1024):.1f} MB from {len(dirs_to_remove)} old sessions")
+            log.info("[SESSION_CLEAN] Freed %.1f MB from %s old sessions", total_freed / (1024*1024), len(dirs_to_remove))
     
     except Exception as e:
-        print(f"[SESSION_CLEAN] Failed to clean sessions: {e}")
+        log.warning("[SESSION_CLEAN] Failed to clean sessions: %s", e)
+
+
+def _discard_profile(profile: Path) -> None:
+    """Replace a corrupted profile with an empty directory.
+    
+    The old tree is renamed aside (one metadata op) and deleted in a background
+    thread, so crash recovery does not wait for hundreds of MB of unlinks.
+    Trash left by an earlier process that died mid-delete is swept as well.
+    
+    Args:
+        profile: Chrome profile directory
+    """
+    if profile.exists():
+        trash = profile.with_name(f"{profile.name}.trash.{os.getpid()}.{int(time.time() * 1000)}")
+        try:
+            os.rename(profile, trash)
+        except OSError as e:
+            log.warning("[IDENTITY] Failed to move profile aside (%s), deleting in place", e)
+            _fast_rmtree(profile)
+    profile.mkdir(parents=True, exist_ok=True)
+    
+    def _empty_trash():
+        for old in profile.parent.glob(f"{profile.name}.trash.*"):
+            _fast_rmtree(old)
+    
+    threading.Thread(target=_empty_trash, name=f"trash-{profile.name}", daemon=True).start()
+
+
+# Profile -> monotonic time of its last crash recovery
+_last_clean_ts: dict[Path, float] = {}
+
+
+def _recover_crashed_profile(profile: Path, cooldown: float = 10.0) -> None:
+    """Reset a profile after a Chrome crash, at most once per cooldown.
+    
+    A crash right after a reset has the same root cause, so discarding the
+    (already empty) profile again is skipped.
+    
+    Args:
+        profile: Chrome profile directory
+        cooldown: Seconds during which repeat resets of the same profile are skipped
+    """
+    now = time.monotonic()
+    if now - _last_clean_ts.get(profile, float("-inf")) < cooldown:
+        log.info("[IDENTITY] Chrome crashed - profile %s was reset %.1fs ago, skipping", profile, now - _last_clean_ts[profile])
+        return
+    log.info("[IDENTITY] Chrome crashed - cleaning corrupted profile: %s", profile)
+    try:
+        # Fresh empty profile directory; old tree is deleted in the background
+        _discard_profile(profile)
+        _last_clean_ts[profile] = now
+        log.info("[IDENTITY] Profile cleaned and recreated: %s", profile)
+    except Exception as clean_err:
+        log.warning("[IDENTITY] Failed to clean profile: %s", clean_err)
+
+
+def clean_profile(profile_path: str) -> None:
+    """Clean Chrome caches and old session dirs of a profile that is not in use."""
+    clean_profile_cache(profile_path)
+    clean_old_session_dirs(profile_path, keep_recent=2)
+
+
+class _DriverView:
+    """Minimal session-manager stand-in exposing a driver that is not (yet) current.
+    
+    Lets ensure_aimode_ready prime the warm standby driver.
+    """
+    
+    def __init__(self, driver: webdriver.Chrome, wait: WebDriverWait):
+        self.driver = driver
+        self.wait = wait
+    
+    def get_driver(self) -> tuple[webdriver.Chrome, WebDriverWait]:
+        return self.driver, self.wait
 
 
 class SessionManager:
@@ -317,11 +693,29 @@ class SessionManager:
         self.wait: Optional[WebDriverWait] = None
         self.profile_idx: int = -1
         self.proxy_idx: int = -1  # Local proxy index (fallback if Redis unavailable)
-        self.lock = threading.Lock()
+        # Serializes driver lifecycle (quit/create/ready) only. Proxy queries
+        # (has_available_proxy, _get_next_available_proxy_idx, _is_proxy_blocked,
+        # _get_shared_proxy_idx) never take it and may run during a rotation.
+        self.lock = _RLock()
         self.search_count: int = 0  # Track searches to prevent memory leaks
         self.max_searches_per_session: int = 50  # Rotate after 50 searches
         self.redis_proxy_key = "browser_worker:shared_proxy_idx"  # Redis key for shared proxy index
         self.driver_proxy_idx: int = -1  # Proxy index that was used to create current driver
+        # Last by_profile choice: ((profile_idx, blocked flags), proxy, monotonic check time);
+        # cleared on new blocks, trusted for PROXY_CHECK_CACHE_SEC
+        self._proxy_cache: Optional[tuple] = None
+        # Locally known proxy blocks: proxy index -> monotonic time the block expires
+        self._block_cache: dict[int, float] = {}
+        # Proxy index -> monotonic time of its last passed connectivity check
+        self._proxy_ok: dict[int, float] = {}
+        # Last successful is_driver_valid() (monotonic); probes within _valid_ttl are skipped
+        self._last_valid_ts: float = 0.0
+        self._valid_ttl: float = 1.0
+        # Background cleanups of profiles that went idle, joined before the profile is reused
+        self._cleanup_threads: dict[Path, threading.Thread] = {}
+        # Warm standby on the next profile (PREWARM_STANDBY): (profile_idx, proxy_url, driver, wait)
+        self._standby: Optional[tuple] = None
+        self._standby_thread: Optional[threading.Thread] = None
         # NOTE: request_count and proxy_rotation_enabled removed - managed by Proxy Coordinator
     
     def get_driver(self) -> tuple[webdriver.Chrome, WebDriverWait]:
@@ -336,16 +730,152 @@ class SessionManager:
         if not self.driver or not self.wait:
             raise RuntimeError("Driver not initialized")
         
-        # Check if driver session is still valid
-        if not is_driver_valid(self.driver):
-            print("[SESSION] Driver session invalid - forcing rotation")
-            # Clear invalid driver
-            self.driver = None
-            self.wait = None
-            raise RuntimeError("Driver session invalid (closed or crashed)")
+        # Check if driver session is still valid (a check within the last _valid_ttl is reused)
+        if time.monotonic() - self._last_valid_ts >= self._valid_ttl:
+            if not is_driver_valid(self.driver):
+                log.info("[SESSION] Driver session invalid - forcing rotation")
+                # Clear invalid driver
+                self.driver = None
+                self.wait = None
+                raise RuntimeError("Driver session invalid (closed or crashed)")
+            self._last_valid_ts = time.monotonic()
         
         return self.driver, self.wait
     
+    def invalidate_driver_check(self) -> None:
+        """Force the next get_driver() to re-validate the driver (after an error)."""
+        self._last_valid_ts = 0.0
+    
+    def _release_profile(self) -> None:
+        """Start cleaning the current profile in the background once its driver is gone.
+        
+        Must be called with self.lock held, after the driver was quit.
+        """
+        if self.profile_idx < 0:
+            return
+        profile = PROFILES[self.profile_idx]
+        thread = threading.Thread(
+            target=clean_profile, args=(str(profile),), name=f"clean-{profile.name}", daemon=True
+        )
+        self._cleanup_threads[profile] = thread
+        thread.start()
+    
+    def _claim_profile(self, profile: Path) -> None:
+        """Make sure a profile is clean before launching Chrome on it.
+        
+        Waits for its background cleanup (normally finished long before the
+        rotation comes back around), or cleans inline on first use.
+        Must be called with self.lock held.
+        """
+        thread = self._cleanup_threads.pop(profile, None)
+        if thread is None:
+            clean_profile(str(profile))
+        else:
+            thread.join()
+    
+    def record_search(self) -> None:
+        """Count a successful search; near the rotation limit, pre-clean the next profile.
+        
+        From 80% of max_searches_per_session the next profile's cleanup starts in
+        the background, so the upcoming rotation finds it ready in _claim_profile.
+        """
+        self.search_count += 1
+        if self.search_count < int(0.8 * self.max_searches_per_session) or self.profile_idx < 0:
+            return
+        # Never wait for a rotation in progress: try again after the next search
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            next_profile = PROFILES[(self.profile_idx + 1) % _N_PROFILES]
+            # Already pending/done, the profile in use (single profile), or a standby runs on it
+            if (next_profile in self._cleanup_threads or next_profile == PROFILES[self.profile_idx]
+                    or self._standby_thread is not None):
+                return
+            log.info("[SESSION] Pre-cleaning next profile %s before rotation", next_profile.name)
+            thread = threading.Thread(
+                target=clean_profile, args=(str(next_profile),), name=f"clean-{next_profile.name}", daemon=True
+            )
+            self._cleanup_threads[next_profile] = thread
+            thread.start()
+        finally:
+            self.lock.release()
+    
+    def _start_prewarm(self, proxy_url: Optional[str]) -> None:
+        """Launch and prime a standby driver on the next profile in the background.
+        
+        proxy_url is the current session's proxy, which the next rotation reuses
+        except in by_profile mode (see _prewarm). Must be called with self.lock
+        held, right after a successful rotation.
+        """
+        if not PREWARM_STANDBY or _N_PROFILES < 2 or self._standby_thread is not None:
+            return
+        idx = (self.profile_idx + 1) % _N_PROFILES
+        # The standby thread owns this profile now; it finishes any pending cleanup first
+        cleanup = self._cleanup_threads.pop(PROFILES[idx], None)
+        self._standby_thread = threading.Thread(
+            target=self._prewarm, args=(idx, proxy_url, cleanup), name=f"standby-{PROFILES[idx].name}", daemon=True
+        )
+        self._standby_thread.start()
+    
+    def _prewarm(self, idx: int, proxy_url: Optional[str], cleanup: Optional[threading.Thread]) -> None:
+        """Standby thread body: clean the profile, launch Chrome and wait for AI Mode."""
+        profile = PROFILES[idx]
+        ready_timeout = (
+            AI_READY_TIMEOUT_PER_SEARCH_SEC if SESSION_PER_SEARCH else AI_READY_TIMEOUT_SEC
+        )
+        try:
+            proxy_idx = None
+            if PROXY_LIST and PROXY_BINDING_MODE == "by_profile":
+                # The next rotation uses the next profile's bound proxy, not the current one
+                proxy_idx = self._get_next_available_proxy_idx(idx % _N_PROXIES, allow_none=True)
+                if proxy_idx is None:
+                    return
+                proxy_url = PROXY_LIST[proxy_idx]
+            if cleanup is None:
+                clean_profile(str(profile))
+            else:
+                cleanup.join()
+            driver = create_driver(profile, proxy_url=proxy_url)
+            wait = WebDriverWait(driver, PAGE_TIMEOUT)
+            if ensure_aimode_ready(_DriverView(driver, wait), timeout=ready_timeout):
+                if proxy_idx is not None:
+                    # AI Mode loaded through it: counts as a passed connectivity check
+                    self._proxy_ok[proxy_idx] = time.monotonic()
+                self._standby = (idx, proxy_url, driver, wait)
+                log.info("[STANDBY] profile=%s ready ✓", profile.name)
+            else:
+                log.info("[STANDBY] profile=%s AI Mode not ready; discarding", profile.name)
+                safe_quit_driver(driver)
+        except Exception as e:
+            log.warning("[STANDBY] profile=%s launch failed: %s", profile.name, e)
+    
+    def _take_standby(self, idx: int, proxy_url: Optional[str]) -> Optional[tuple[webdriver.Chrome, WebDriverWait]]:
+        """Hand over the standby driver if it matches the profile and proxy about to be used.
+        
+        A standby that does not match (or died) is quit. Waits for a prewarm still
+        in progress, since its Chrome holds the profile. Must be called with self.lock held.
+        
+        Returns:
+            (driver, wait) ready for use, or None
+        """
+        if self._standby_thread is None:
+            return None
+        self._standby_thread.join()
+        self._standby_thread = None
+        standby, self._standby = self._standby, None
+        if standby is None:
+            return None
+        s_idx, s_proxy, driver, wait = standby
+        if s_idx == idx and s_proxy == proxy_url and is_driver_valid(driver):
+            return driver, wait
+        log.info("[STANDBY] Discarding standby for profile=%s (no longer matches)", PROFILES[s_idx].name)
+        safe_quit_driver(driver)
+        return None
+    
+    def _discard_standby(self) -> None:
+        """Quit the standby driver, if any. Must be called with self.lock held."""
+        self._take_standby(-1, None)
+    
     def rotate_identity(self, reason: str = "", _recursion_depth: int = 0) -> None:
         """Rotate to next profile and create fresh browser session.
         
@@ -354,11 +884,11 @@ class SessionManager:
             _recursion_depth: Internal counter to prevent infinite recursion
         """
         # Prevent infinite recursion - max depth = number of profiles
-        if _recursion_depth >= len(PROFILES):
-            print(f"\n{'='*80}")
-            print(f"[IDENTITY] CRITICAL ERROR: All {len(PROFILES)} profiles failed to initialize")
-            print(f"[IDENTITY] This may cause container restart if not handled")
-            print(f"{'='*80}\n")
+        if _recursion_depth >= _N_PROFILES:
+            log.info("\n%s", "=" * 80)
+            log.error("[IDENTITY] CRITICAL ERROR: All %s profiles failed to initialize", _N_PROFILES)
+            log.error("[IDENTITY] This may cause container restart if not handled")
+            log.info("%s\n", "=" * 80)
             raise RuntimeError("All browser profiles failed to initialize")
         
         with self.lock:
@@ -367,28 +897,36 @@ class SessionManager:
                 safe_quit_driver(self.driver, timeout=5)
             self.driver = None
             self.wait = None
+            self._last_valid_ts = 0.0
             
             # Reset search counter on rotation
             self.search_count = 0
             
-            # Rotate to next profile
-            self.profile_idx = (self.profile_idx + 1) % len(PROFILES)
+            # Rotate to next profile; the one we leave is cleaned in the background
+            self._release_profile()
+            self.profile_idx = (self.profile_idx + 1) % _N_PROFILES
             profile = PROFILES[self.profile_idx]
             
-            # Clean cache and old sessions from current profile after rotation to prevent disk bloat
-            # This ensures we clean the profile we're about to use
-            clean_profile_cache(str(profile))
-            clean_old_session_dirs(str(profile), keep_recent=2)
-            print(f"\n[IDENTITY] rotating -> profile={profile} reason={reason} (depth={_recursion_depth})")
+            # Select proxy for this session
+            proxy_url = self._select_proxy()
+            
+            # A standby already primed on this profile and proxy turns the rotation into a swap
+            standby = self._take_standby(self.profile_idx, proxy_url)
+            if standby is not None:
+                self.driver, self.wait = standby
+                log.info("\n[IDENTITY] rotating -> profile=%s reason=%s (warm standby) ready ✓", profile, reason)
+                self._start_prewarm(proxy_url)
+                return
+            
+            # Cache and old sessions of the profile we're about to use must be gone before launch
+            self._claim_profile(profile)
+            log.info("\n[IDENTITY] rotating -> profile=%s reason=%s (depth=%s)", profile, reason, _recursion_depth)
             
             # Determine timeout based on session mode (centralized via config)
             ready_timeout = (
                 AI_READY_TIMEOUT_PER_SEARCH_SEC if SESSION_PER_SEARCH else AI_READY_TIMEOUT_SEC
             )
             
-            # Select proxy for this session
-            proxy_url = self._select_proxy()
-            
             # Try to create driver and ensure AI Mode ready
             for attempt in range(2):
                 try:
@@ -399,31 +937,22 @@ class SessionManager:
                     self.wait = temp_wait
                     if ensure_aimode_ready(self, timeout=ready_timeout):
                         # Success - driver already assigned
-                        print("[IDENTITY] ready ✓")
+                        log.info("[IDENTITY] ready ✓")
+                        self._start_prewarm(proxy_url)
                         return
                     else:
-                        print("[IDENTITY] AI Mode not ready; retrying…")
+                        log.info("[IDENTITY] AI Mode not ready; retrying…")
                 except Exception as e:
                     error_msg = str(e)
-                    print(f"[IDENTITY] launch failed: {e}")
+                    log.warning("[IDENTITY] launch failed: %s", e)
                     
                     # If Chrome crashed, clean the entire profile to fix corruption
                     if "Chrome instance exited" in error_msg or "session not created" in error_msg:
-                        print(f"[IDENTITY] Chrome crashed - cleaning corrupted profile: {profile}")
-                        import shutil
-                        try:
-                            if profile.exists():
-                                shutil.rmtree(profile, ignore_errors=True)
-                            # Create fresh empty profile directory
-                            profile.mkdir(parents=True, exist_ok=True)
-                            print(f"[IDENTITY] Profile cleaned and recreated: {profile}")
-                        except Exception as clean_err:
-                            print(f"[IDENTITY] Failed to clean profile: {clean_err}")
+                        _recover_crashed_profile(profile)
                             
-                import time
-                time.sleep(0.5 + attempt * 0.5)
+                _launch_backoff(attempt)
             
-            print("[IDENTITY] moving on to next profile…")
+            log.info("[IDENTITY] moving on to next profile…")
             # Tail recursion is protected by the same lock; depth is bounded by number of profiles
             self.rotate_identity("previous profile not ready", _recursion_depth + 1)
     
@@ -455,7 +984,7 @@ class SessionManager:
                 return 0
             return int(idx_str)
         except Exception as e:
-            print(f"[REDIS] Failed to get shared proxy index: {e}, using local fallback")
+            log.warning("[REDIS] Failed to get shared proxy index: %s, using local fallback", e)
             if self.proxy_idx < 0:
                 self.proxy_idx = 0
             return self.proxy_idx
@@ -468,25 +997,48 @@ class SessionManager:
         """
         if not REDIS_AVAILABLE or not redis_client:
             # Fallback to local increment
-            self.proxy_idx = (self.proxy_idx + 1) % len(PROXY_LIST) if PROXY_LIST else 0
+            self.proxy_idx = (self.proxy_idx + 1) % _N_PROXIES if PROXY_LIST else 0
             return self.proxy_idx
         
         try:
             # Atomic increment in Redis
             new_idx = redis_client.incr(self.redis_proxy_key)
-            print(f"[REDIS] Incremented shared proxy index to {new_idx}")
+            log.info("[REDIS] Incremented shared proxy index to %s", new_idx)
             return new_idx
         except Exception as e:
-            print(f"[REDIS] Failed to increment shared proxy index: {e}, using local fallback")
-            self.proxy_idx = (self.proxy_idx + 1) % len(PROXY_LIST) if PROXY_LIST else 0
+            log.warning("[REDIS] Failed to increment shared proxy index: %s, using local fallback", e)
+            self.proxy_idx = (self.proxy_idx + 1) % _N_PROXIES if PROXY_LIST else 0
             return self.proxy_idx
     
+    def _rotate_shared_proxy_idx(self) -> Optional[tuple[int, int, bool]]:
+        """Advance the shared proxy index and pick an unblocked proxy atomically in Redis.
+        
+        The index is only incremented if it still equals driver_proxy_idx, so
+        workers that detect the same block do not rotate twice.
+        
+        Returns:
+            (shared_idx, proxy_idx, rotated) where proxy_idx is -1 if all proxies
+            are blocked, or None if Redis is unavailable or the script failed
+        """
+        if rotate_proxy_script is None:
+            return None
+        try:
+            shared_idx, idx, rotated = rotate_proxy_script(
+                keys=[self.redis_proxy_key, "browser_worker:proxy_blocked"],
+                args=[self.driver_proxy_idx, _N_PROXIES],
+            )
+            return int(shared_idx), int(idx), bool(rotated)
+        except Exception as e:
+            log.warning("[REDIS] Proxy rotation script failed: %s, falling back to separate calls", e)
+            return None
+    
     def _mark_proxy_blocked(self, proxy_idx: int) -> None:
         """Mark proxy as blocked in Redis with TTL.
         
         Args:
             proxy_idx: Index of proxy to block
         """
+        self._proxy_ok.pop(proxy_idx, None)
         if not REDIS_AVAILABLE or not redis_client or not PROXY_LIST:
             return
         
@@ -494,9 +1046,37 @@ class SessionManager:
             key = f"browser_worker:proxy_blocked:{proxy_idx}"
             # Set with TTL (expires after PROXY_BLOCK_TIMEOUT_SEC)
             redis_client.setex(key, PROXY_BLOCK_TIMEOUT_SEC, "1")
-            print(f"[PROXY_BLOCK] Marked proxy {proxy_idx} as blocked for {PROXY_BLOCK_TIMEOUT_SEC}s")
+            self._block_cache[proxy_idx] = time.monotonic() + PROXY_BLOCK_TIMEOUT_SEC
+            self._proxy_cache = None
+            log.info("[PROXY_BLOCK] Marked proxy %s as blocked for %ss", proxy_idx, PROXY_BLOCK_TIMEOUT_SEC)
         except Exception as e:
-            print(f"[PROXY_BLOCK] Failed to mark proxy as blocked: {e}")
+            log.warning("[PROXY_BLOCK] Failed to mark proxy as blocked: %s", e)
+    
+    def _block_and_notify(self, proxy_idx: int, reason: str) -> None:
+        """Mark proxy as blocked and queue the coordinator notification in one Redis call.
+        
+        Falls back to _mark_proxy_blocked() plus an HTTP notify_proxy_blocked()
+        when the script is unavailable or fails.
+        
+        Args:
+            proxy_idx: Index of proxy to block
+            reason: Reason for blocking
+        """
+        if block_proxy_script is not None and PROXY_LIST:
+            try:
+                block_proxy_script(
+                    keys=[f"browser_worker:proxy_blocked:{proxy_idx}", PROXY_BLOCK_EVENTS_KEY],
+                    args=[PROXY_BLOCK_TIMEOUT_SEC, json.dumps({"proxy_idx": proxy_idx, "reason": reason})],
+                )
+                self._block_cache[proxy_idx] = time.monotonic() + PROXY_BLOCK_TIMEOUT_SEC
+                self._proxy_cache = None
+                self._proxy_ok.pop(proxy_idx, None)
+                log.info("[PROXY_BLOCK] Marked proxy %s as blocked for %ss, coordinator notified via Redis (%s)", proxy_idx, PROXY_BLOCK_TIMEOUT_SEC, reason)
+                return
+            except Exception as e:
+                log.warning("[PROXY_BLOCK] Block script failed: %s, falling back to separate calls", e)
+        self._mark_proxy_blocked(proxy_idx)
+        notify_proxy_blocked(proxy_idx, reason)
     
     def _is_proxy_blocked(self, proxy_idx: int) -> bool:
         """Check if proxy is currently blocked.
@@ -510,23 +1090,107 @@ class SessionManager:
         if not REDIS_AVAILABLE or not redis_client or not PROXY_LIST:
             return False
         
+        # Known block that has not expired yet: no Redis round trip
+        now = time.monotonic()
+        if self._block_cache.get(proxy_idx, 0.0) > now:
+            return True
+        
         try:
             key = f"browser_worker:proxy_blocked:{proxy_idx}"
-            blocked = redis_client.exists(key)
-            if blocked:
-                ttl = redis_client.ttl(key)
-                print(f"[PROXY_BLOCK] Proxy {proxy_idx} is blocked (TTL: {ttl}s)")
-            return bool(blocked)
+            ttl = redis_client.ttl(key)
+            if ttl == -2:  # Missing key: not blocked
+                self._block_cache.pop(proxy_idx, None)
+                return False
+            if ttl > 0:
+                self._block_cache[proxy_idx] = now + ttl
+            log.info("[PROXY_BLOCK] Proxy %s is blocked (TTL: %ss)", proxy_idx, ttl)
+            return True
         except Exception as e:
-            print(f"[PROXY_BLOCK] Failed to check if proxy blocked: {e}")
+            log.warning("[PROXY_BLOCK] Failed to check if proxy blocked: %s", e)
             return False
     
-    def _get_next_available_proxy_idx(self, start_idx: int, allow_none: bool = False) -> Optional[int]:
+    def _proxy_block_ttls(self) -> list[Optional[int]]:
+        """Fetch the block state of every proxy in one pipelined Redis round trip.
+        
+        Returns:
+            List indexed by proxy index: remaining block TTL in seconds (-1 = no
+            expiry) for blocked proxies, None for available ones
+        """
+        return self._fetch_block_state(with_shared_idx=False)[1]
+    
+    def _shared_idx_and_block_ttls(self) -> tuple[int, list[Optional[int]]]:
+        """Read the shared proxy index and the proxy block state in one round trip.
+        
+        Returns:
+            (shared proxy index, block TTLs as returned by _proxy_block_ttls())
+        """
+        if not REDIS_AVAILABLE or not redis_client or not PROXY_LIST:
+            return self._get_shared_proxy_idx(), self._proxy_block_ttls()
+        
+        fetched, ttls = self._fetch_block_state(with_shared_idx=True)
+        if fetched is False:
+            # Pipeline failed: fall back to the standalone GET
+            return self._get_shared_proxy_idx(), ttls
+        if fetched is None:
+            # Initialize if not exists
+            try:
+                redis_client.set(self.redis_proxy_key, "0", nx=True)
+            except Exception as e:
+                log.warning("[REDIS] Failed to initialize shared proxy index: %s", e)
+            return 0, ttls
+        return int(fetched), ttls
+    
+    def _fetch_block_state(self, with_shared_idx: bool) -> tuple:
+        """Pipelined TTL sweep of blocked proxies, optionally with a GET of the shared index.
+        
+        Returns:
+            (shared index string, None if unset, or False if not fetched/failed; block TTL list)
+        """
+        if not REDIS_AVAILABLE or not redis_client or not PROXY_LIST:
+            return False, [None] * _N_PROXIES
+        
+        # Blocks known locally and not yet expired skip Redis entirely
+        now = time.monotonic()
+        ttls: list[Optional[int]] = [None] * _N_PROXIES
+        unknown = []
+        for idx in range(_N_PROXIES):
+            until = self._block_cache.get(idx, 0.0)
+            if until > now:
+                ttls[idx] = int(until - now)
+            else:
+                unknown.append(idx)
+        if not unknown and not with_shared_idx:
+            return False, ttls
+        
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            if with_shared_idx:
+                pipe.get(self.redis_proxy_key)
+            for idx in unknown:
+                pipe.ttl(f"browser_worker:proxy_blocked:{idx}")
+            results = pipe.execute()
+            shared = results.pop(0) if with_shared_idx else False
+            for idx, ttl in zip(unknown, results):
+                # TTL of a missing key is -2: proxy not blocked
+                if ttl == -2:
+                    self._block_cache.pop(idx, None)
+                    continue
+                ttls[idx] = ttl
+                if ttl > 0:
+                    self._block_cache[idx] = now + ttl
+            return shared, ttls
+        except Exception as e:
+            log.warning("[PROXY_BLOCK] Failed to check blocked proxies: %s", e)
+            return False, [None] * _N_PROXIES
+    
+    def _get_next_available_proxy_idx(self, start_idx: int, allow_none: bool = False,
+                                      ttls: Optional[list[Optional[int]]] = None) -> Optional[int]:
         """Get next available (non-blocked) proxy index.
         
         Args:
             start_idx: Starting index to search from
             allow_none: If True, return None when all proxies blocked; if False, return start_idx anyway
+            ttls: Block state from _proxy_block_ttls() if the caller already fetched it
             
         Returns:
             Next available proxy index, None if all blocked and allow_none=True, or start_idx if all blocked and allow_none=False
@@ -534,20 +1198,23 @@ class SessionManager:
         if not PROXY_LIST:
             return 0
         
-        # Try all proxies starting from start_idx
-        for offset in range(len(PROXY_LIST)):
-            idx = (start_idx + offset) % len(PROXY_LIST)
-            if not self._is_proxy_blocked(idx):
+        # Try all proxies starting from start_idx (block state fetched in one round trip)
+        if ttls is None:
+            ttls = self._proxy_block_ttls()
+        for offset in range(_N_PROXIES):
+            idx = (start_idx + offset) % _N_PROXIES
+            if ttls[idx] is None:
                 if offset > 0:
-                    print(f"[PROXY_BLOCK] Skipped {offset} blocked proxies, using proxy {idx}")
+                    log.info("[PROXY_BLOCK] Skipped %s blocked proxies, using proxy %s", offset, idx)
                 return idx
+            log.info("[PROXY_BLOCK] Proxy %s is blocked (TTL: %ss)", idx, ttls[idx])
         
         # All proxies are blocked
         if allow_none:
-            print(f"[PROXY_BLOCK] ERROR: All {len(PROXY_LIST)} proxies are blocked!")
+            log.error("[PROXY_BLOCK] ERROR: All %s proxies are blocked!", _N_PROXIES)
             return None
         else:
-            print(f"[PROXY_BLOCK] WARNING: All {len(PROXY_LIST)} proxies are blocked! Using proxy {start_idx} anyway")
+            log.warning("[PROXY_BLOCK] WARNING: All %s proxies are blocked! Using proxy %s anyway", _N_PROXIES, start_idx)
             return start_idx
     
     def has_available_proxy(self) -> bool:
@@ -560,11 +1227,7 @@ class SessionManager:
             return True  # No proxy list means no proxy requirement
         
         # Check all proxies
-        for idx in range(len(PROXY_LIST)):
-            if not self._is_proxy_blocked(idx):
-                return True
-        
-        return False
+        return any(ttl is None for ttl in self._proxy_block_ttls())
     
     def _select_proxy(self) -> Optional[str]:
         """Select proxy based on PROXY_BINDING_MODE and shared/local indices.
@@ -576,30 +1239,49 @@ class SessionManager:
             return None
         
         if PROXY_LIST:
+            cache_key = None
+            sweep = None
+            if PROXY_BINDING_MODE == "by_profile":
+                # by_profile choice depends only on profile_idx and the blocked set:
+                # if neither changed, the proxy chosen (and tested) last time still stands
+                # for PROXY_CHECK_CACHE_SEC; after that it is re-checked like any other
+                sweep = self._proxy_block_ttls()
+                cache_key = (self.profile_idx, tuple(ttl is not None for ttl in sweep))
+                if (self._proxy_cache is not None and self._proxy_cache[0] == cache_key
+                        and time.monotonic() - self._proxy_cache[2] < PROXY_CHECK_CACHE_SEC):
+                    self.driver_proxy_idx = -1
+                    proxy = self._proxy_cache[1]
+                    log.info("[PROXY] Reusing proxy (by_profile, block state unchanged): %s", proxy.split('@')[-1] if '@' in proxy else proxy)
+                    return proxy
+            
             # Try each proxy until we find a working one
             tried_proxies = set()
+            # Connectivity checks started ahead of time: proxy index -> Future[bool]
+            pending = {}
             
-            while len(tried_proxies) < len(PROXY_LIST):
+            while len(tried_proxies) < _N_PROXIES:
                 if PROXY_BINDING_MODE == "by_profile":
                     # Bind proxy to profile
                     if self.profile_idx >= 0:
-                        base_idx = self.profile_idx % len(PROXY_LIST)
+                        base_idx = self.profile_idx % _N_PROXIES
                     else:
                         base_idx = 0
-                    # Find next available (non-blocked) proxy
-                    idx = self._get_next_available_proxy_idx(base_idx)
+                    # Find next available (non-blocked) proxy (first pass reuses the sweep above)
+                    idx = self._get_next_available_proxy_idx(base_idx, ttls=sweep)
+                    sweep = None
                     # For by_profile mode, driver_proxy_idx is not used (no shared rotation)
                     self.driver_proxy_idx = -1
                 else:  # independent - use shared index from Redis
-                    shared_idx = self._get_shared_proxy_idx()
-                    base_idx = shared_idx % len(PROXY_LIST)
+                    # Shared index and block state share one pipelined round trip
+                    shared_idx, ttls = self._shared_idx_and_block_ttls()
+                    base_idx = shared_idx % _N_PROXIES
                     # Find next available (non-blocked) proxy
-                    idx = self._get_next_available_proxy_idx(base_idx)
+                    idx = self._get_next_available_proxy_idx(base_idx, ttls=ttls)
                     # Remember which proxy index was used for current driver
                     self.driver_proxy_idx = shared_idx
                 
                 if idx is None:
-                    print(f"[PROXY] No available proxies!")
+                    log.warning("[PROXY] No available proxies!")
                     return None
                 
                 # Skip if we already tried this proxy
@@ -611,22 +1293,44 @@ class SessionManager:
                 proxy_display = proxy.split('@')[-1] if '@' in proxy else proxy
                 
                 if PROXY_BINDING_MODE == "independent":
-                    print(f"[PROXY] Testing proxy {idx}/{len(PROXY_LIST)} (shared_idx={self.driver_proxy_idx}): {proxy_display}")
+                    log.info("[PROXY] Testing proxy %s/%s (shared_idx=%s): %s", idx, _N_PROXIES, self.driver_proxy_idx, proxy_display)
                 else:
-                    print(f"[PROXY] Testing proxy {idx}/{len(PROXY_LIST)} (by_profile): {proxy_display}")
+                    log.info("[PROXY] Testing proxy %s/%s (by_profile): %s", idx, _N_PROXIES, proxy_display)
+                
+                # After a failure, probe the next candidates in ring order concurrently so a run
+                # of dead proxies costs about one timeout; they are still accepted in order
+                if len(tried_proxies) > 1:
+                    now = time.monotonic()
+                    for offset in range(1, _N_PROXIES):
+                        if len(pending) >= PROXY_CHECK_FANOUT:
+                            break
+                        cand = (idx + offset) % _N_PROXIES
+                        if cand in tried_proxies or cand in pending or self._block_cache.get(cand, 0.0) > now:
+                            continue
+                        pending[cand] = _PROXY_CHECK_POOL.submit(check_proxy_connectivity, PROXY_LIST[cand])
                 
-                # Check proxy connectivity before using
-                if check_proxy_connectivity(proxy):
-                    print(f"[PROXY] ✓ Proxy {proxy_display} is reachable")
+                # Check proxy connectivity before using (skipped if it passed moments ago)
+                check = pending.pop(idx, None)
+                if check is None and time.monotonic() - self._proxy_ok.get(idx, float("-inf")) < PROXY_CHECK_CACHE_SEC:
+                    reachable = True
+                else:
+                    reachable = check.result() if check is not None else check_proxy_connectivity(proxy)
+                    if reachable:
+                        self._proxy_ok[idx] = time.monotonic()
+                if reachable:
+                    log.info("[PROXY] ✓ Proxy %s is reachable", proxy_display)
+                    for leftover in pending.values():
+                        leftover.cancel()
+                    if cache_key is not None:
+                        self._proxy_cache = (cache_key, proxy, time.monotonic())
                     return proxy
                 else:
-                    print(f"[PROXY] ✗ Proxy {proxy_display} is NOT reachable - blocking and notifying coordinator")
+                    log.warning("[PROXY] ✗ Proxy %s is NOT reachable - blocking and notifying coordinator", proxy_display)
                     # Block this proxy and notify coordinator
-                    self._mark_proxy_blocked(idx)
-                    notify_proxy_blocked(idx, "connectivity_check_failed")
+                    self._block_and_notify(idx, "connectivity_check_failed")
             
             # All proxies failed
-            print(f"[PROXY] ERROR: All {len(PROXY_LIST)} proxies failed connectivity check!")
+            log.error("[PROXY] ERROR: All %s proxies failed connectivity check!", _N_PROXIES)
             return None
         else:
             return PROXY_URL
@@ -634,18 +1338,21 @@ class SessionManager:
     def rotate_profile_only(self, reason: str = "") -> None:
         """Rotate to next profile without changing proxy."""
         with self.lock:
+            # The standby holds the next profile's directory
+            self._discard_standby()
             if self.driver:
                 safe_quit_driver(self.driver, timeout=5)
             self.driver = None
             self.wait = None
+            self._last_valid_ts = 0.0
             self.search_count = 0
             
             # Rotate profile
-            self.profile_idx = (self.profile_idx + 1) % len(PROFILES)
+            self._release_profile()
+            self.profile_idx = (self.profile_idx + 1) % _N_PROFILES
             profile = PROFILES[self.profile_idx]
-            clean_profile_cache(str(profile))
-            clean_old_session_dirs(str(profile), keep_recent=2)
-            print(f"\n[IDENTITY] rotating PROFILE only -> profile={profile.name} reason={reason}")
+            self._claim_profile(profile)
+            log.info("\n[IDENTITY] rotating PROFILE only -> profile=%s reason=%s", profile.name, reason)
             
             # Keep same proxy - _select_proxy() will update driver_proxy_idx if shared index changed
             # This is correct: if another worker rotated proxy, we should use the new proxy
@@ -662,28 +1369,20 @@ class SessionManager:
                     self.driver = temp_driver
                     self.wait = temp_wait
                     if ensure_aimode_ready(self, timeout=ready_timeout):
-                        print("[IDENTITY] ready ✓")
+                        log.info("[IDENTITY] ready ✓")
+                        self._start_prewarm(proxy_url)
                         return
                     else:
-                        print("[IDENTITY] AI Mode not ready; retrying…")
+                        log.info("[IDENTITY] AI Mode not ready; retrying…")
                 except Exception as e:
                     error_msg = str(e)
-                    print(f"[IDENTITY] launch failed: {e}")
+                    log.warning("[IDENTITY] launch failed: %s", e)
                     
                     # If Chrome crashed, clean the entire profile to fix corruption
                     if "Chrome instance exited" in error_msg or "session not created" in error_msg:
-                        print(f"[IDENTITY] Chrome crashed - cleaning corrupted profile: {profile}")
-                        import shutil
-                        try:
-                            if profile.exists():
-                                shutil.rmtree(profile, ignore_errors=True)
-                            profile.mkdir(parents=True, exist_ok=True)
-                            print(f"[IDENTITY] Profile cleaned and recreated: {profile}")
-                        except Exception as clean_err:
-                            print(f"[IDENTITY] Failed to clean profile: {clean_err}")
+                        _recover_crashed_profile(profile)
                             
-                import time
-                time.sleep(0.5 + attempt * 0.5)
+                _launch_backoff(attempt)
             
             raise RuntimeError("Failed to initialize after profile rotation")
     
@@ -698,10 +1397,13 @@ class SessionManager:
             mark_as_blocked: Whether to mark old proxy as blocked in Redis (default: False)
         """
         with self.lock:
+            # The standby was launched through the proxy being rotated away from
+            self._discard_standby()
             if self.driver:
                 safe_quit_driver(self.driver, timeout=5)
             self.driver = None
             self.wait = None
+            self._last_valid_ts = 0.0
             self.search_count = 0
             
             # Keep same profile
@@ -713,29 +1415,35 @@ class SessionManager:
             if PROXY_LIST:
                 # Mark old proxy as blocked only if explicitly requested
                 if mark_as_blocked and self.driver_proxy_idx >= 0:
-                    old_proxy_idx = self.driver_proxy_idx % len(PROXY_LIST)
+                    old_proxy_idx = self.driver_proxy_idx % _N_PROXIES
                     self._mark_proxy_blocked(old_proxy_idx)
                 
-                # Check if shared index already changed (another worker rotated)
-                current_shared_idx = self._get_shared_proxy_idx()
-                
-                if current_shared_idx != self.driver_proxy_idx:
-                    # Another worker already rotated proxy
-                    print(f"\n[IDENTITY] Proxy already rotated by another worker: {self.driver_proxy_idx} -> {current_shared_idx}")
-                    print(f"[IDENTITY] Using new proxy without incrementing (reason={reason})")
-                    new_shared_idx = current_shared_idx
+                rotation = self._rotate_shared_proxy_idx()
+                if rotation is not None:
+                    new_shared_idx, idx, rotated = rotation
+                    if idx < 0:
+                        idx = new_shared_idx % _N_PROXIES
+                        log.warning("[PROXY_BLOCK] WARNING: All %s proxies are blocked! Using proxy %s anyway", _N_PROXIES, idx)
                 else:
+                    # Check if shared index already changed (another worker rotated)
+                    current_shared_idx, ttls = self._shared_idx_and_block_ttls()
+                    rotated = current_shared_idx == self.driver_proxy_idx
                     # We are first to detect block - increment shared index
-                    new_shared_idx = self._increment_shared_proxy_idx()
-                    print(f"\n[IDENTITY] rotating PROXY only -> shared_idx={new_shared_idx} proxy={new_shared_idx % len(PROXY_LIST)}/{len(PROXY_LIST)} reason={reason}")
+                    new_shared_idx = self._increment_shared_proxy_idx() if rotated else current_shared_idx
+                    # Get next available (non-blocked) proxy
+                    idx = self._get_next_available_proxy_idx(new_shared_idx % _N_PROXIES, ttls=ttls)
+                
+                if rotated:
+                    log.info("\n[IDENTITY] rotating PROXY only -> shared_idx=%s proxy=%s/%s reason=%s", new_shared_idx, new_shared_idx % _N_PROXIES, _N_PROXIES, reason)
+                else:
+                    # Another worker already rotated proxy
+                    log.info("\n[IDENTITY] Proxy already rotated by another worker: %s -> %s", self.driver_proxy_idx, new_shared_idx)
+                    log.info("[IDENTITY] Using new proxy without incrementing (reason=%s)", reason)
                 
-                # Get next available (non-blocked) proxy
-                base_idx = new_shared_idx % len(PROXY_LIST)
-                idx = self._get_next_available_proxy_idx(base_idx)
                 proxy_url = PROXY_LIST[idx]
-                print(f"[PROXY] Using proxy {idx}/{len(PROXY_LIST)}: {proxy_url.split('@')[-1] if '@' in proxy_url else proxy_url}")
+                log.info("[PROXY] Using proxy %s/%s: %s", idx, _N_PROXIES, proxy_url.split('@')[-1] if '@' in proxy_url else proxy_url)
             elif PROXY_URL:
-                print(f"\n[IDENTITY] rotating PROXY only (single proxy) -> reason={reason}")
+                log.info("\n[IDENTITY] rotating PROXY only (single proxy) -> reason=%s", reason)
                 proxy_url = PROXY_URL
                 new_shared_idx = None  # Not applicable for single proxy
             else:
@@ -755,37 +1463,40 @@ class SessionManager:
                         # Success - remember which shared_idx was used for this driver
                         if PROXY_LIST and new_shared_idx is not None:
                             self.driver_proxy_idx = new_shared_idx
-                        print("[IDENTITY] ready ✓")
+                        log.info("[IDENTITY] ready ✓")
+                        self._start_prewarm(proxy_url)
                         return
                     else:
-                        print("[IDENTITY] AI Mode not ready; retrying…")
+                        log.info("[IDENTITY] AI Mode not ready; retrying…")
                 except Exception as e:
                     error_msg = str(e)
-                    print(f"[IDENTITY] launch failed: {e}")
+                    log.warning("[IDENTITY] launch failed: %s", e)
                     
                     # If Chrome crashed, clean the entire profile to fix corruption
                     if "Chrome instance exited" in error_msg or "session not created" in error_msg:
-                        print(f"[IDENTITY] Chrome crashed - cleaning corrupted profile: {profile}")
-                        import shutil
-                        try:
-                            if profile.exists():
-                                shutil.rmtree(profile, ignore_errors=True)
-                            profile.mkdir(parents=True, exist_ok=True)
-                            print(f"[IDENTITY] Profile cleaned and recreated: {profile}")
-                        except Exception as clean_err:
-                            print(f"[IDENTITY] Failed to clean profile: {clean_err}")
+                        _recover_crashed_profile(profile)
                             
-                import time
-                time.sleep(0.5 + attempt * 0.5)
+                _launch_backoff(attempt)
             
             raise RuntimeError("Failed to initialize after proxy rotation")
     
     def maybe_rotate_for_search(self) -> None:
-        """Rotate identity if SESSION_PER_SEARCH is enabled."""
+        """Rotate identity if SESSION_PER_SEARCH is enabled or the session is used up.
+        
+        A session is used up after max_searches_per_session searches; every
+        rotation resets search_count, so the budget is per browser session.
+        """
         if SESSION_PER_SEARCH:
             self.rotate_identity("per search")
-        else:
-            self.ensure_ready()
+            return
+        if self.search_count >= self.max_searches_per_session:
+            log.info("[SESSION] Proactive rotation after %s searches to prevent memory leaks", self.search_count)
+            try:
+                self.rotate_identity("proactive rotation - max searches reached")
+                return
+            except Exception as e:
+                log.warning("[SESSION] Proactive rotation failed: %s", e)
+        self.ensure_ready()
     
     # NOTE: Request counting is now managed by Proxy Coordinator
     # The following methods are no longer used and kept only for reference:
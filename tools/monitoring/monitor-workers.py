@@ -4,11 +4,16 @@ Worker health monitor service - runs in dedicated container.
 Monitors all browser workers and restarts unhealthy containers.
 """
 import os
+import re
 import time
+import sys
+import signal
 import logging
-import schedule
+import threading
 import docker
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, jsonify
 
@@ -17,6 +22,7 @@ CHECK_INTERVAL = int(os.environ.get('CHECK_INTERVAL', '15'))  # Check every 15s
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 DOCKER_SOCKET = os.environ.get('DOCKER_SOCKET', '/var/run/docker.sock')
 MAX_RESTART_ATTEMPTS = int(os.environ.get('MAX_RESTART_ATTEMPTS', '3'))
+MAX_PARALLEL_CHECKS = 16  # Upper bound on concurrent checks/restarts (Docker socket load)
 
 # Setup logging
 logging.basicConfig(
@@ -32,36 +38,94 @@ app = Flask(__name__)
 # Docker client
 docker_client = docker.from_env()
 
+# Shared HTTP session: keep-alive connections to each worker survive between cycles
+http_session = requests.Session()
+http_session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+
+# One monitoring cycle at a time: /check and the scheduler never hit the Docker socket together
+cycle_lock = threading.Lock()
+# Set on shutdown; also what the scheduler waits on between cycles
+stop_event = threading.Event()
+# Guards `stats` for the Flask /stats reader
+stats_lock = threading.Lock()
+
 # Stats tracking
 stats = {
     'last_check': None,
     'total_checks': 0,
     'failed_checks': 0,
     'restarts_performed': 0,
-    'healthy_workers': [],
-    'unhealthy_workers': []
+    'healthy_workers': set(),
+    'unhealthy_workers': set()
 }
 
-def check_worker_health(container):
-    """Check ACTUAL state of worker - no timeouts, just facts."""
+# Health suffix of the `docker ps` status string, e.g. "Up 5 minutes (health: starting)"
+_STATUS_HEALTH_RE = re.compile(r'\((?:health: )?(healthy|unhealthy|starting)\)')
+
+
+def _app_net_ip(networks):
+    """IP address of the container on the app_net network, or None."""
+    for network_name, network_info in (networks or {}).items():
+        if 'app_net' in network_name:
+            return network_info.get('IPAddress')
+    return None
+
+
+def _state_from_inspect(attrs):
+    """Normalize a full inspect result (api.inspect_container) to the fields the checks use."""
+    state = attrs.get('State', {})
+    return {
+        'running': state.get('Running', False),
+        'restarting': state.get('Restarting', False),
+        'health': state.get('Health', {}).get('Status'),
+        'ip': _app_net_ip(attrs.get('NetworkSettings', {}).get('Networks')),
+    }
+
+
+def _state_from_summary(raw):
+    """Normalize a container list entry (one bulk API call for all workers)."""
+    state = raw.get('State')
+    match = _STATUS_HEALTH_RE.search(raw.get('Status', ''))
+    return {
+        'running': state in ('running', 'restarting'),
+        'restarting': state == 'restarting',
+        'health': match.group(1) if match else None,
+        'ip': _app_net_ip(raw.get('NetworkSettings', {}).get('Networks')),
+    }
+
+
+def _container_name(container):
+    """Name of a raw container list entry (`Names` carries a leading slash)."""
+    return container.get('Names', ['/?'])[0].lstrip('/')
+
+
+def check_worker_health(container, state=None, mode="full"):
+    """Check ACTUAL state of worker - no timeouts, just facts.
+    
+    `container` is a raw entry from the low-level container list. `state` is a
+    normalized dict from _state_from_summary/_state_from_inspect; when omitted
+    the container is inspected. mode="state" uses Docker state only
+    and never probes HTTP (a container without a healthcheck reports unhealthy);
+    mode="full" falls back to the worker's /health endpoint.
+    """
     try:
-        container_name = container.name
+        container_name = _container_name(container)
         logger.debug(f"Checking health of {container_name}")
         
         # Fact 1: Container must be running
-        container.reload()
-        container_state = container.attrs.get('State', {})
+        if state is None:
+            state = _state_from_inspect(docker_client.api.inspect_container(container['Id']))
         
-        if not container_state.get('Running'):
+        if not state['running']:
             logger.warning(f"{container_name} is not running")
             return False
         
-        if container_state.get('Restarting'):
+        if state['restarting']:
             logger.info(f"{container_name} is restarting (healthy)")
             return True  # Restarting = healthy
         
         # Fact 2: Check Docker healthcheck result (if available)
-        docker_health = container.attrs.get('State', {}).get('Health', {}).get('Status')
+        docker_health = state['health']
         if docker_health:
             is_healthy = docker_health in ['healthy', 'starting']
             if is_healthy:
@@ -71,23 +135,22 @@ def check_worker_health(container):
                 logger.warning(f"{container_name} Docker health: {docker_health}")
                 return False
         
+        if mode == "state":
+            logger.debug(f"{container_name} has no Docker health yet, HTTP probe skipped")
+            return False
+        
         # Fact 3: If no Docker health, check HTTP endpoint quickly
         try:
-            networks = container.attrs['NetworkSettings']['Networks']
-            container_ip = None
-            for network_name, network_info in networks.items():
-                if 'app_net' in network_name:
-                    container_ip = network_info['IPAddress']
-                    break
+            container_ip = state['ip']
             
             if not container_ip:
                 logger.warning(f"Could not get IP for {container_name}")
                 return False
             
             # Quick check (2s) - if server responds, parse result
-            response = requests.get(
+            response = http_session.get(
                 f"http://{container_ip}:4101/health",
-                timeout=2
+                timeout=(2, 2)
             )
             
             if response.status_code != 200:
@@ -112,22 +175,22 @@ def check_worker_health(container):
             return False
         
     except Exception as e:
-        logger.error(f"Error checking {container.name}: {e}")
+        logger.error(f"Error checking {_container_name(container)}: {e}")
         return False
 
 def restart_worker(container, client):
     """Restart unhealthy worker and wait for ACTUAL healthy state."""
-    container_name = container.name
+    container_name = _container_name(container)
     logger.info(f"Restarting unhealthy worker: {container_name}")
     
     try:
         # Stop the container
         logger.info(f"Stopping {container_name}...")
-        container.stop(timeout=10)
+        client.api.stop(container['Id'], timeout=10)
         
         # Start it again
         logger.info(f"Starting {container_name}...")
-        container.start()
+        client.api.start(container['Id'])
         
         # Wait for ACTUAL healthy state - check frequently, stop when healthy
         max_attempts = 30  # 30 attempts = ~60s max wait
@@ -135,17 +198,22 @@ def restart_worker(container, client):
         
         logger.info(f"Waiting for {container_name} to report healthy state...")
         
+        running_streak = 0
         for attempt in range(1, max_attempts + 1):
             time.sleep(check_delay)
-            container.reload()
+            state = _state_from_inspect(client.api.inspect_container(container['Id']))
             
             # Fact: container must be running
-            if not container.attrs.get('State', {}).get('Running'):
+            if not state['running']:
                 logger.debug(f"{container_name} not running yet (attempt {attempt})")
+                running_streak = 0
                 continue
+            running_streak += 1
             
-            # Fact: check health immediately
-            if check_worker_health(container):
+            # Fact: check health immediately (reuses this inspect); only probe HTTP
+            # once the container has stayed up for two consecutive checks
+            mode = "full" if running_streak >= 2 else "state"
+            if check_worker_health(container, state, mode):
                 elapsed = attempt * check_delay
                 logger.info(f"{container_name} is healthy after {elapsed}s")
                 return True
@@ -162,18 +230,26 @@ def restart_worker(container, client):
 
 def monitor_all_workers():
     """Check all browser workers and restart unhealthy ones."""
+    with cycle_lock:
+        _monitor_cycle()
+
+def _monitor_cycle():
+    """One monitoring cycle; callers hold cycle_lock."""
     logger.info("Starting worker health check cycle")
     stats['total_checks'] += 1
     stats['last_check'] = datetime.now().isoformat()
     
-    healthy_workers = []
-    unhealthy_workers = []
+    healthy_workers = set()
+    unhealthy_workers = set()
     
     try:
-        # Get all browser worker containers
-        containers = docker_client.containers.list(
+        # Get all browser worker containers with their state in one API call; raw
+        # dicts from the low-level API (containers.list() would inspect each one
+        # and wrap it in a Container model)
+        containers = docker_client.api.containers(
             filters={"name": "google-search-ai-browser-worker"}
         )
+        states = [_state_from_summary(raw) for raw in containers]
         
         if not containers:
             logger.warning("No browser worker containers found")
@@ -181,22 +257,37 @@ def monitor_all_workers():
             
         logger.info(f"Found {len(containers)} worker containers")
         
-        # Check each worker
-        for container in containers:
-            if check_worker_health(container):
-                healthy_workers.append(container.name)
+        # Check all workers concurrently - cycle time is the slowest check, not the sum
+        workers = min(len(containers), MAX_PARALLEL_CHECKS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda c, st: check_worker_health(c, st, "full"), containers, states))
+        
+        unhealthy = []
+        for container, healthy in zip(containers, results):
+            name = _container_name(container)
+            if healthy:
+                healthy_workers.add(name)
             else:
-                unhealthy_workers.append(container.name)
+                unhealthy_workers.add(name)
+                unhealthy.append(container)
                 stats['failed_checks'] += 1
-                
-                # Attempt restart
-                if restart_worker(container, docker_client):
-                    healthy_workers.append(container.name)
-                    unhealthy_workers.remove(container.name)
+        
+        # Attempt restarts in parallel (each waits up to ~60s for the worker to become healthy)
+        if unhealthy:
+            with ThreadPoolExecutor(max_workers=min(len(unhealthy), MAX_PARALLEL_CHECKS)) as pool:
+                restarted = list(pool.map(lambda c: restart_worker(c, docker_client), unhealthy))
+            for container, ok in zip(unhealthy, restarted):
+                if ok:
+                    name = _container_name(container)
+                    healthy_workers.add(name)
+                    unhealthy_workers.discard(name)
         
         # Update stats
-        stats['healthy_workers'] = healthy_workers
-        stats['unhealthy_workers'] = unhealthy_workers
+        with stats_lock:
+            stats['healthy_workers'].clear()
+            stats['healthy_workers'].update(healthy_workers)
+            stats['unhealthy_workers'].clear()
+            stats['unhealthy_workers'].update(unhealthy_workers)
         
         logger.info(f"Health check complete: {len(healthy_workers)} healthy, {len(unhealthy_workers)} unhealthy")
         
@@ -218,7 +309,11 @@ def health():
 @app.route('/stats')
 def get_stats():
     """Get monitoring statistics."""
-    return jsonify(stats)
+    with stats_lock:
+        snapshot = dict(stats)
+        snapshot['healthy_workers'] = sorted(stats['healthy_workers'])
+        snapshot['unhealthy_workers'] = sorted(stats['unhealthy_workers'])
+    return jsonify(snapshot)
 
 @app.route('/check')
 def manual_check():
@@ -231,19 +326,25 @@ def manual_check():
 
 def run_scheduler():
     """Run the scheduled monitoring in a separate thread."""
-    schedule.every(CHECK_INTERVAL).seconds.do(monitor_all_workers)
-    
     logger.info(f"Starting worker monitor scheduler (interval: {CHECK_INTERVAL}s)")
     
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    # Sleep until the next cycle is due instead of waking every second to poll;
+    # the interval is measured from the end of the previous cycle
+    while not stop_event.wait(CHECK_INTERVAL):
+        monitor_all_workers()
+
+def handle_shutdown(signum, frame):
+    """Stop the scheduler (no new cycles) and exit the Flask server."""
+    logger.info(f"Received signal {signum}, stopping monitor")
+    stop_event.set()
+    sys.exit(0)
 
 if __name__ == '__main__':
-    import threading
-    
     logger.info("Starting Worker Health Monitor Service")
     
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    signal.signal(signal.SIGINT, handle_shutdown)
+    
     # Start scheduler in background thread
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()
@@ -9,12 +9,35 @@ This server manages proxy rotation for all browser workers:
 - Provides API for workers to get current proxy
 """
 import os
-from typing import Optional, Dict
+import sys
+import json
+import time
+import queue
+import socket
+import atexit
+import asyncio
+import logging
+import logging.handlers
+from typing import Optional, Dict, List, Tuple
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-import redis
+import redis.asyncio as aioredis
 import httpx
 
+# ---------- LOGGING ----------
+# Handlers only enqueue records; a listener thread does the stdout writes, so
+# request handlers never block on the Docker log pipe
+log = logging.getLogger("bpa.coordinator")
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+_log_target = logging.StreamHandler(sys.stdout)
+_log_target.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_target)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on exit
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+log.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
 # ---------- CONFIG ----------
 PORT = int(os.environ.get("COORDINATOR_PORT", "4200"))
 REDIS_URL = os.environ.get("REDIS_URL", "redis://redis:6379")
@@ -40,17 +63,106 @@ if _worker_urls_env:
     WORKER_URLS = [url.strip() for url in _worker_urls_env.split(",") if url.strip()]
 
 # ---------- REDIS ----------
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-print(f"[COORDINATOR] Connected to Redis: {REDIS_URL}")
+# Async client: Redis round trips yield to the event loop instead of blocking it.
+# Blocking pool sized for ~2 in-flight calls per worker (plus the BRPOP consumer):
+# callers wait for a free connection instead of failing when it is exhausted.
+# Keepalive + periodic PING catch dead sockets before a request does.
+redis_client = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool.from_url(
+    REDIS_URL, decode_responses=True,
+    max_connections=max(32, len(WORKER_URLS) * 2),
+    socket_keepalive=True,
+    socket_keepalive_options={socket.TCP_KEEPIDLE: 30} if hasattr(socket, "TCP_KEEPIDLE") else None,
+    health_check_interval=30,
+))
+log.info("[COORDINATOR] Connected to Redis: %s", REDIS_URL)
 
 # Redis keys
 REDIS_PROXY_IDX_KEY = "browser_worker:shared_proxy_idx"
 REDIS_REQUEST_COUNT_KEY = "browser_worker:shared_request_count"
 REDIS_PROXY_BLOCKED_PREFIX = "browser_worker:proxy_blocked:"
+# Block events pushed by workers (LPUSH) as an alternative to POST /block-proxy
+REDIS_BLOCK_EVENTS_KEY = "browser_worker:proxy_block_events"
+
+# INCR the request counter; at the threshold, reset it and advance the proxy index
+# in the same atomic step. KEYS: request count, proxy index. ARGV: threshold.
+# Returns {count, rotated, new_idx}.
+INCR_ROTATE_LUA = """
+local c = redis.call('INCR', KEYS[1])
+if c >= tonumber(ARGV[1]) then
+  redis.call('SET', KEYS[1], '0')
+  local n = redis.call('INCR', KEYS[2])
+  return {c, 1, n}
+end
+return {c, 0, -1}
+"""
+incr_rotate_script = redis_client.register_script(INCR_ROTATE_LUA)
+
+# ---------- HTTP ----------
+# Max concurrent /rotate-proxy calls during a worker fan-out
+NOTIFY_CONCURRENCY = 16
+
+# Per-worker circuit breaker for rotation notifications: after BREAKER_FAILURES
+# consecutive connection failures the worker is skipped for a cooldown that
+# doubles on each failed half-open probe (capped at BREAKER_MAX_COOLDOWN_SEC)
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN_SEC = 30.0
+BREAKER_MAX_COOLDOWN_SEC = 300.0
+# worker URL -> {"state": closed|open|half_open, "failures": int, "opened_at": float, "cooldown": float}
+_breakers: Dict[str, dict] = {}
+
+
+def _breaker_allows(worker_url: str) -> bool:
+    """Whether a notification may be sent; moves an expired OPEN breaker to HALF_OPEN (one probe)."""
+    breaker = _breakers.get(worker_url)
+    if breaker is None or breaker["state"] == "closed":
+        return True
+    if breaker["state"] == "open" and time.monotonic() - breaker["opened_at"] >= breaker["cooldown"]:
+        breaker["state"] = "half_open"
+        return True
+    return False  # still cooling down, or a half-open probe is already in flight
+
+
+def _breaker_record(worker_url: str, reachable: bool) -> None:
+    """Update the worker's breaker after a notification attempt."""
+    if reachable:
+        _breakers.pop(worker_url, None)
+        return
+    breaker = _breakers.setdefault(
+        worker_url, {"state": "closed", "failures": 0, "opened_at": 0.0, "cooldown": 0.0}
+    )
+    breaker["failures"] += 1
+    if breaker["state"] == "half_open":
+        breaker["cooldown"] = min(breaker["cooldown"] * 2, BREAKER_MAX_COOLDOWN_SEC)
+    elif breaker["failures"] >= BREAKER_FAILURES:
+        breaker["cooldown"] = BREAKER_COOLDOWN_SEC
+    else:
+        return
+    breaker["state"] = "open"
+    breaker["opened_at"] = time.monotonic()
+    log.warning("[COORDINATOR] Worker %s unreachable, skipping notifications for %.0fs",
+                worker_url, breaker["cooldown"])
 
 # ---------- STATE ----------
 rotation_enabled = PROXY_ROTATION_REQUESTS > 0 and len(PROXY_LIST) > 1
 
+# Short-lived read cache for polled endpoints (/health, /status, /current-proxy):
+# name -> (monotonic timestamp, value). Cleared on every coordinator write.
+STATE_CACHE_SEC = 0.2
+_state_cache: Dict[str, Tuple[float, object]] = {}
+
+
+def _cached_state(name: str):
+    """Return a cached read younger than STATE_CACHE_SEC, else None."""
+    entry = _state_cache.get(name)
+    if entry is not None and time.monotonic() - entry[0] < STATE_CACHE_SEC:
+        return entry[1]
+    return None
+
+
+def _invalidate_state() -> None:
+    """Drop cached reads after a write to the index, counter or block keys."""
+    _state_cache.clear()
+
 # ---------- API ----------
 app = FastAPI()
 
@@ -73,84 +185,111 @@ class RotateProxyRequest(BaseModel):
 
 # ---------- HELPER FUNCTIONS ----------
 
-def get_current_proxy_idx() -> int:
-    """Get current proxy index from Redis."""
+async def get_current_proxy_idx(cached: bool = False) -> int:
+    """Get current proxy index from Redis.
+    
+    Args:
+        cached: Accept a value up to STATE_CACHE_SEC old (read-only endpoints)
+    """
+    if cached:
+        value = _cached_state("idx")
+        if value is not None:
+            return value
     try:
-        idx_str = redis_client.get(REDIS_PROXY_IDX_KEY)
-        if idx_str is None:
-            redis_client.set(REDIS_PROXY_IDX_KEY, "0")
-            return 0
-        return int(idx_str)
+        # Key is created at startup; a missing key (e.g. Redis flushed) reads as 0
+        idx = int(await redis_client.get(REDIS_PROXY_IDX_KEY) or 0)
+        _state_cache["idx"] = (time.monotonic(), idx)
+        return idx
     except Exception as e:
-        print(f"[ERROR] Failed to get proxy index: {e}")
+        log.error("[ERROR] Failed to get proxy index: %s", e)
         return 0
 
 
-def get_request_count() -> int:
-    """Get current request count from Redis."""
+async def get_request_count(cached: bool = False) -> int:
+    """Get current request count from Redis.
+    
+    Args:
+        cached: Accept a value up to STATE_CACHE_SEC old (read-only endpoints)
+    """
+    if cached:
+        value = _cached_state("count")
+        if value is not None:
+            return value
     try:
-        count_str = redis_client.get(REDIS_REQUEST_COUNT_KEY)
-        if count_str is None:
-            redis_client.set(REDIS_REQUEST_COUNT_KEY, "0")
-            return 0
-        return int(count_str)
+        count = int(await redis_client.get(REDIS_REQUEST_COUNT_KEY) or 0)
+        _state_cache["count"] = (time.monotonic(), count)
+        return count
     except Exception as e:
-        print(f"[ERROR] Failed to get request count: {e}")
+        log.error("[ERROR] Failed to get request count: %s", e)
         return 0
 
 
-def is_proxy_blocked(proxy_idx: int) -> bool:
-    """Check if proxy is blocked."""
+async def read_proxy_state() -> Tuple[int, int, List[bool]]:
+    """Read proxy index, request count and every proxy's block flag in one pipelined round trip.
+    
+    Served from the STATE_CACHE_SEC read cache when fresh.
+    
+    Returns:
+        (current proxy index, request count, blocked flag per proxy index)
+    """
+    state = _cached_state("proxy_state")
+    if state is not None:
+        return state
     try:
-        key = f"{REDIS_PROXY_BLOCKED_PREFIX}{proxy_idx}"
-        return bool(redis_client.exists(key))
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(REDIS_PROXY_IDX_KEY)
+            pipe.get(REDIS_REQUEST_COUNT_KEY)
+            for idx in range(len(PROXY_LIST)):
+                pipe.exists(f"{REDIS_PROXY_BLOCKED_PREFIX}{idx}")
+            idx_str, count_str, *blocked = await pipe.execute()
+        state = (int(idx_str or 0), int(count_str or 0), [bool(b) for b in blocked])
+        _state_cache["proxy_state"] = (time.monotonic(), state)
+        return state
     except Exception as e:
-        print(f"[ERROR] Failed to check proxy block: {e}")
-        return False
+        log.error("[ERROR] Failed to read proxy state: %s", e)
+        return 0, 0, [False] * len(PROXY_LIST)
 
 
-def get_next_available_proxy_idx(start_idx: int) -> Optional[int]:
-    """Get next available (non-blocked) proxy index."""
+def get_next_available_proxy_idx(start_idx: int, blocked: List[bool]) -> Optional[int]:
+    """Get next available (non-blocked) proxy index.
+    
+    Args:
+        start_idx: Index to start searching from
+        blocked: Block flags from read_proxy_state()
+    """
     if not PROXY_LIST:
         return None
     
     for offset in range(len(PROXY_LIST)):
         idx = (start_idx + offset) % len(PROXY_LIST)
-        if not is_proxy_blocked(idx):
+        if not blocked[idx]:
             return idx
     
     # All proxies blocked
     return None
 
 
-def mark_proxy_blocked(proxy_idx: int, reason: str = "blocked") -> None:
+async def mark_proxy_blocked(proxy_idx: int, reason: str = "blocked") -> None:
     """Mark proxy as blocked with TTL."""
     try:
         key = f"{REDIS_PROXY_BLOCKED_PREFIX}{proxy_idx}"
-        redis_client.setex(key, PROXY_BLOCK_TIMEOUT_SEC, "1")
-        print(f"[COORDINATOR] Marked proxy {proxy_idx} as blocked for {PROXY_BLOCK_TIMEOUT_SEC}s (reason: {reason})")
+        await redis_client.setex(key, PROXY_BLOCK_TIMEOUT_SEC, "1")
+        _invalidate_state()
+        log.info("[COORDINATOR] Marked proxy %s as blocked for %ss (reason: %s)", proxy_idx, PROXY_BLOCK_TIMEOUT_SEC, reason)
     except Exception as e:
-        print(f"[ERROR] Failed to mark proxy as blocked: {e}")
+        log.error("[ERROR] Failed to mark proxy as blocked: %s", e)
 
 
-def increment_proxy_idx() -> int:
+async def increment_proxy_idx() -> int:
     """Increment proxy index and return new value."""
     try:
-        new_idx = redis_client.incr(REDIS_PROXY_IDX_KEY)
-        print(f"[COORDINATOR] Incremented proxy index to {new_idx}")
+        new_idx = await redis_client.incr(REDIS_PROXY_IDX_KEY)
+        _invalidate_state()
+        log.info("[COORDINATOR] Incremented proxy index to %s", new_idx)
         return new_idx
     except Exception as e:
-        print(f"[ERROR] Failed to increment proxy index: {e}")
-        return get_current_proxy_idx()
-
-
-def reset_request_count() -> None:
-    """Reset request counter to 0."""
-    try:
-        redis_client.set(REDIS_REQUEST_COUNT_KEY, "0")
-        print(f"[COORDINATOR] Reset request count to 0")
-    except Exception as e:
-        print(f"[ERROR] Failed to reset request count: {e}")
+        log.error("[ERROR] Failed to increment proxy index: %s", e)
+        return await get_current_proxy_idx()
 
 
 async def notify_workers_rotate_proxy(reason: str = "coordinator") -> Dict[str, bool]:
@@ -159,26 +298,37 @@ async def notify_workers_rotate_proxy(reason: str = "coordinator") -> Dict[str,
     Returns:
         Dict mapping worker URL to success status
     """
-    results = {}
-    
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for worker_url in WORKER_URLS:
+    # Process-wide client created at startup; keeps worker connections warm
+    client = app.state.http
+    sem = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+    
+    async def notify(worker_url: str) -> bool:
+        if not _breaker_allows(worker_url):
+            log.info("[COORDINATOR] Worker %s circuit open, not notified", worker_url)
+            return False
+        async with sem:
             try:
                 response = await client.post(
                     f"{worker_url}/rotate-proxy",
                     json={"reason": reason}
                 )
-                success = response.status_code == 200
-                results[worker_url] = success
-                
-                if success:
-                    print(f"[COORDINATOR] Worker {worker_url} rotated proxy")
-                else:
-                    print(f"[COORDINATOR] Worker {worker_url} failed to rotate: {response.status_code}")
-                    
             except Exception as e:
-                print(f"[COORDINATOR] Failed to notify worker {worker_url}: {e}")
-                results[worker_url] = False
+                log.warning("[COORDINATOR] Failed to notify worker %s: %s", worker_url, e)
+                _breaker_record(worker_url, False)
+                return False
+        
+        # Any HTTP response means the worker is up; only connection failures trip the breaker
+        _breaker_record(worker_url, True)
+        success = response.status_code == 200
+        if success:
+            log.info("[COORDINATOR] Worker %s rotated proxy", worker_url)
+        else:
+            log.warning("[COORDINATOR] Worker %s failed to rotate: %s", worker_url, response.status_code)
+        return success
+    
+    # Notify all workers concurrently (bounded) instead of one after another
+    responses = await asyncio.gather(*(notify(url) for url in WORKER_URLS))
+    results = dict(zip(WORKER_URLS, responses))
     
     return results
 
@@ -193,23 +343,23 @@ async def health():
         "proxy_count": len(PROXY_LIST),
         "worker_count": len(WORKER_URLS),
         "rotation_enabled": rotation_enabled,
-        "current_proxy_idx": get_current_proxy_idx(),
-        "request_count": get_request_count()
+        "current_proxy_idx": await get_current_proxy_idx(cached=True),
+        "request_count": await get_request_count(cached=True)
     }
 
 
 @app.get("/status")
 async def status():
     """Get current coordinator status."""
-    current_idx = get_current_proxy_idx()
-    request_count = get_request_count()
+    # Index, count and block flags in one round trip
+    current_idx, request_count, blocked = await read_proxy_state()
     
     # Check which proxies are blocked
     blocked_proxies = []
     available_proxies = []
     
-    for idx in range(len(PROXY_LIST)):
-        if is_proxy_blocked(idx):
+    for idx, is_blocked in enumerate(blocked):
+        if is_blocked:
             blocked_proxies.append(idx)
         else:
             available_proxies.append(idx)
@@ -241,38 +391,34 @@ async def increment_request(request: IncrementRequest):
             "message": "Rotation disabled"
         }
     
-    # Increment counter (atomic)
-    new_count = redis_client.incr(REDIS_REQUEST_COUNT_KEY)
-    
-    print(f"[COORDINATOR] Request count: {new_count}/{PROXY_ROTATION_REQUESTS}")
-    
-    # Check if threshold reached
-    # Use EXACT match to prevent multiple rotations when count > threshold
-    if new_count == PROXY_ROTATION_REQUESTS:
-        print(f"\n{'='*80}")
-        print(f"[COORDINATOR] ROTATION THRESHOLD REACHED: {new_count}/{PROXY_ROTATION_REQUESTS}")
-        print(f"[COORDINATOR] Triggering proxy rotation for ALL workers")
-        print(f"{'='*80}\n")
-        
-        # Get current proxy index before rotation
-        old_idx = get_current_proxy_idx()
+    # Increment counter; at the threshold the counter reset and proxy index increment
+    # happen in the same atomic script, so exactly one caller rotates (>= also absorbs overshoot)
+    new_count, rotated, new_idx = await incr_rotate_script(
+        keys=[REDIS_REQUEST_COUNT_KEY, REDIS_PROXY_IDX_KEY],
+        args=[PROXY_ROTATION_REQUESTS],
+    )
+    _invalidate_state()
+    
+    log.debug("[COORDINATOR] Request count: %s/%s", new_count, PROXY_ROTATION_REQUESTS)
+    
+    if rotated:
+        log.info("\n%s", "=" * 80)
+        log.info("[COORDINATOR] ROTATION THRESHOLD REACHED: %s/%s", new_count, PROXY_ROTATION_REQUESTS)
+        log.info("[COORDINATOR] Triggering proxy rotation for ALL workers")
+        log.info("%s\n", "=" * 80)
         
         # NOTE: Do NOT mark proxy as blocked on rotation threshold
         # The proxy is not blocked, just reached request limit
         # Only mark as blocked when worker reports actual proxy block
-        
-        # Increment proxy index
-        new_idx = increment_proxy_idx()
-        
-        # Reset counter
-        reset_request_count()
+        old_idx = new_idx - 1
+        log.info("[COORDINATOR] Incremented proxy index to %s, reset request count to 0", new_idx)
         
         # Notify all workers to rotate
         worker_results = await notify_workers_rotate_proxy("threshold reached")
         
         success_count = sum(1 for success in worker_results.values() if success)
         
-        print(f"[COORDINATOR] Rotation complete: {success_count}/{len(WORKER_URLS)} workers rotated")
+        log.info("[COORDINATOR] Rotation complete: %s/%s workers rotated", success_count, len(WORKER_URLS))
         
         return {
             "ok": True,
@@ -299,36 +445,43 @@ async def block_proxy(request: BlockProxyRequest):
     This should be called when a worker detects proxy block.
     """
     proxy_idx = request.proxy_idx
-    reason = request.reason
     
     if proxy_idx < 0 or proxy_idx >= len(PROXY_LIST):
         raise HTTPException(status_code=400, detail=f"Invalid proxy index: {proxy_idx}")
     
-    print(f"\n{'='*80}")
-    print(f"[COORDINATOR] PROXY BLOCK DETECTED")
-    print(f"[COORDINATOR] Proxy index: {proxy_idx}")
-    print(f"[COORDINATOR] Reason: {reason}")
-    print(f"{'='*80}\n")
+    return await handle_proxy_block(proxy_idx, request.reason)
+
+
+async def handle_proxy_block(proxy_idx: int, reason: str) -> dict:
+    """Mark a proxy as blocked and rotate all workers if it is the current proxy.
+    
+    Shared by POST /block-proxy and the Redis block-event consumer.
+    """
+    log.info("\n%s", "=" * 80)
+    log.info("[COORDINATOR] PROXY BLOCK DETECTED")
+    log.info("[COORDINATOR] Proxy index: %s", proxy_idx)
+    log.info("[COORDINATOR] Reason: %s", reason)
+    log.info("%s\n", "=" * 80)
     
     # Mark proxy as blocked
-    mark_proxy_blocked(proxy_idx, reason)
+    await mark_proxy_blocked(proxy_idx, reason)
     
     # Check if we need to rotate (if current proxy is the blocked one)
-    current_idx = get_current_proxy_idx()
+    current_idx = await get_current_proxy_idx()
     current_proxy_idx = current_idx % len(PROXY_LIST)
     
     if current_proxy_idx == proxy_idx:
-        print(f"[COORDINATOR] Current proxy is blocked, triggering rotation")
+        log.info("[COORDINATOR] Current proxy is blocked, triggering rotation")
         
         # Increment proxy index
-        new_idx = increment_proxy_idx()
+        new_idx = await increment_proxy_idx()
         
         # Notify all workers
         worker_results = await notify_workers_rotate_proxy(f"proxy {proxy_idx} blocked")
         
         success_count = sum(1 for success in worker_results.values() if success)
         
-        print(f"[COORDINATOR] Rotation complete: {success_count}/{len(WORKER_URLS)} workers rotated")
+        log.info("[COORDINATOR] Rotation complete: %s/%s workers rotated", success_count, len(WORKER_URLS))
         
         return {
             "ok": True,
@@ -340,7 +493,7 @@ async def block_proxy(request: BlockProxyRequest):
             "workers_success": success_count
         }
     else:
-        print(f"[COORDINATOR] Blocked proxy is not current, no rotation needed")
+        log.info("[COORDINATOR] Blocked proxy is not current, no rotation needed")
         
         return {
             "ok": True,
@@ -358,23 +511,23 @@ async def rotate_proxy(request: RotateProxyRequest):
     """
     reason = request.reason
     
-    print(f"\n{'='*80}")
-    print(f"[COORDINATOR] MANUAL PROXY ROTATION")
-    print(f"[COORDINATOR] Reason: {reason}")
-    print(f"{'='*80}\n")
+    log.info("\n%s", "=" * 80)
+    log.info("[COORDINATOR] MANUAL PROXY ROTATION")
+    log.info("[COORDINATOR] Reason: %s", reason)
+    log.info("%s\n", "=" * 80)
     
     # Get current proxy index
-    old_idx = get_current_proxy_idx()
+    old_idx = await get_current_proxy_idx()
     
     # Increment proxy index
-    new_idx = increment_proxy_idx()
+    new_idx = await increment_proxy_idx()
     
     # Notify all workers
     worker_results = await notify_workers_rotate_proxy(reason)
     
     success_count = sum(1 for success in worker_results.values() if success)
     
-    print(f"[COORDINATOR] Rotation complete: {success_count}/{len(WORKER_URLS)} workers rotated")
+    log.info("[COORDINATOR] Rotation complete: %s/%s workers rotated", success_count, len(WORKER_URLS))
     
     return {
         "ok": True,
@@ -396,47 +549,89 @@ async def current_proxy():
             "error": "No proxies configured"
         }
     
-    current_idx = get_current_proxy_idx()
+    # Index, count and block flags in one round trip
+    current_idx, request_count, blocked = await read_proxy_state()
     proxy_idx = current_idx % len(PROXY_LIST)
     proxy_url = PROXY_LIST[proxy_idx]
     
     # Check if available
-    available_idx = get_next_available_proxy_idx(proxy_idx)
+    available_idx = get_next_available_proxy_idx(proxy_idx, blocked)
     
     return {
         "ok": True,
         "proxy_idx": proxy_idx,
         "proxy_url": proxy_url,
         "shared_idx": current_idx,
-        "is_blocked": is_proxy_blocked(proxy_idx),
+        "is_blocked": blocked[proxy_idx],
         "next_available_idx": available_idx,
-        "request_count": get_request_count()
+        "request_count": request_count
     }
 
 
+# ---------- BLOCK EVENTS ----------
+
+async def consume_block_events() -> None:
+    """Handle block events that workers push to REDIS_BLOCK_EVENTS_KEY."""
+    while True:
+        try:
+            item = await redis_client.brpop(REDIS_BLOCK_EVENTS_KEY, timeout=5)
+            if item is None:
+                continue
+            event = json.loads(item[1])
+            proxy_idx = int(event["proxy_idx"])
+            if proxy_idx < 0 or proxy_idx >= len(PROXY_LIST):
+                log.warning("[COORDINATOR] Ignoring block event with invalid proxy index: %s", proxy_idx)
+                continue
+            await handle_proxy_block(proxy_idx, event.get("reason", "blocked"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("[ERROR] Failed to handle block event: %s", e)
+            await asyncio.sleep(1)
+
+
 # ---------- STARTUP ----------
 
 @app.on_event("startup")
 async def startup():
     """Initialize coordinator on startup."""
-    print(f"\n{'='*80}")
-    print(f"[COORDINATOR] Starting Proxy Coordinator Server")
-    print(f"[COORDINATOR] Port: {PORT}")
-    print(f"[COORDINATOR] Redis: {REDIS_URL}")
-    print(f"[COORDINATOR] Proxies: {len(PROXY_LIST)}")
-    print(f"[COORDINATOR] Workers: {len(WORKER_URLS)}")
-    print(f"[COORDINATOR] Rotation threshold: {PROXY_ROTATION_REQUESTS}")
-    print(f"[COORDINATOR] Rotation enabled: {rotation_enabled}")
-    print(f"{'='*80}\n")
-    
-    # Initialize Redis keys if not exist
-    if redis_client.get(REDIS_PROXY_IDX_KEY) is None:
-        redis_client.set(REDIS_PROXY_IDX_KEY, "0")
-        print(f"[COORDINATOR] Initialized proxy index to 0")
-    
-    if redis_client.get(REDIS_REQUEST_COUNT_KEY) is None:
-        redis_client.set(REDIS_REQUEST_COUNT_KEY, "0")
-        print(f"[COORDINATOR] Initialized request count to 0")
+    log.info("\n%s", "=" * 80)
+    log.info("[COORDINATOR] Starting Proxy Coordinator Server")
+    log.info("[COORDINATOR] Port: %s", PORT)
+    log.info("[COORDINATOR] Redis: %s", REDIS_URL)
+    log.info("[COORDINATOR] Proxies: %s", len(PROXY_LIST))
+    log.info("[COORDINATOR] Workers: %s", len(WORKER_URLS))
+    log.info("[COORDINATOR] Rotation threshold: %s", PROXY_ROTATION_REQUESTS)
+    log.info("[COORDINATOR] Rotation enabled: %s", rotation_enabled)
+    log.info("%s\n", "=" * 80)
+    
+    # Initialize Redis keys if not exist (SET NX: safe across restarts and replicas)
+    if await redis_client.set(REDIS_PROXY_IDX_KEY, "0", nx=True):
+        log.info("[COORDINATOR] Initialized proxy index to 0")
+    
+    if await redis_client.set(REDIS_REQUEST_COUNT_KEY, "0", nx=True):
+        log.info("[COORDINATOR] Initialized request count to 0")
+    
+    app.state.http = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=len(WORKER_URLS) + 4,
+        ),
+    )
+    app.state.block_events_task = asyncio.create_task(consume_block_events())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the block-event consumer and release HTTP and Redis connections."""
+    app.state.block_events_task.cancel()
+    try:
+        await app.state.block_events_task
+    except asyncio.CancelledError:
+        pass
+    await app.state.http.aclose()
+    await redis_client.close()
 
 
 # ---------- MAIN ----------